@@ -62,6 +62,7 @@ from app.models.user_cert import UserCert
 from app.models.assets import Asset
 from app.models.projects import Project
 from app.models.request import Request
+from app.models.org_sync_state import OrgSyncState
 
 config = context.config
 
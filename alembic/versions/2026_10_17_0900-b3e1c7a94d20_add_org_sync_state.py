@@ -0,0 +1,31 @@
+"""Add ORG_SYNC_STATE for locally resolved manager hierarchies
+
+Revision ID: b3e1c7a94d20
+Revises: 7fde0c219d33
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b3e1c7a94d20'
+down_revision = '7fde0c219d33'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('ORG_SYNC_STATE',
+    sa.Column('MANAGER_ID', sa.String(length=50), nullable=False),
+    sa.Column('MANAGER_INFO', sa.Text(), nullable=True),
+    sa.Column('REPORTEE_IDS', sa.Text(), nullable=True),
+    sa.Column('REPORTEE_COUNT', sa.Integer(), nullable=True),
+    sa.Column('SYNCED_AT', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('MANAGER_ID'),
+    schema='FSQ87086'
+    )
+    op.create_index(op.f('ix_FSQ87086_ORG_SYNC_STATE_SYNCED_AT'), 'ORG_SYNC_STATE', ['SYNCED_AT'], unique=False, schema='FSQ87086')
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_FSQ87086_ORG_SYNC_STATE_SYNCED_AT'), table_name='ORG_SYNC_STATE', schema='FSQ87086')
+    op.drop_table('ORG_SYNC_STATE', schema='FSQ87086')
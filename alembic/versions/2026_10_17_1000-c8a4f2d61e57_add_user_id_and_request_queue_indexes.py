@@ -0,0 +1,29 @@
+"""Index USER_ID on section tables and REQUEST(MANAGER_ID, STATUS)
+
+Revision ID: c8a4f2d61e57
+Revises: b3e1c7a94d20
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c8a4f2d61e57'
+down_revision = 'b3e1c7a94d20'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_FSQ87086_ASSETS_USER_ID'), 'ASSETS', ['USER_ID'], unique=False, schema='FSQ87086')
+    op.create_index(op.f('ix_FSQ87086_PROJECTS_USER_ID'), 'PROJECTS', ['USER_ID'], unique=False, schema='FSQ87086')
+    op.create_index(op.f('ix_FSQ87086_USER_CERT_USER_ID'), 'USER_CERT', ['USER_ID'], unique=False, schema='FSQ87086')
+    op.create_index(op.f('ix_FSQ87086_USER_SKILLS_USER_ID'), 'USER_SKILLS', ['USER_ID'], unique=False, schema='FSQ87086')
+    op.create_index('ix_FSQ87086_REQUEST_MANAGER_ID_STATUS', 'REQUEST', ['MANAGER_ID', 'STATUS'], unique=False, schema='FSQ87086')
+
+def downgrade() -> None:
+    op.drop_index('ix_FSQ87086_REQUEST_MANAGER_ID_STATUS', table_name='REQUEST', schema='FSQ87086')
+    op.drop_index(op.f('ix_FSQ87086_USER_SKILLS_USER_ID'), table_name='USER_SKILLS', schema='FSQ87086')
+    op.drop_index(op.f('ix_FSQ87086_USER_CERT_USER_ID'), table_name='USER_CERT', schema='FSQ87086')
+    op.drop_index(op.f('ix_FSQ87086_PROJECTS_USER_ID'), table_name='PROJECTS', schema='FSQ87086')
+    op.drop_index(op.f('ix_FSQ87086_ASSETS_USER_ID'), table_name='ASSETS', schema='FSQ87086')
@@ -0,0 +1,13 @@
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header value matches an entity tag
+
+    Uses the weak comparison required for If-None-Match: a W/ prefix is
+    ignored and "*" matches any current representation.
+    """
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    candidates = [opaque(tag) for tag in if_none_match.split(",")]
+    return "*" in candidates or opaque(etag) in candidates
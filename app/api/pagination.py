@@ -0,0 +1,95 @@
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, inspect, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def cursor_query():
+    """Shared `cursor=` query parameter for list endpoints"""
+    return Query(
+        None,
+        description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page; "
+                    "takes precedence over skip",
+    )
+
+
+def encode_cursor(values: Tuple) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _key_attributes(model) -> List[str]:
+    mapper = inspect(model)
+    return [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+
+
+def parse_cursor(cursor: Optional[str], model) -> Optional[List]:
+    """
+    Decode a `cursor=` value into the primary key it points after
+
+    Called before the handler's try block so a bad cursor is a 400, not an
+    empty page.
+    """
+    if not cursor:
+        return None
+    return decode_cursor(cursor, len(_key_attributes(model)))
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def _after(columns, values):
+    """(c1, c2, ...) > (v1, v2, ...) spelled out, since row-value comparison is not portable"""
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column > values[i]))
+    return or_(*clauses)
+
+
+def paginate(query, model, after: Optional[List], skip: int, limit: int) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page ordered by the model's primary key
+
+    With a cursor (`after`, from parse_cursor) the page starts right after
+    the cursor's key (keyset
+    pagination: an index range scan, so deep pages cost the same as the
+    first). Without one, `skip` is applied as before for compatibility.
+
+    Returns:
+        (items, next_cursor), next_cursor being None on the last page
+    """
+    attributes = _key_attributes(model)
+    columns = [getattr(model, attr) for attr in attributes]
+
+    query = query.order_by(*columns)
+    if after is not None:
+        query = query.filter(_after(columns, after))
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells whether another page exists
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(tuple(getattr(items[-1], attr) for attr in attributes))
+
+
+def with_next_cursor(response: Response, next_cursor: Optional[str]) -> Response:
+    """Expose the next page's cursor as a response header"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
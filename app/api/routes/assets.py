@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Body, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List, Optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.assets import Asset
 from app.schemas.assets import AssetCreate, AssetUpdate, AssetResponse
+from app.schemas.bulk import BulkCreateResponse
 from app.auth.dependencies import get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, with_fields, sparse_response
+from app.services.bulk_writer import bulk_create
+from app.api.pagination import cursor_query, parse_cursor, paginate, with_next_cursor
+from app.services.row_writer import insert_row, update_row
 router = APIRouter()
 # @router.get("/", response_model=List[AssetResponse])
 # def get_all(
@@ -30,18 +36,25 @@ router = APIRouter()
 @router.get("/{user_id}", response_model=List[AssetResponse])
 def get_by_user(
     user_id: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all assets for a specific user"""
+    selected = parse_fields(fields, AssetResponse, Asset)
+    after = parse_cursor(cursor, Asset)
     try:
-        items = db.query(Asset).filter(
+        query = with_fields(db.query(Asset), Asset, selected).filter(
             Asset.user_id == user_id
-        ).offset(skip).limit(limit).all()
-        if items is None:
-            items = []
+        )
+        items, next_cursor = paginate(query, Asset, after, skip, limit)
+        if selected:
+            return with_next_cursor(sparse_response(items, selected), next_cursor)
+        with_next_cursor(response, next_cursor)
         return items
     except TypeError as e:
         print(f"DB2 TypeError fetching assets for user {user_id}: {e}")
@@ -58,15 +71,40 @@ def create(
     try:
         asset_data = item.dict()
         asset_data['user_id'] = current_user["user_id"]
-        new_item = Asset(**asset_data)
-        db.add(new_item)
+        new_item = insert_row(db, Asset, asset_data)
         db.commit()
-        db.refresh(new_item)
         return new_item
     except Exception as e:
         db.rollback()
         print(f"Error creating asset: {e}")
         raise HTTPException(status_code=500, detail=f"Error creating asset: {str(e)}")
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_bulk(
+    response: Response,
+    items: List[Any] = Body(..., description="AssetCreate objects; user_id is taken from the session"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Create several assets in one transaction
+
+    Returns 201 when every item was created, 207 when some items failed
+    (see `errors`, indexed by position in the request).
+    """
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per request"
+        )
+    try:
+        result = bulk_create(db, Asset, AssetCreate, items, {"user_id": current_user["user_id"]})
+    except Exception as e:
+        db.rollback()
+        print(f"Error bulk creating assets: {e}")
+        raise HTTPException(status_code=500, detail=f"Error bulk creating assets: {str(e)}")
+    if result["errors"]:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
 @router.put("/{asset_id}", response_model=AssetResponse)
 def update(
     asset_id: int,
@@ -75,15 +113,10 @@ def update(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        item = db.query(Asset).filter(
-            Asset.id == asset_id
-        ).first()
+        item = update_row(db, Asset, {"id": asset_id}, item_update.dict(exclude_unset=True))
         if not item:
             raise HTTPException(status_code=404, detail=f"Asset with ID {asset_id} not found")
-        for key, value in item_update.dict(exclude_unset=True).items():
-            setattr(item, key, value)
         db.commit()
-        db.refresh(item)
         return item
     except HTTPException:
         raise
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.database import get_db
 from app.models.manager_emp import ManagerEmp
@@ -10,12 +10,28 @@ from app.schemas.manager_emp import (
     ManagerEmpResponse
 )
 from app.auth.dependencies import get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, with_fields, sparse_response
+from app.api.pagination import cursor_query, parse_cursor, paginate, with_next_cursor
+from app.services.row_writer import insert_row, update_row
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ManagerEmpResponse])
-def get_all(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    items = db.query(ManagerEmp).offset(skip).limit(limit).all()
+def get_all(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
+    db: Session = Depends(get_db)
+):
+    selected = parse_fields(fields, ManagerEmpResponse, ManagerEmp)
+    after = parse_cursor(cursor, ManagerEmp)
+    query = with_fields(db.query(ManagerEmp), ManagerEmp, selected)
+    items, next_cursor = paginate(query, ManagerEmp, after, skip, limit)
+    if selected:
+        return with_next_cursor(sparse_response(items, selected), next_cursor)
+    with_next_cursor(response, next_cursor)
     return items
 
 @router.get("/{manager_id}", response_model=List[ManagerEmpResponse])
@@ -34,27 +50,22 @@ def get_employees_under_manager(
 
 @router.post("/", response_model=ManagerEmpResponse, status_code=status.HTTP_201_CREATED)
 def create(item: ManagerEmpCreate, db: Session = Depends(get_db)):
-    new_item = ManagerEmp(**item.dict())
-    db.add(new_item)
+    new_item = insert_row(db, ManagerEmp, item.dict())
     db.commit()
-    db.refresh(new_item)
     return new_item
 
 @router.put("/{manager_id}/{employee_id}", response_model=ManagerEmpResponse)
 def update(manager_id: str, employee_id: str, item_update: ManagerEmpUpdate, db: Session = Depends(get_db)):
-    item = db.query(ManagerEmp).filter(
-        ManagerEmp.manager_id == manager_id,
-        ManagerEmp.employee_id == employee_id
-    ).first()
+    item = update_row(
+        db, ManagerEmp,
+        {"manager_id": manager_id, "employee_id": employee_id},
+        item_update.dict(exclude_unset=True),
+    )
 
     if not item:
         raise HTTPException(404, "Manager-Employee relation not found")
 
-    for key, value in item_update.dict(exclude_unset=True).items():
-        setattr(item, key, value)
-
     db.commit()
-    db.refresh(item)
     return item
 
 @router.delete("/{manager_id}/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from app.auth.dependencies import get_current_admin, get_current_user
+from app.core.admission import admission_stats
+from app.core.sql_instrumentation import sql_metrics
+from app.core.profiler import profile_store
+from app.services.w3_profile_service import W3ProfileService
+from app.services.org_sync import OrgSyncWorker
+
+router = APIRouter()
+
+
+@router.get("/w3-cache")
+async def get_w3_cache_stats(current_user: dict = Depends(get_current_user)):
+    """Hit/miss/eviction counters and occupancy of the W3 profile cache"""
+    return W3ProfileService.cache.stats()
+
+
+@router.delete("/w3-cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_w3_cache(current_user: dict = Depends(get_current_admin)):
+    """Drop all cached W3 profiles (admin only: every worker request then goes to W3)"""
+    W3ProfileService.cache.clear()
+    return None
+
+
+@router.post("/org-sync")
+async def run_org_sync(current_user: dict = Depends(get_current_admin)):
+    """Refresh one batch of stale manager hierarchies from W3 now (admin only)"""
+    synced = await OrgSyncWorker.sync_once()
+    return {"managers_synced": synced}
+
+
+@router.get("/admission")
+async def get_admission_stats(current_user: dict = Depends(get_current_user)):
+    """Bulkhead queue depth and rejections, worker thread and pool occupancy"""
+    return admission_stats()
+
+
+@router.get("/sql")
+async def get_sql_stats(current_user: dict = Depends(get_current_user)):
+    """Statement counts, SQL time and pool checkout waits, overall and per route"""
+    return sql_metrics.snapshot()
+
+
+@router.delete("/sql", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_sql_stats(current_user: dict = Depends(get_current_admin)):
+    """Reset the aggregate SQL counters (admin only)"""
+    sql_metrics.reset()
+    return None
+
+
+@router.get("/profiles")
+async def list_profiles(current_user: dict = Depends(get_current_admin)):
+    """Stored request profiles, newest first"""
+    return profile_store.list()
+
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str, current_user: dict = Depends(get_current_admin)):
+    """Download a stored profile (speedscope JSON, open at https://www.speedscope.app)"""
+    path = profile_store.path(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=name)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, DatabaseError
 from typing import List, Optional
@@ -13,6 +13,9 @@ from app.schemas.professional_eminence import (
     Scope
 )
 from app.auth.dependencies import get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, with_fields, sparse_response
+from app.api.pagination import cursor_query, parse_cursor, paginate, with_next_cursor
+from app.services.row_writer import insert_row, update_row
 import logging
 
 router = APIRouter()
@@ -73,16 +76,21 @@ def safe_query_all(query) -> List:
 @router.get("/{user_id}", response_model=List[ProfessionalEminenceResponse])
 def get_by_user(
     user_id: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     eminence_type: Optional[EminenceType] = None,
     scope: Optional[Scope] = None,
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all professional eminence records for a specific user"""
+    selected = parse_fields(fields, ProfessionalEminenceResponse, ProfessionalEminence)
+    after = parse_cursor(cursor, ProfessionalEminence)
     try:
-        query = db.query(ProfessionalEminence).filter(
+        query = with_fields(db.query(ProfessionalEminence), ProfessionalEminence, selected).filter(
             ProfessionalEminence.user_id == user_id
         )
         
@@ -91,8 +99,10 @@ def get_by_user(
         if scope:
             query = query.filter(ProfessionalEminence.scope == scope)
         
-        query = query.offset(skip).limit(limit)
-        items = safe_query_all(query)
+        items, next_cursor = paginate(query, ProfessionalEminence, after, skip, limit)
+        if selected:
+            return with_next_cursor(sparse_response(items, selected), next_cursor)
+        with_next_cursor(response, next_cursor)
         return items
     except DatabaseError as e:
         logger.error(f"Database error fetching eminence for user {user_id}: {str(e)}")
@@ -124,12 +134,10 @@ def create_eminence(
                 detail=f"User with ID {eminence_data['user_id']} not found"
             )
         
-        new_eminence = ProfessionalEminence(**eminence_data)
-        db.add(new_eminence)
+        new_eminence = insert_row(db, ProfessionalEminence, eminence_data)
         db.commit()
-        db.refresh(new_eminence)
         
-        logger.info(f"Created professional eminence ID {new_eminence.id} for user {eminence_data['user_id']}")
+        logger.info(f"Created professional eminence ID {new_eminence['id']} for user {eminence_data['user_id']}")
         return new_eminence
         
     except HTTPException:
@@ -165,10 +173,12 @@ def update_eminence(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        eminence = db.query(ProfessionalEminence).filter(
-            ProfessionalEminence.id == eminence_id
-            # ProfessionalEminence.user_id == current_user["user_id"]
-        ).first()
+        update_data = eminence_update.dict(exclude_unset=True)
+        eminence = update_row(
+            db, ProfessionalEminence,
+            {"id": eminence_id},  # {"id": eminence_id, "user_id": current_user["user_id"]}
+            update_data,
+        )
         
         if not eminence:
             raise HTTPException(
@@ -176,12 +186,7 @@ def update_eminence(
                 detail=f"Professional eminence with ID {eminence_id} not found"
             )
         
-        update_data = eminence_update.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(eminence, key, value)
-        
         db.commit()
-        db.refresh(eminence)
         
         logger.info(f"Updated professional eminence ID {eminence_id}")
         return eminence
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
 from app.models.request import Request
 from app.schemas.request import RequestCreate, RequestUpdate, RequestResponse
 from app.auth.dependencies import get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, with_fields, sparse_response
+from app.api.pagination import cursor_query, parse_cursor, paginate, with_next_cursor
+from app.services.row_writer import insert_row, update_row
 
 router = APIRouter()
 
@@ -33,19 +36,26 @@ router = APIRouter()
 @router.get("/{user_id}", response_model=List[RequestResponse])
 def get_by_user(
     user_id: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all requests for a specific user"""
+    selected = parse_fields(fields, RequestResponse, Request)
+    after = parse_cursor(cursor, Request)
     try:
-        items = db.query(Request).filter(
+        query = with_fields(db.query(Request), Request, selected).filter(
             Request.manager_id == user_id,
             Request.status == "pending"
-        ).offset(skip).limit(limit).all()
-        if items is None:
-            items = []
+        )
+        items, next_cursor = paginate(query, Request, after, skip, limit)
+        if selected:
+            return with_next_cursor(sparse_response(items, selected), next_cursor)
+        with_next_cursor(response, next_cursor)
         return items
     except TypeError as e:
         print(f"DB2 TypeError fetching requests for user {user_id}: {e}")
@@ -63,10 +73,8 @@ def create(
     try:
         request_data = item.dict()
         request_data['user_id'] = current_user["user_id"]
-        new_item = Request(**request_data)
-        db.add(new_item)
+        new_item = insert_row(db, Request, request_data)
         db.commit()
-        db.refresh(new_item)
         return new_item
     except Exception as e:
         db.rollback()
@@ -81,20 +89,17 @@ def update(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        item = db.query(Request).filter(
-            Request.request_id == request_id,
-            Request.user_id == current_user["user_id"]
-        ).first()
-        if not item:
-            raise HTTPException(status_code=404, detail=f"Request with ID {request_id} not found")
-        
         update_data = item_update.model_dump(exclude_unset=True)
         
-        for key, value in update_data.items():
-            setattr(item, key, value)
+        item = update_row(
+            db, Request,
+            {"request_id": request_id, "user_id": current_user["user_id"]},
+            update_data,
+        )
+        if not item:
+            raise HTTPException(status_code=404, detail=f"Request with ID {request_id} not found")
         
         db.commit()
-        db.refresh(item)
         return item
     except HTTPException:
         raise
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+from app.auth.dependencies import get_current_user
+from app.schemas.search import ExpertSearchResponse
+from app.services.expert_index import expert_index, proficiency_rank
+
+router = APIRouter()
+
+@router.get("/experts", response_model=ExpertSearchResponse)
+def find_experts(
+    platform: Optional[str] = None,
+    segment: Optional[str] = None,
+    product_portfolio: Optional[str] = None,
+    speciality_area: Optional[str] = None,
+    product_line: Optional[str] = None,
+    proficiency_level: Optional[str] = Query(None, description="Exact proficiency level"),
+    min_proficiency: Optional[str] = Query(
+        None, description="Minimum proficiency: a level name from EXPERT_PROFICIENCY_SCALE or its 1-based rank"
+    ),
+    min_yoe: float = Query(0, ge=0, description="Minimum years of experience"),
+    skill_status: Optional[str] = Query(None, alias="status", description="e.g. approved; any status when omitted"),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Find users with a skill matching all given criteria (case-insensitive)
+
+    Served from the in-memory expert index; ranked by normalized proficiency
+    and years of experience of each user's best matching skill.
+    """
+    min_rank = proficiency_rank(min_proficiency) if min_proficiency else 0
+    if min_proficiency and not min_rank:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown proficiency level: {min_proficiency}"
+        )
+
+    try:
+        expert_index.ensure_ready()
+        return expert_index.search(
+            {
+                "platform": platform,
+                "segment": segment,
+                "product_portfolio": product_portfolio,
+                "speciality_area": speciality_area,
+                "product_line": product_line,
+                "proficiency_level": proficiency_level,
+                "status": skill_status,
+            },
+            min_rank=min_rank,
+            min_yoe=min_yoe,
+            limit=limit,
+        )
+    except Exception as e:
+        print(f"Error searching experts: {e}")
+        raise HTTPException(status_code=500, detail=f"Error searching experts: {str(e)}")
@@ -1,32 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response, Header
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
 from app.models.skills import Skill
-from app.schemas.skills import SkillCreate, SkillUpdate, SkillResponse
+from app.schemas.skills import SkillCreate, SkillUpdate, SkillResponse, SkillSuggestion
 from app.auth.dependencies import get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, sparse_response
+from app.api.pagination import cursor_query, encode_cursor, parse_cursor, with_next_cursor
+from app.api.conditional import etag_matches
+from app.services.row_writer import insert_row, update_row
+from app.services.skills_catalog import skills_catalog
 
 router = APIRouter()
 
 @router.get("/", response_model=List[SkillResponse])
 def get_all(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
     current_user: dict = Depends(get_current_user)
 ):
+    """List skills from the in-memory catalog snapshot (no database round trip)"""
+    selected = parse_fields(fields, SkillResponse, Skill)
+    after = parse_cursor(cursor, Skill)
     try:
-        items = db.query(Skill).offset(skip).limit(limit).all()
-        if items is None:
-            items = []
+        items, has_more = skills_catalog.get().page(after, skip, limit)
+        next_cursor = encode_cursor((items[-1]["skill_id"],)) if has_more and items else None
+        if selected:
+            return with_next_cursor(sparse_response(items, selected), next_cursor)
+        with_next_cursor(response, next_cursor)
         return items
-    except TypeError as e:
-        print(f"DB2 TypeError in get_all skills: {e}")
-        return []
     except Exception as e:
         print(f"Error fetching skills: {e}")
         return []
 
+@router.get("/tree")
+def get_tree(
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Skills taxonomy: platform -> segment -> product_portfolio -> speciality_area
+
+    Served from the catalog snapshot with a precomputed ETag; a matching
+    If-None-Match gets 304 Not Modified.
+    """
+    try:
+        snapshot = skills_catalog.get()
+    except Exception as e:
+        print(f"Error loading skills catalog: {e}")
+        raise HTTPException(status_code=503, detail="Skills catalog unavailable")
+    headers = {"ETag": snapshot.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+@router.get("/suggest", response_model=List[SkillSuggestion])
+def suggest(
+    q: str = Query(..., min_length=1, description="Words typed so far; each must prefix a catalog word"),
+    limit: int = Query(10, ge=1, le=50),
+    fuzzy: bool = Query(True, description="Fall back to near-miss matches when nothing matches exactly"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Typeahead for the skill picker, served from the catalog snapshot
+
+    Matches platform, segment, product portfolio and speciality area words
+    case-insensitively; results are ordered by how many user skills
+    reference each skill.
+    """
+    try:
+        snapshot = skills_catalog.get()
+    except Exception as e:
+        print(f"Error loading skills catalog: {e}")
+        raise HTTPException(status_code=503, detail="Skills catalog unavailable")
+    items, fuzzy_used = snapshot.suggest(q, limit, fuzzy)
+    return [
+        {**item, "usage": snapshot.usage.get(item["skill_id"], 0), "fuzzy": fuzzy_used}
+        for item in items
+    ]
+
 @router.get("/{item_id}", response_model=SkillResponse)
 def get_one(
     item_id: int,
@@ -34,9 +89,14 @@ def get_one(
     current_user: dict = Depends(get_current_user)
 ):
     try:
+        cached = skills_catalog.get().by_id.get(item_id)
+        if cached:
+            return cached
+        # Not in the snapshot: possibly created by another worker since the last refresh
         item = db.query(Skill).filter(Skill.skill_id == item_id).first()
         if not item:
             raise HTTPException(status_code=404, detail=f"Skill with ID {item_id} not found")
+        skills_catalog.put(item)
         return item
     except HTTPException:
         raise
@@ -54,10 +114,9 @@ def create(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        new_item = Skill(**item.dict())
-        db.add(new_item)
+        new_item = insert_row(db, Skill, item.dict())
         db.commit()
-        db.refresh(new_item)
+        skills_catalog.put(new_item)
         return new_item
     except Exception as e:
         db.rollback()
@@ -72,14 +131,11 @@ def update(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        item = db.query(Skill).filter(Skill.skill_id == item_id).first()
+        item = update_row(db, Skill, {"skill_id": item_id}, item_update.dict(exclude_unset=True))
         if not item:
             raise HTTPException(status_code=404, detail=f"Skill with ID {item_id} not found")
-        
-        for key, value in item_update.dict(exclude_unset=True).items():
-            setattr(item, key, value)
         db.commit()
-        db.refresh(item)
+        skills_catalog.put(item)
         return item
     except HTTPException:
         raise
@@ -104,6 +160,7 @@ def delete(
         
         db.delete(item)
         db.commit()
+        skills_catalog.remove(item_id)
         return None
     except HTTPException:
         raise
@@ -1,38 +1,131 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
-from app.core.database import get_db
+from typing import Iterator, List, Dict, Optional
+from app.core.async_db import AsyncDB, get_async_db
+from app.core.config import settings
+from app.core.database import SessionLocal
 from app.models.users import User
-from app.models.professional_eminence import ProfessionalEminence
-from app.models.user_skills import UserSkill
-from app.models.projects import Project
-from app.models.assets import Asset
 from app.models.user_cert import UserCert
 from app.auth.dependencies import get_current_user
-from app.services.w3_profile_service import W3ProfileService
+from app.services.org_sync import OrgHierarchyService
+from app.services.org_walker import OrgTreeWalker
+from app.services.reportee_loader import ReporteeDataLoader, serialize_certification
+from app.services.skill_matrix import build_skill_matrix
+import json
 import logging
+import time
 from sqlalchemy import func
 
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+# Blocking query functions, run in the threadpool through AsyncDB
+
+def _count_sections(db: Session, reportee_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    return ReporteeDataLoader(db).count_sections(reportee_ids)
+
+
+def _total_certifications(db: Session, reportee_ids: List[str]) -> int:
+    return db.query(func.count(UserCert.id)).filter(
+        UserCert.user_id.in_(reportee_ids)
+    ).scalar()
+
+
+def _certifications_by_reportee(db: Session, reportee_ids: List[str]) -> List:
+    return db.query(
+        UserCert.user_id,
+        User.name,
+        User.email,
+        func.count(UserCert.id).label('cert_count')
+    ).join(
+        User, User.user_id == UserCert.user_id
+    ).filter(
+        UserCert.user_id.in_(reportee_ids)
+    ).group_by(
+        UserCert.user_id, User.name, User.email
+    ).all()
+
+
+def _certifications_by_type(db: Session, reportee_ids: List[str]) -> List:
+    return db.query(
+        UserCert.cert_type,
+        func.count(UserCert.id).label('count')
+    ).filter(
+        UserCert.user_id.in_(reportee_ids),
+        UserCert.cert_type.isnot(None)
+    ).group_by(
+        UserCert.cert_type
+    ).all()
+
+
+def _certifications_by_category(db: Session, reportee_ids: List[str]) -> List:
+    return db.query(
+        UserCert.cert_cat,
+        func.count(UserCert.id).label('count')
+    ).filter(
+        UserCert.user_id.in_(reportee_ids),
+        UserCert.cert_cat.isnot(None)
+    ).group_by(
+        UserCert.cert_cat
+    ).all()
+
+
+def _user_certifications(db: Session, user_id: str) -> List[UserCert]:
+    return db.query(UserCert).filter(UserCert.user_id == user_id).all()
+
+
+def _get_user(db: Session, user_id: str) -> Optional[User]:
+    return db.query(User).filter(User.user_id == user_id).first()
+
+
+def _stream_reportees(manager_info: Dict, reportee_ids: List[str], include_text: bool, **include) -> Iterator[str]:
+    """
+    Yield the reportees payload as NDJSON, one DB batch at a time
+
+    Runs in Starlette's threadpool with its own session, which stays open
+    for the lifetime of the stream. Only one batch of rows is held in memory
+    at a time.
+    """
+    db = SessionLocal()
+    try:
+        yield json.dumps({"manager": manager_info, "reportee_count": len(reportee_ids)}) + "\n"
+        
+        loader = ReporteeDataLoader(db, chunk_size=settings.REPORTEE_STREAM_BATCH_SIZE, include_text=include_text)
+        in_database = 0
+        for batch in loader.iter_batches(reportee_ids, **include):
+            in_database += sum(1 for r in batch if r.get("in_database"))
+            yield "".join(json.dumps(r, default=str) + "\n" for r in batch)
+        
+        yield json.dumps({"reportees_in_database": in_database}) + "\n"
+        logger.info(f"Streamed {len(reportee_ids)} reportees in {loader.query_count} queries")
+    finally:
+        db.close()
+
+
 @router.get("/manager/{manager_id}/reportees")
 async def get_manager_reportees(
     manager_id: str,
+    request: Request,
     include_skills: bool = Query(True, description="Include skills data"),
     include_projects: bool = Query(True, description="Include projects data"),
     include_assets: bool = Query(True, description="Include assets data"),
     include_certifications: bool = Query(True, description="Include certifications data"),
     include_eminence: bool = Query(False, description="Include professional eminence data"),
-    db: Session = Depends(get_db),
+    include_text: bool = Query(False, description="Include large text fields (asset descriptions, contributions, tech used)"),
+    stream: bool = Query(False, description="Stream the response as NDJSON"),
+    adb: AsyncDB = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get manager's reportees with their complete information
     
     Workflow:
-    1. Fetch manager profile from IBM W3 API
+    1. Resolve manager profile (local hierarchy store or IBM W3 API)
     2. Extract reportee user IDs
     3. Get reportee details from local database
     4. Include assets, skills, projects, certifications as requested
@@ -44,23 +137,27 @@ async def get_manager_reportees(
         include_assets: Include assets data (default: True)
         include_certifications: Include certification data
         include_eminence: Include professional eminence data (default: False)
+        include_text: Include large Text columns, which are not loaded by default
+        stream: Stream as NDJSON (also selected by `Accept: application/x-ndjson`)
     
     Returns:
-        Manager info and list of reportees with their complete data
+        Manager info and list of reportees with their complete data.
+        In streaming mode: a header line {"manager", "reportee_count"}, one
+        line per reportee, then a trailer line {"reportees_in_database"}.
     """
     try:
-        # Step 1: Fetch manager profile from W3 API
-        logger.info(f"Fetching W3 profile for manager: {manager_id}")
-        profile_data = await W3ProfileService.get_user_profile(manager_id)
+        # Step 1: Resolve manager and reportee IDs (local hierarchy or W3 API)
+        logger.info(f"Resolving team for manager: {manager_id}")
+        team = await OrgHierarchyService.resolve_team(adb, manager_id)
         
-        if not profile_data:
+        if not team:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Manager profile not found in W3 API for user ID: {manager_id}"
             )
         
-        # Step 2: Extract manager info
-        manager_info = W3ProfileService.extract_manager_info(profile_data)
+        # Step 2: Extract manager info and reportee user IDs
+        manager_info, reportee_ids = team
         
         # Verify user is a manager
         if not manager_info.get("is_manager"):
@@ -69,8 +166,22 @@ async def get_manager_reportees(
                 detail=f"User {manager_id} is not a manager"
             )
         
-        # Step 3: Extract reportee user IDs
-        reportee_ids = W3ProfileService.extract_reportees(profile_data)
+        if stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            # The stream reads on its own session until the last line is sent
+            await adb.hold_connection()
+            return StreamingResponse(
+                _stream_reportees(
+                    manager_info,
+                    reportee_ids,
+                    include_text,
+                    include_skills=include_skills,
+                    include_projects=include_projects,
+                    include_assets=include_assets,
+                    include_certifications=include_certifications,
+                    include_eminence=include_eminence,
+                ),
+                media_type=NDJSON_MEDIA_TYPE,
+            )
         
         if not reportee_ids:
             return {
@@ -81,143 +192,21 @@ async def get_manager_reportees(
         
         logger.info(f"Found {len(reportee_ids)} reportees for manager {manager_id}")
         
-        # Step 4: Fetch reportee data from database
-        reportees_data = []
-        
-        for reportee_id in reportee_ids:
-            try:
-                # Get user from database
-                user = db.query(User).filter(User.user_id == reportee_id).first()
-                
-                if not user:
-                    # User not in database yet
-                    logger.warning(f"Reportee {reportee_id} not found in database")
-                    reportees_data.append({
-                        "user_id": reportee_id,
-                        "in_database": False,
-                        "message": "User not yet registered in system"
-                    })
-                    continue
-                
-                # Build reportee data
-                reportee_data = {
-                    "user_id": user.user_id,
-                    "name": user.name,
-                    "email": user.email,
-                    "user_type": user.user_type,
-                    "in_database": True
-                }
-                
-                # Include assets (default)
-                if include_assets:
-                    assets = db.query(Asset).filter(
-                        Asset.user_id == reportee_id
-                    ).all()
-                    
-                    reportee_data["assets"] = [
-                        {
-                            "id": a.id,
-                            "asset_name": a.asset_name,
-                            "asset_desc": a.asset_desc,
-                            "used_in_project": a.used_in_project,
-                            "ai_adoption": a.ai_adoption,
-                            "your_contribution": a.your_contribution,
-                            "status": a.status,
-                            "url": a.url
-                        }
-                        for a in assets
-                    ]
-                    reportee_data["assets_count"] = len(assets)
-                
-                # Include skills
-                if include_skills:
-                    skills = db.query(UserSkill).filter(
-                        UserSkill.user_id == reportee_id
-                    ).all()
-                    
-                    reportee_data["skills"] = [
-                        {
-                            "id": s.id,
-                            "platform": s.platform,
-                            "segment": s.segment,
-                            "proficiency_level": s.proficiency_level,
-                            "skill_type": s.skill_type,
-                            "yoe": s.yoe,
-                            "status": s.status
-                        }
-                        for s in skills
-                    ]
-                    reportee_data["skills_count"] = len(skills)
-                
-                # Include projects
-                if include_projects:
-                    projects = db.query(Project).filter(
-                        Project.user_id == reportee_id
-                    ).all()
-                    
-                    reportee_data["projects"] = [
-                        {
-                            "id": p.id,
-                            "project_name": p.project_name,
-                            "client_name": p.client_name,
-                            "your_role": p.your_role,
-                            "tech_used": p.tech_used,
-                            "is_foak": p.is_foak,
-                            "status": p.status,
-                            "asset_used": p.asset_used,
-                            "asset_name": p.asset_name
-                        }
-                        for p in projects
-                    ]
-                    reportee_data["projects_count"] = len(projects)
-                
-                # Include certifications
-                if include_certifications:
-                    certs = db.query(UserCert).filter(
-                        UserCert.user_id == reportee_id
-                    ).all()
-                    
-                    reportee_data["certifications"] = [
-                        {
-                            "id": c.id,
-                            "cert_name": c.cert_name,
-                            "cert_type": c.cert_type,
-                            "cert_cat": c.cert_cat,
-                            "issue_date": c.issue_date.isoformat() if c.issue_date else None,
-                            "status": c.status
-                        }
-                        for c in certs
-                    ]
-                    reportee_data["certifications_count"] = len(certs)
-                
-                # Include professional eminence (optional)
-                if include_eminence:
-                    eminences = db.query(ProfessionalEminence).filter(
-                        ProfessionalEminence.user_id == reportee_id,
-                    ).all()
-                    
-                    reportee_data["professional_eminence"] = [
-                        {
-                            "id": e.id,
-                            "employee_id": e.user_id,
-                            "manager_id": e.manager_id,
-                            "url": e.url,
-                            "eminence_type": e.eminence_type,
-                            "description": e.description,
-                            "scope": e.scope
-                        }
-                        for e in eminences
-                    ]
-                    reportee_data["eminence_count"] = len(eminences)
-                reportees_data.append(reportee_data)
-                
-            except Exception as e:
-                logger.error(f"Error processing reportee {reportee_id}: {str(e)}")
-                reportees_data.append({
-                    "user_id": reportee_id,
-                    "error": str(e),
-                    "in_database": False
-                })
+        # Step 4: Batch-load reportee data, each chunk's queries in parallel
+        loader = ReporteeDataLoader(include_text=include_text)
+        reportees_data = await loader.load_async(
+            adb,
+            reportee_ids,
+            include_skills=include_skills,
+            include_projects=include_projects,
+            include_assets=include_assets,
+            include_certifications=include_certifications,
+            include_eminence=include_eminence,
+        )
+        logger.info(
+            f"Loaded {len(reportee_ids)} reportees for manager {manager_id} "
+            f"in {loader.query_count} queries"
+        )
         
         # Step 5: Return complete response
         return {
@@ -240,27 +229,31 @@ async def get_manager_reportees(
 @router.get("/manager/{manager_id}/reportees/summary")
 async def get_reportees_summary(
     manager_id: str,
-    db: Session = Depends(get_db),
+    include_breakdown: bool = Query(False, description="Include per-reportee counts"),
+    adb: AsyncDB = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get summary statistics for manager's reportees
     
+    Args:
+        manager_id: Manager's user ID
+        include_breakdown: Also return counts per reportee (same query)
+    
     Returns:
         Summary of reportees' assets, skills, projects, certifications
     """
     try:
-        # Fetch manager profile
-        profile_data = await W3ProfileService.get_user_profile(manager_id)
+        # Resolve manager and reportee IDs
+        team = await OrgHierarchyService.resolve_team(adb, manager_id)
         
-        if not profile_data:
+        if not team:
             raise HTTPException(status_code=404, detail="Manager not found")
         
-        manager_info = W3ProfileService.extract_manager_info(profile_data)
-        reportee_ids = W3ProfileService.extract_reportees(profile_data)
+        manager_info, reportee_ids = team
         
         if not reportee_ids:
-            return {
+            response = {
                 "manager": manager_info,
                 "summary": {
                     "total_reportees": 0,
@@ -272,48 +265,35 @@ async def get_reportees_summary(
                     "total_eminence_records": 0
                 }
             }
+            if include_breakdown:
+                response["breakdown"] = []
+            return response
         
-        # Count reportees in database
-        reportees_in_db = db.query(User).filter(User.user_id.in_(reportee_ids)).count()
-        
-        # Count assets
-        total_assets = db.query(Asset).filter(
-            Asset.user_id.in_(reportee_ids)
-        ).count()
+        # All counts come back from one UNION ALL of grouped counts
+        counts = await adb.run(_count_sections, reportee_ids)
         
-        # Count skills
-        total_skills = db.query(UserSkill).filter(
-            UserSkill.user_id.in_(reportee_ids)
-        ).count()
+        def total(section: str) -> int:
+            return sum(c[section] for c in counts.values())
         
-        # Count projects
-        total_projects = db.query(Project).filter(
-            Project.user_id.in_(reportee_ids)
-        ).count()
-        
-        # Count certifications
-        total_certs = db.query(UserCert).filter(
-            UserCert.user_id.in_(reportee_ids)
-        ).count()
-        
-        # Count eminence records
-        total_eminence = db.query(ProfessionalEminence).filter(
-            ProfessionalEminence.user_id.in_(reportee_ids)
-        ).count()
-        
-        return {
+        response = {
             "manager": manager_info,
             "summary": {
                 "total_reportees": len(reportee_ids),
-                "reportees_in_system": reportees_in_db,
-                "total_assets": total_assets,
-                "total_skills": total_skills,
-                "total_projects": total_projects,
-                "total_certifications": total_certs,
-                "total_eminence_records": total_eminence,
+                "reportees_in_system": len(counts),
+                "total_assets": total("assets"),
+                "total_skills": total("skills"),
+                "total_projects": total("projects"),
+                "total_certifications": total("certifications"),
+                "total_eminence_records": total("eminence"),
                 "reportee_ids": reportee_ids
             }
         }
+        if include_breakdown:
+            response["breakdown"] = [
+                {"user_id": user_id, **section_counts}
+                for user_id, section_counts in counts.items()
+            ]
+        return response
         
     except HTTPException:
         raise
@@ -322,10 +302,153 @@ async def get_reportees_summary(
         raise HTTPException(status_code=500, detail="Failed to fetch summary")
 
 
+@router.get("/manager/{manager_id}/skill-matrix")
+async def get_team_skill_matrix(
+    manager_id: str,
+    skill_status: Optional[str] = Query(None, alias="status", description="Only count skills with this status, e.g. approved"),
+    all_skills: bool = Query(False, description="Include catalog skills nobody on the team holds"),
+    adb: AsyncDB = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Reportees x skills proficiency matrix for the manager heatmap
+    
+    Columnar instead of nested: `users` and `skills` are column arrays,
+    `matrix[i][j]` is reportee i's level on skill j (0 = not held, else the
+    1-based position in `levels`), and `aggregates` carries per-skill
+    holders, coverage and mean level, the bus-factor skills (indices held
+    by at most `threshold` reportees) and per-reportee breadth.
+    
+    Args:
+        manager_id: Manager's user ID
+        skill_status: Only count skills with this status (default: any)
+        all_skills: Add a column for every catalog skill
+    
+    Returns:
+        Manager info, reportee_count and the matrix payload
+    """
+    try:
+        team = await OrgHierarchyService.resolve_team(adb, manager_id)
+        
+        if not team:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Manager profile not found in W3 API for user ID: {manager_id}"
+            )
+        
+        manager_info, reportee_ids = team
+        
+        if not manager_info.get("is_manager"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"User {manager_id} is not a manager"
+            )
+        
+        # One LEFT JOIN of USERS and USER_SKILLS; the matrix is built with NumPy in the same worker thread
+        matrix = await adb.run(build_skill_matrix, reportee_ids, skill_status, all_skills)
+        return {
+            "manager": manager_info,
+            "reportee_count": len(reportee_ids),
+            **matrix
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_team_skill_matrix: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to build skill matrix"
+        )
+
+
+@router.get("/manager/{manager_id}/org")
+async def get_manager_org(
+    manager_id: str,
+    depth: int = Query(2, ge=1, le=settings.ORG_MAX_DEPTH, description="Levels below the manager to include"),
+    include_skills: bool = Query(True, description="Include skills data"),
+    include_projects: bool = Query(True, description="Include projects data"),
+    include_assets: bool = Query(True, description="Include assets data"),
+    include_certifications: bool = Query(True, description="Include certifications data"),
+    include_eminence: bool = Query(False, description="Include professional eminence data"),
+    include_text: bool = Query(False, description="Include large text fields (asset descriptions, contributions, tech used)"),
+    adb: AsyncDB = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get a manager's multi-level (skip-level) organization
+    
+    Workflow:
+    1. Walk the reporting tree breadth-first, resolving each level's
+       profiles concurrently (bounded by W3_FANOUT_CONCURRENCY)
+    2. Batch-load database data for the whole subtree at once
+    
+    Args:
+        manager_id: Manager's user ID
+        depth: Number of levels below the manager (1 = direct reports only)
+        include_*: Sections to include, as for /reportees
+    
+    Returns:
+        Manager info, every reportee in the subtree with its level and
+        direct manager, and per-level timing metadata
+    """
+    try:
+        tree = await OrgTreeWalker(adb).walk(manager_id, depth)
+        
+        if tree is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Manager profile not found in W3 API for user ID: {manager_id}"
+            )
+        
+        manager_info = tree["manager"]
+        if not manager_info.get("is_manager"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"User {manager_id} is not a manager"
+            )
+        
+        nodes = tree["nodes"]
+        db_started = time.perf_counter()
+        loader = ReporteeDataLoader(include_text=include_text)
+        reportees_data = await loader.load_async(
+            adb,
+            list(nodes),
+            include_skills=include_skills,
+            include_projects=include_projects,
+            include_assets=include_assets,
+            include_certifications=include_certifications,
+            include_eminence=include_eminence,
+        )
+        for reportee in reportees_data:
+            reportee.update(nodes[reportee["user_id"]])
+        
+        metadata = tree["metadata"]
+        metadata["db_ms"] = round((time.perf_counter() - db_started) * 1000, 2)
+        metadata["db_queries"] = loader.query_count
+        
+        return {
+            "manager": manager_info,
+            "reportee_count": len(nodes),
+            "reportees_in_database": len([r for r in reportees_data if r.get("in_database")]),
+            "reportees": reportees_data,
+            "metadata": metadata
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_manager_org: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch organization data"
+        )
+
+
 @router.get("/manager/{manager_id}/certifications-summary")
 async def get_reportees_certifications_summary(
     manager_id: str,
-    db: Session = Depends(get_db),
+    adb: AsyncDB = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -337,19 +460,17 @@ async def get_reportees_certifications_summary(
         - Breakdown by certification type/category
     """
     try:
-        # Fetch manager profile from W3 API
-        logger.info(f"Fetching W3 profile for manager: {manager_id}")
-        profile_data = await W3ProfileService.get_user_profile(manager_id)
+        # Resolve manager info and reportees
+        logger.info(f"Resolving team for manager: {manager_id}")
+        team = await OrgHierarchyService.resolve_team(adb, manager_id)
         
-        if not profile_data:
+        if not team:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Manager profile not found in W3 API for user ID: {manager_id}"
             )
         
-        # Extract manager info and reportees
-        manager_info = W3ProfileService.extract_manager_info(profile_data)
-        reportee_ids = W3ProfileService.extract_reportees(profile_data)
+        manager_info, reportee_ids = team
         
         if not reportee_ids:
             return {
@@ -361,46 +482,13 @@ async def get_reportees_certifications_summary(
                 "certifications_by_category": []
             }
         
-        # Get total certification count across all reportees
-        total_certs = db.query(func.count(UserCert.id)).filter(
-            UserCert.user_id.in_(reportee_ids)
-        ).scalar()
-        
-        # Get certification count per reportee
-        certs_by_reportee = db.query(
-            UserCert.user_id,
-            User.name,
-            User.email,
-            func.count(UserCert.id).label('cert_count')
-        ).join(
-            User, User.user_id == UserCert.user_id
-        ).filter(
-            UserCert.user_id.in_(reportee_ids)
-        ).group_by(
-            UserCert.user_id, User.name, User.email
-        ).all()
-        
-        # Get certification breakdown by type
-        certs_by_type = db.query(
-            UserCert.cert_type,
-            func.count(UserCert.id).label('count')
-        ).filter(
-            UserCert.user_id.in_(reportee_ids),
-            UserCert.cert_type.isnot(None)
-        ).group_by(
-            UserCert.cert_type
-        ).all()
-        
-        # Get certification breakdown by category
-        certs_by_category = db.query(
-            UserCert.cert_cat,
-            func.count(UserCert.id).label('count')
-        ).filter(
-            UserCert.user_id.in_(reportee_ids),
-            UserCert.cert_cat.isnot(None)
-        ).group_by(
-            UserCert.cert_cat
-        ).all()
+        # Independent aggregates run in parallel on separate connections
+        total_certs, certs_by_reportee, certs_by_type, certs_by_category = await adb.gather(
+            (_total_certifications, reportee_ids),
+            (_certifications_by_reportee, reportee_ids),
+            (_certifications_by_type, reportee_ids),
+            (_certifications_by_category, reportee_ids),
+        )
         
         # Format response
         return {
@@ -446,7 +534,7 @@ async def get_reportees_certifications_summary(
 async def get_reportee_certifications_detail(
     manager_id: str,
     reportee_id: str,
-    db: Session = Depends(get_db),
+    adb: AsyncDB = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -461,14 +549,14 @@ async def get_reportee_certifications_detail(
     """
     try:
         # Verify manager-reportee relationship
-        profile_data = await W3ProfileService.get_user_profile(manager_id)
-        if not profile_data:
+        team = await OrgHierarchyService.resolve_team(adb, manager_id)
+        if not team:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Manager not found"
             )
         
-        reportee_ids = W3ProfileService.extract_reportees(profile_data)
+        _, reportee_ids = team
         
         if reportee_id not in reportee_ids:
             raise HTTPException(
@@ -476,13 +564,11 @@ async def get_reportee_certifications_detail(
                 detail=f"User {reportee_id} is not a reportee of manager {manager_id}"
             )
         
-        # Get reportee's certifications
-        certifications = db.query(UserCert).filter(
-            UserCert.user_id == reportee_id
-        ).all()
-        
-        # Get user info
-        user = db.query(User).filter(User.user_id == reportee_id).first()
+        # Get reportee's certifications and user info in parallel
+        certifications, user = await adb.gather(
+            (_user_certifications, reportee_id),
+            (_get_user, reportee_id),
+        )
         
         return {
             "reportee": {
@@ -491,17 +577,7 @@ async def get_reportee_certifications_detail(
                 "email": user.email if user else "Unknown"
             },
             "certification_count": len(certifications),
-            "certifications": [
-                {
-                    "id": c.id,
-                    "cert_name": c.cert_name,
-                    "cert_type": c.cert_type,
-                    "cert_cat": c.cert_cat,
-                    "issue_date": c.issue_date.isoformat() if c.issue_date else None,
-                    "status": c.status
-                }
-                for c in certifications
-            ]
+            "certifications": [serialize_certification(c) for c in certifications]
         }
         
     except HTTPException:
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Body, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List, Optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.user_cert import UserCert
 from app.schemas.user_cert import UserCertCreate, UserCertUpdate, UserCertResponse
+from app.schemas.bulk import BulkCreateResponse
 from app.auth.dependencies import get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, with_fields, sparse_response
+from app.services.bulk_writer import bulk_create
+from app.api.pagination import cursor_query, parse_cursor, paginate, with_next_cursor
+from app.services.row_writer import insert_row, update_row
 
 router = APIRouter()
 
@@ -33,18 +39,25 @@ router = APIRouter()
 @router.get("/{user_id}", response_model=List[UserCertResponse])
 def get_by_user(
     user_id: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all certifications for a specific user"""
+    selected = parse_fields(fields, UserCertResponse, UserCert)
+    after = parse_cursor(cursor, UserCert)
     try:
-        items = db.query(UserCert).filter(
+        query = with_fields(db.query(UserCert), UserCert, selected).filter(
             UserCert.user_id == user_id
-        ).offset(skip).limit(limit).all()
-        if items is None:
-            items = []
+        )
+        items, next_cursor = paginate(query, UserCert, after, skip, limit)
+        if selected:
+            return with_next_cursor(sparse_response(items, selected), next_cursor)
+        with_next_cursor(response, next_cursor)
         return items
     except TypeError as e:
         print(f"DB2 TypeError fetching certs for user {user_id}: {e}")
@@ -62,16 +75,42 @@ def create(
     try:
         cert_data = item.dict()
         cert_data['user_id'] = current_user["user_id"]
-        new_item = UserCert(**cert_data)
-        db.add(new_item)
+        new_item = insert_row(db, UserCert, cert_data)
         db.commit()
-        db.refresh(new_item)
         return new_item
     except Exception as e:
         db.rollback()
         print(f"Error creating user cert: {e}")
         raise HTTPException(status_code=500, detail=f"Error creating user cert: {str(e)}")
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_bulk(
+    response: Response,
+    items: List[Any] = Body(..., description="UserCertCreate objects; user_id is taken from the session"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Create several user certifications in one transaction
+
+    Returns 201 when every item was created, 207 when some items failed
+    (see `errors`, indexed by position in the request).
+    """
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per request"
+        )
+    try:
+        result = bulk_create(db, UserCert, UserCertCreate, items, {"user_id": current_user["user_id"]})
+    except Exception as e:
+        db.rollback()
+        print(f"Error bulk creating user certifications: {e}")
+        raise HTTPException(status_code=500, detail=f"Error bulk creating user certifications: {str(e)}")
+    if result["errors"]:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
+
 @router.put("/{cert_id}", response_model=UserCertResponse)
 def update(
     cert_id: int,
@@ -80,18 +119,15 @@ def update(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        item = db.query(UserCert).filter(
-            UserCert.id == cert_id
-            # UserCert.user_id == current_user["user_id"]
-        ).first()
+        item = update_row(
+            db, UserCert,
+            {"id": cert_id},  # {"id": cert_id, "user_id": current_user["user_id"]}
+            item_update.dict(exclude_unset=True),
+        )
         if not item:
             raise HTTPException(status_code=404, detail=f"Certificate with ID {cert_id} not found")
         
-        for key, value in item_update.dict(exclude_unset=True).items():
-            setattr(item, key, value)
-        
         db.commit()
-        db.refresh(item)
         return item
     except HTTPException:
         raise
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Body, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List, Optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.user_skills import UserSkill
 from app.schemas.user_skills import UserSkillCreate, UserSkillUpdate, UserSkillResponse
+from app.schemas.bulk import BulkCreateResponse
 from app.auth.dependencies import get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, with_fields, sparse_response
+from app.services.bulk_writer import bulk_create
+from app.services.expert_index import expert_index
+from app.services.similarity_index import similarity_index
+from app.api.pagination import cursor_query, parse_cursor, paginate, with_next_cursor
+from app.services.row_writer import insert_row, update_row
 router = APIRouter()
 # @router.get("/", response_model=List[UserSkillResponse])
 # def get_all(
@@ -27,18 +35,25 @@ router = APIRouter()
 @router.get("/{user_id}", response_model=List[UserSkillResponse])
 def get_by_user(
     user_id: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all skills for a specific user"""
+    selected = parse_fields(fields, UserSkillResponse, UserSkill)
+    after = parse_cursor(cursor, UserSkill)
     try:
-        items = db.query(UserSkill).filter(
+        query = with_fields(db.query(UserSkill), UserSkill, selected).filter(
             UserSkill.user_id == user_id
-        ).offset(skip).limit(limit).all()
-        if items is None:
-            items = []
+        )
+        items, next_cursor = paginate(query, UserSkill, after, skip, limit)
+        if selected:
+            return with_next_cursor(sparse_response(items, selected), next_cursor)
+        with_next_cursor(response, next_cursor)
         return items
     except Exception as e:
         print(f"Error fetching skills for user {user_id}:", e)
@@ -52,15 +67,47 @@ def create(
     try:
         skill_data = item.dict()
         skill_data['user_id'] = current_user["user_id"]
-        new_item = UserSkill(**skill_data)
-        db.add(new_item)
+        new_item = insert_row(db, UserSkill, skill_data)
         db.commit()
-        db.refresh(new_item)
-        return new_item
     except Exception as e:
         db.rollback()
         print(f"Error creating user skill: {e}")
         raise HTTPException(status_code=500, detail=f"Error creating user skill: {str(e)}")
+    # After the commit: index failures are logged by the indexes, not reported as a failed create
+    expert_index.put([new_item])
+    similarity_index.put([new_item])
+    return new_item
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_bulk(
+    response: Response,
+    items: List[Any] = Body(..., description="UserSkillCreate objects; user_id is taken from the session"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Create several user skills in one transaction
+
+    Returns 201 when every item was created, 207 when some items failed
+    (see `errors`, indexed by position in the request).
+    """
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per request"
+        )
+    try:
+        result = bulk_create(db, UserSkill, UserSkillCreate, items, {"user_id": current_user["user_id"]})
+    except Exception as e:
+        db.rollback()
+        print(f"Error bulk creating user skills: {e}")
+        raise HTTPException(status_code=500, detail=f"Error bulk creating user skills: {str(e)}")
+    if result["created"]:
+        created_ids = [created["id"] for created in result["created"]]
+        expert_index.put_ids(db, created_ids)
+        similarity_index.put_ids(db, created_ids)
+    if result["errors"]:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
 @router.put("/{skill_id}", response_model=UserSkillResponse)
 def update(
     skill_id: int,
@@ -68,15 +115,12 @@ def update(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    item = db.query(UserSkill).filter(
-        UserSkill.id == skill_id
-    ).first()
+    item = update_row(db, UserSkill, {"id": skill_id}, item_update.dict(exclude_unset=True))
     if not item:
         raise HTTPException(status_code=404, detail="User skill not found")
-    for key, value in item_update.dict(exclude_unset=True).items():
-        setattr(item, key, value)
     db.commit()
-    db.refresh(item)
+    expert_index.put([item])
+    similarity_index.put([item])
     return item
 @router.delete("/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete(
@@ -92,4 +136,6 @@ def delete(
         raise HTTPException(status_code=404, detail="User skill not found")
     db.delete(item)
     db.commit()
+    expert_index.remove(skill_id)
+    similarity_index.remove(skill_id)
     return None
\ No newline at end of file
@@ -1,23 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Body, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
-from typing import List
+from typing import Any, List, Optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.users import User
-from app.schemas.users import UserCreate, UserUpdate, UserResponse
-from app.auth.dependencies import get_current_user
+from app.schemas.users import UserCreate, UserUpdate, UserResponse, UserSearchResult, SimilarUsersResponse
+from app.schemas.bulk import BulkUpsertResponse
+from app.auth.dependencies import get_current_admin, get_current_user
+from app.api.sparse_fields import fields_query, parse_fields, with_fields, sparse_response
+from app.api.pagination import cursor_query, parse_cursor, paginate, with_next_cursor
+from app.services.row_writer import update_row
+from app.services.expert_index import expert_index
+from app.services.people_index import people_index
+from app.services.similarity_index import similarity_index
+from app.services.user_upsert import import_users, upsert_user
 router = APIRouter()
 @router.get("/", response_model=List[UserResponse])
 def get_all(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = fields_query(),
+    cursor: Optional[str] = cursor_query(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    selected = parse_fields(fields, UserResponse, User)
+    after = parse_cursor(cursor, User)
     try:
-        items = db.query(User).offset(skip).limit(limit).all()
-        if items is None:
-            items = []
+        query = with_fields(db.query(User), User, selected)
+        items, next_cursor = paginate(query, User, after, skip, limit)
+        if selected:
+            return with_next_cursor(sparse_response(items, selected), next_cursor)
+        with_next_cursor(response, next_cursor)
         return items
     except TypeError as e:
         print(f"DB2 TypeError in get_all users: {e}")
@@ -25,6 +41,23 @@ def get_all(
     except Exception as e:
         print(f"Error fetching users: {e}")
         return []
+@router.get("/search", response_model=List[UserSearchResult])
+def search(
+    q: str = Query(..., min_length=1, description="Name or email typed so far; each word must prefix a name or email word"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    People typeahead by name or email, served from the in-memory people index
+
+    Case-insensitive; names starting with the query come first.
+    """
+    try:
+        people_index.ensure_ready()
+        return people_index.search(q, limit)
+    except Exception as e:
+        print(f"Error searching users: {e}")
+        raise HTTPException(status_code=500, detail=f"Error searching users: {str(e)}")
 @router.get("/{item_id}", response_model=UserResponse)
 def get_one(
     item_id: str,
@@ -44,47 +77,84 @@ def get_one(
     except Exception as e:
         print(f"Error fetching user {item_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+@router.get("/{item_id}/similar", response_model=SimilarUsersResponse)
+def get_similar(
+    item_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Colleagues with the most similar skill profile (cosine similarity)
+
+    Profiles cover catalog skills, weighted by proficiency and years of
+    experience, and certification categories; served from the in-memory
+    similarity and people indexes without querying the database.
+    """
+    try:
+        similarity_index.ensure_ready()
+        similar = similarity_index.similar(item_id, limit)
+    except Exception as e:
+        print(f"Error finding users similar to {item_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error finding similar users: {str(e)}")
+    if similar is None:
+        raise HTTPException(status_code=404, detail=f"User with ID {item_id} has no skills or certifications")
+    people = people_index.lookup(match["user_id"] for match in similar)
+    return {
+        "user_id": item_id,
+        "similar": [{**people.get(match["user_id"], {}), **match} for match in similar],
+    }
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def create(
     item: UserCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    """
+    Register the user, or return the existing one (matched by user_id or email)
+
+    Called on every login, so an existing user costs one lookup; first
+    logins are inserted by one statement that returns the stored row and
+    tolerates concurrent registrations.
+    """
     try:
-        print(f"DEBUG: create user payload: {item.dict()}")
-        print("DEBUG: Checking for existing user by ID...")
-        try:
-            existing = db.query(User).filter(User.user_id == item.user_id).first()
-        except TypeError:
-            existing = None
-        if not existing:
-            print("DEBUG: Checking for existing user by Email...")
-            try:
-                existing = db.query(User).filter(User.email == item.email).first()
-            except TypeError:
-                existing = None
-        print(f"DEBUG: Existing user check result: {existing}")
-        if existing:
-            print("DEBUG: User exists, returning existing user")
-            return existing
-        print("DEBUG: Creating new user instance...")
-        user_data = item.dict()
-        new_item = User(**user_data)
-        print(f"DEBUG: New item created: {new_item}")
-        print("DEBUG: Adding to DB...")
-        db.add(new_item)
-        print("DEBUG: Committing...")
-        db.commit()
-        print("DEBUG: Refreshing...")
-        db.refresh(new_item)
-        print("DEBUG: User created successfully")
-        return new_item
+        user, created = upsert_user(db, item.dict())
     except Exception as e:
         db.rollback()
-        import traceback
-        traceback.print_exc()
         print(f"Error creating user: {e}")
         raise HTTPException(status_code=500, detail=f"Error creating user: {str(e)}")
+    # After the commit: index failures are logged by the index, not reported as a failed create
+    if created:
+        people_index.put([user])
+    return user
+@router.post("/bulk", response_model=BulkUpsertResponse)
+def import_bulk(
+    response: Response,
+    items: List[Any] = Body(..., description="UserCreate objects, e.g. exported from W3; managers first"),
+    db: Session = Depends(get_db),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Import users in batches (admin only); existing users are left unchanged
+
+    Returns 200 when every item was inserted or already existed, 207 when
+    some items failed (see `errors`, indexed by position in the request).
+    """
+    if len(items) > settings.USER_IMPORT_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.USER_IMPORT_MAX_ITEMS} users per request"
+        )
+    try:
+        result = import_users(db, items)
+    except Exception as e:
+        db.rollback()
+        print(f"Error importing users: {e}")
+        raise HTTPException(status_code=500, detail=f"Error importing users: {str(e)}")
+    if result["inserted"]:
+        people_index.put_ids(db, [raw["user_id"] for raw in items if isinstance(raw, dict) and raw.get("user_id")])
+    if result["errors"]:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
 @router.put("/{item_id}", response_model=UserResponse)
 def update(
     item_id: str,
@@ -93,14 +163,10 @@ def update(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        item = db.query(User).filter(User.user_id == item_id).first()
+        item = update_row(db, User, {"user_id": item_id}, item_update.dict(exclude_unset=True))
         if not item:
             raise HTTPException(status_code=404, detail=f"User with ID {item_id} not found")
-        for key, value in item_update.dict(exclude_unset=True).items():
-            setattr(item, key, value)
         db.commit()
-        db.refresh(item)
-        return item
     except HTTPException:
         raise
     except TypeError as e:
@@ -110,6 +176,8 @@ def update(
         db.rollback()
         print(f"Error updating user {item_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Error updating user: {str(e)}")
+    people_index.put([item])
+    return item
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete(
     item_id: str,
@@ -122,7 +190,6 @@ def delete(
             raise HTTPException(status_code=404, detail=f"User with ID {item_id} not found")
         db.delete(item)
         db.commit()
-        return None
     except HTTPException:
         raise
     except TypeError as e:
@@ -131,4 +198,8 @@ def delete(
     except Exception as e:
         db.rollback()
         print(f"Error deleting user {item_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Error deleting user: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error deleting user: {str(e)}")
+    people_index.remove(item_id)
+    similarity_index.remove_user(item_id)
+    expert_index.remove_user(item_id)
+    return None
\ No newline at end of file
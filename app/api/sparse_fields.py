@@ -0,0 +1,63 @@
+from typing import List, Mapping, Optional, Type
+
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+from app.core.server_timing import TimedJSONResponse
+
+
+def fields_query():
+    """Shared `fields=` query parameter for list endpoints"""
+    return Query(
+        None,
+        description="Comma-separated response fields to return (sparse fieldset); "
+                    "omitted columns are not loaded from the database",
+    )
+
+
+def parse_fields(fields: Optional[str], response_model: Type[BaseModel], model) -> Optional[List[str]]:
+    """
+    Validate a `fields=` value against a response model
+
+    Args:
+        fields: Raw comma-separated value from the query string
+        response_model: Pydantic response schema of the endpoint
+        model: SQLAlchemy model backing the endpoint
+
+    Returns:
+        Ordered list of selected fields (primary key always included),
+        or None when no sparse fieldset was requested
+    """
+    if not fields:
+        return None
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    allowed = list(response_model.model_fields)
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+
+    mapper = inspect(model)
+    primary_keys = [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+    return list(dict.fromkeys(primary_keys + requested))
+
+
+def with_fields(query, model, selected: Optional[List[str]]):
+    """Restrict a query to the selected columns with load_only"""
+    if not selected:
+        return query
+    return query.options(load_only(*(getattr(model, f) for f in selected)))
+
+
+def sparse_response(items, selected: List[str]) -> TimedJSONResponse:
+    """Serialize only the selected attributes (or keys, for dict items), bypassing the full response model"""
+    return TimedJSONResponse(content=jsonable_encoder([
+        {f: item[f] for f in selected} if isinstance(item, Mapping) else {f: getattr(item, f) for f in selected}
+        for item in items
+    ]))
@@ -1,6 +1,7 @@
-from fastapi import Request, HTTPException, status
+from fastapi import Depends, Request, HTTPException, status
 from typing import Dict
 import logging
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -85,3 +86,17 @@ async def get_current_user_optional(request: Request) -> Dict | None:
         "family_name": user.get("family_name"),
         "raw_user": user
     }
+
+def is_admin(user: Dict | None) -> bool:
+    '''Whether a normalized user is listed in ADMIN_USER_IDS'''
+    return bool(user) and user.get("user_id") in settings.admin_user_ids
+
+async def get_current_admin(current_user: Dict = Depends(get_current_user)) -> Dict:
+    '''Dependency restricting an endpoint to ADMIN_USER_IDS'''
+    if not is_admin(current_user):
+        logger.warning(f"Admin access denied for {current_user.get('user_id')}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
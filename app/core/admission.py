@@ -0,0 +1,248 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import anyio.to_thread
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def pool_capacity() -> int:
+    return settings.SQLALCHEMY_POOL_SIZE + settings.SQLALCHEMY_MAX_OVERFLOW
+
+
+def thread_limit() -> int:
+    return settings.ADMISSION_THREAD_LIMIT or pool_capacity()
+
+
+def bulkhead_limits() -> Tuple[int, int]:
+    """
+    Concurrency limits of the team and API bulkheads, in pooled connections
+
+    Team routes are admitted per DB call (AsyncDB.run holds a team slot for
+    one call on one connection, never across W3 lookups); any other API
+    request holds one connection for its whole duration. By default the
+    team DB calls get half of the pool and the other routes the rest, and
+    explicit settings must still fit.
+
+    Raises:
+        ValueError: If both bulkheads at full concurrency exceed the pool
+    """
+    capacity = pool_capacity()
+    team = settings.BULKHEAD_TEAM_CONCURRENCY or max(1, capacity // 2)
+    api = settings.BULKHEAD_API_CONCURRENCY or capacity - team
+    if api < 1 or team + api > capacity:
+        raise ValueError(
+            f"Bulkheads need {team} (team) + {api} (api) connections, more than the pool "
+            f"capacity of {capacity}: lower BULKHEAD_TEAM_CONCURRENCY or BULKHEAD_API_CONCURRENCY, "
+            f"or enlarge the pool"
+        )
+    return team, api
+
+
+class BulkheadRejected(HTTPException):
+    """
+    Raised when a request cannot be admitted to a bulkhead
+
+    An HTTPException (503 + Retry-After), so a rejection inside a route's
+    DB call passes through the routes' `except HTTPException: raise`.
+    """
+
+    def __init__(self, bulkhead: str, reason: str):
+        super().__init__(
+            status_code=503,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+        )
+        self.bulkhead = bulkhead
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"{self.bulkhead}: {self.reason}"
+
+
+class Bulkhead:
+    """
+    Concurrency limit with a short, bounded admission queue.
+
+    At most `limit` requests run at once. Up to `max_queue` more may wait,
+    each for at most `queue_timeout` seconds; anything beyond that is
+    rejected immediately so the client can retry instead of piling up
+    behind the connection pool.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._semaphore = asyncio.Semaphore(limit)
+        self._active = 0
+        self._queued = 0
+        self._counters = {
+            "admitted": 0,
+            "queued_total": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+            "max_queue_depth": 0,
+        }
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked():
+            if self._queued >= self.max_queue:
+                self._counters["rejected_queue_full"] += 1
+                raise BulkheadRejected(self.name, "queue full")
+
+            self._queued += 1
+            self._counters["queued_total"] += 1
+            self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], self._queued)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._counters["rejected_timeout"] += 1
+                raise BulkheadRejected(self.name, "queue timeout")
+            finally:
+                self._queued -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self._active += 1
+        self._counters["admitted"] += 1
+
+    def release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "active": self._active,
+            "queue_depth": self._queued,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            **self._counters,
+        }
+
+
+_TEAM_LIMIT, _API_LIMIT = bulkhead_limits()
+
+# DB calls of the async team routes, admitted one call at a time by AsyncDB
+TEAM_BULKHEAD = Bulkhead(
+    "team",
+    _TEAM_LIMIT,
+    settings.BULKHEAD_MAX_QUEUE,
+    settings.BULKHEAD_QUEUE_TIMEOUT,
+)
+API_BULKHEAD = Bulkhead(
+    "api",
+    _API_LIMIT,
+    settings.BULKHEAD_MAX_QUEUE,
+    settings.BULKHEAD_QUEUE_TIMEOUT,
+)
+BULKHEADS: List[Bulkhead] = [TEAM_BULKHEAD, API_BULKHEAD]
+
+# Whole requests admitted by the middleware; first matching prefix wins
+ROUTE_BULKHEADS: List[Tuple[str, Bulkhead]] = [
+    ("/api", API_BULKHEAD),
+]
+
+# Never shed: operational endpoints must stay reachable under overload.
+# Team routes are not held for their whole duration (which includes W3
+# lookups of up to W3 timeout): their DB calls go through TEAM_BULKHEAD.
+EXEMPT_PREFIXES = ("/api/ops", "/api/team")
+
+# Request scope key of the slots held until the response has been sent
+HELD_SLOTS_KEY = "admission.held"
+
+
+def bulkhead_for(path: str) -> Optional[Bulkhead]:
+    if path.startswith(EXEMPT_PREFIXES):
+        return None
+    for prefix, bulkhead in ROUTE_BULKHEADS:
+        if path == prefix or path.startswith(prefix + "/"):
+            return bulkhead
+    return None
+
+
+async def hold_until_sent(scope: Scope, bulkhead: Bulkhead) -> None:
+    """
+    Take a slot that AdmissionControlMiddleware releases once the response
+    has been sent, e.g. for a streamed body that keeps a connection open
+    """
+    await bulkhead.acquire()
+    scope.setdefault(HELD_SLOTS_KEY, []).append(bulkhead)
+
+
+def configure_thread_limiter() -> None:
+    """
+    Cap Starlette's worker threads (used by sync routes and AsyncDB) at the
+    pool capacity, so threads wait cheaply on the limiter instead of blocking
+    for SQLALCHEMY_POOL_TIMEOUT on a pool checkout. Must run inside the
+    server's event loop (the limiter is per loop).
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = thread_limit()
+    logger.info(f"Worker thread limit set to {limiter.total_tokens} (pool capacity {pool_capacity()})")
+
+
+def admission_stats() -> Dict:
+    """Bulkhead, thread limiter and connection pool occupancy"""
+    from app.core.database import engine
+
+    stats = {"bulkheads": [bulkhead.stats() for bulkhead in BULKHEADS]}
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter_stats = limiter.statistics()
+        stats["threads"] = {
+            "limit": limiter.total_tokens,
+            "busy": limiter.borrowed_tokens,
+            "waiting": limiter_stats.tasks_waiting,
+        }
+    except RuntimeError:
+        stats["threads"] = None
+
+    pool = engine.pool
+    stats["pool"] = {
+        "capacity": pool_capacity(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "timeout": settings.SQLALCHEMY_POOL_TIMEOUT,
+    }
+    return stats
+
+
+class AdmissionControlMiddleware:
+    """Admit HTTP requests through their route group's bulkhead, shedding with 503"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        bulkhead = bulkhead_for(scope["path"])
+        if bulkhead is not None:
+            try:
+                await bulkhead.acquire()
+            except BulkheadRejected as e:
+                logger.warning(f"Shedding {scope['method']} {scope['path']}: {e}")
+                response = JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
+                await response(scope, receive, send)
+                return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+            for held in scope.pop(HELD_SLOTS_KEY, ()):
+                held.release()
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.types import Scope
+
+from app.core.admission import TEAM_BULKHEAD, Bulkhead, hold_until_sent
+from app.core.config import settings
+from app.core import database
+
+
+class AsyncDB:
+    """
+    Thread-offloaded data access for async routes.
+
+    Every `run` call executes a synchronous function in Starlette's threadpool
+    with its own short-lived session, so the event loop never blocks on DB2
+    and independent queries passed to `gather` run in parallel on separate
+    pooled connections. The number of concurrent calls per instance is capped
+    at `parallelism` so one request cannot drain the connection pool.
+    """
+
+    def __init__(self, parallelism: int = None, bulkhead: Optional[Bulkhead] = None, scope: Optional[Scope] = None):
+        self.parallelism = parallelism or settings.DB_ROUTE_PARALLELISM
+        self._semaphore = asyncio.Semaphore(self.parallelism)
+        # Admission per call: a slot is held only while a call runs, not
+        # while the route waits on anything else (e.g. W3)
+        self.bulkhead = bulkhead
+        self._scope = scope
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run `fn(session, *args)` in a worker thread
+
+        The session is committed by `fn` if it writes; it is rolled back on
+        error and always closed. ORM objects returned by `fn` are detached,
+        so only attributes loaded inside `fn` should be used afterwards.
+        """
+        async with self._semaphore:
+            if self.bulkhead is None:
+                return await run_in_threadpool(with_session, fn, *args)
+            await self.bulkhead.acquire()
+            try:
+                return await run_in_threadpool(with_session, fn, *args)
+            finally:
+                self.bulkhead.release()
+
+    async def hold_connection(self) -> None:
+        """
+        Admit a response that keeps its own connection open while it is sent
+        (a streamed body); the slot is released after the last byte
+        """
+        if self.bulkhead is not None and self._scope is not None:
+            await hold_until_sent(self._scope, self.bulkhead)
+
+    async def gather(self, *calls: Tuple) -> List[Any]:
+        """
+        Run several `(fn, *args)` calls concurrently
+
+        Returns:
+            Results in call order; the first failure is raised
+        """
+        return list(await asyncio.gather(*(self.run(*call) for call in calls)))
+
+
+def with_session(fn: Callable[..., Any], *args) -> Any:
+    """Call `fn(session, *args)` with a dedicated session (blocking)"""
+    db: Session = database.SessionLocal()
+    try:
+        return fn(db, *args)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_async_db(request: Request) -> AsyncDB:
+    """Dependency providing a per-request AsyncDB, admitted per call through the team bulkhead"""
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return AsyncDB()
+    return AsyncDB(bulkhead=TEAM_BULKHEAD, scope=request.scope)
@@ -1,6 +1,14 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
+
+@lru_cache(maxsize=8)
+def _parse_scale(value: str) -> tuple:
+    # Memoized on the raw string: indexes call this once per row they load
+    return tuple(level.strip().lower() for level in value.split(",") if level.strip())
+
+
 class Settings(BaseSettings):
     # IBM Cloud DB2 Configuration
     DB2_DATABASE: str = "bludb"
@@ -18,6 +26,60 @@ class Settings(BaseSettings):
     SQLALCHEMY_POOL_RECYCLE: int = 3600
     SQLALCHEMY_ECHO: bool = False
 
+    # Max values bound into a single IN (...) list before a query is split into chunks
+    DB2_IN_CLAUSE_CHUNK_SIZE: int = 500
+    # Reportees loaded per batch when streaming NDJSON (bounds worker memory)
+    REPORTEE_STREAM_BATCH_SIZE: int = 50
+    # Bulk create endpoints: max items per request and rows per multi-row INSERT
+    BULK_MAX_ITEMS: int = 500
+    BULK_INSERT_CHUNK_SIZE: int = 100
+    # Admin user import (POST /api/users/bulk): max users per request and rows per MERGE
+    USER_IMPORT_MAX_ITEMS: int = 10000
+    USER_IMPORT_BATCH_SIZE: int = 500
+    # Max queries a single request runs in parallel (each holds its own pooled connection)
+    DB_ROUTE_PARALLELISM: int = 4
+
+    # Admission control: worker threads are capped at the connection pool's
+    # capacity (0 = SQLALCHEMY_POOL_SIZE + SQLALCHEMY_MAX_OVERFLOW) and route
+    # groups get their own bulkheads, sized in connections so that both fit in
+    # the pool: team routes are admitted per DB call, other API requests for
+    # their whole duration. Requests (or team DB calls) that cannot be admitted
+    # within the queue timeout get 503 + Retry-After.
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_THREAD_LIMIT: int = 0
+    BULKHEAD_TEAM_CONCURRENCY: int = 0  # team-route DB calls at once; 0 = half the pool
+    BULKHEAD_API_CONCURRENCY: int = 0  # 0 = the connections the team bulkhead leaves
+    BULKHEAD_MAX_QUEUE: int = 20
+    BULKHEAD_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_RETRY_AFTER: int = 2
+
+    # Per-request SQL instrumentation (statement counts, SQL time, pool waits)
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_REQUEST_LOGGING: bool = True
+    # Identical statement shapes repeated this often in one request are logged as N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Prometheus text-format metrics on /metrics
+    METRICS_ENABLED: bool = True
+
+    # Server-Timing response header (db, w3, render); optionally also logged per request
+    SERVER_TIMING_ENABLED: bool = True
+    SERVER_TIMING_ACCESS_LOG: bool = False
+
+    # Comma-separated W3 user IDs allowed to use admin endpoints
+    ADMIN_USER_IDS: str = ""
+
+    # Opt-in request profiler (requires the optional 'pyinstrument' package).
+    # A request is profiled when it carries a valid signed X-Profile-Request
+    # header or, for admins, the ?profile=1 query flag.
+    PROFILER_ENABLED: bool = False
+    PROFILER_PATH_PREFIX: str = "/api/team"
+    PROFILER_SECRET: str = ""
+    PROFILER_SIGNATURE_TTL: int = 300
+    PROFILER_INTERVAL: float = 0.001
+    PROFILER_DIR: str = "/tmp/skills-backend-profiles"
+    PROFILER_MAX_PROFILES: int = 50
+
     # IBM AppID OAuth Configuration
     IBM_CLIENT_ID: str
     IBM_TENANT_ID: str
@@ -32,9 +94,68 @@ class Settings(BaseSettings):
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
 
+    # W3 Unified Profile API (shared, pooled HTTP client)
+    W3_PROFILE_API_URL: str = "https://w3-unified-profile-api.ibm.com/v3/profiles"
+    W3_HTTP_CONNECT_TIMEOUT: float = 5.0
+    W3_HTTP_READ_TIMEOUT: float = 30.0
+    W3_HTTP_POOL_TIMEOUT: float = 5.0
+    W3_HTTP_MAX_CONNECTIONS: int = 50
+    W3_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    W3_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    W3_HTTP2_ENABLED: bool = False
+    # Max concurrent profile lookups per request when walking multi-level org trees
+    W3_FANOUT_CONCURRENCY: int = 10
+    ORG_MAX_DEPTH: int = 6
+
+    # W3 profile cache (TTL + LRU, stale-while-revalidate)
+    W3_PROFILE_CACHE_ENABLED: bool = True
+    W3_PROFILE_CACHE_TTL: float = 300.0
+    W3_PROFILE_CACHE_STALE_TTL: float = 900.0
+    W3_PROFILE_CACHE_NEGATIVE_TTL: float = 60.0
+    W3_PROFILE_CACHE_MAX_ENTRIES: int = 2000
+    W3_PROFILE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Skills catalog snapshot: reloaded in the background every TTL seconds
+    # (0 = only on startup and on writes through /api/skills)
+    SKILLS_CATALOG_TTL: float = 300.0
+
+    # Expert finder (/api/search/experts): in-memory inverted index over USER_SKILLS,
+    # rebuilt every interval to pick up other workers' writes (0 = startup only).
+    # Proficiency levels lowest to highest; years of experience count up to the cap.
+    EXPERT_INDEX_REBUILD_INTERVAL: float = 900.0
+    EXPERT_PROFICIENCY_SCALE: str = "beginner,intermediate,advanced,expert"
+    EXPERT_YOE_CAP: float = Field(15.0, gt=0)
+
+    # People typeahead (/api/users/search): in-memory index over USERS name and email,
+    # rebuilt every interval to pick up other workers' writes (0 = startup only)
+    PEOPLE_INDEX_REBUILD_INTERVAL: float = 900.0
+
+    # Similar employees (/api/users/{id}/similar): skill-profile vectors rebuilt every
+    # interval (0 = startup only); weight of each certification category next to a
+    # skill's 1-3 (held + proficiency + years)
+    SIMILARITY_INDEX_REBUILD_INTERVAL: float = 900.0
+    SIMILARITY_CERT_WEIGHT: float = 1.0
+
+    # Org hierarchy: "w3" resolves reportees from W3 on every request, "local"
+    # reads the synced ORG_SYNC_STATE and falls back to W3 when missing or stale
+    TEAM_HIERARCHY_SOURCE: str = "w3"
+    ORG_SYNC_ENABLED: bool = False
+    ORG_SYNC_INTERVAL: float = 300.0
+    ORG_SYNC_MAX_AGE: float = 24 * 3600.0
+    ORG_SYNC_BATCH_SIZE: int = 50
+    ORG_SYNC_CONCURRENCY: int = 5
+
     # W3 SAML Logout
     W3_SLO_URL: str = "https://preprod.login.w3.ibm.com/idaas/mtfim/sps/idaas/logout"
 
+    @property
+    def admin_user_ids(self) -> frozenset:
+        return frozenset(uid.strip() for uid in self.ADMIN_USER_IDS.split(",") if uid.strip())
+
+    @property
+    def expert_proficiency_scale(self) -> tuple:
+        return _parse_scale(self.EXPERT_PROFICIENCY_SCALE)
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,8 +1,10 @@
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 import ibm_db_dbi
 from app.core.config import settings
+from app.core.sql_instrumentation import InstrumentedQueuePool, instrument_engine
 
 def create_db2_connection():
     """
@@ -24,9 +26,11 @@ def create_db2_connection():
 engine = create_engine(
     "db2+ibm_db://",
     creator=create_db2_connection,
+    poolclass=InstrumentedQueuePool if settings.SQL_INSTRUMENTATION_ENABLED else QueuePool,
     pool_pre_ping=True,
     pool_size=settings.SQLALCHEMY_POOL_SIZE,
     max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
+    pool_timeout=settings.SQLALCHEMY_POOL_TIMEOUT,
     pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
     echo=settings.SQLALCHEMY_ECHO,
 )
@@ -37,6 +41,9 @@ def set_db2_schema(dbapi_conn, connection_record):
     cursor.execute("SET CURRENT SCHEMA FSQ87086")
     cursor.close()
 
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    instrument_engine(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -0,0 +1,273 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.routing import route_template
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers fast CRUD calls through slow multi-level org walks
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# A collector returns metric families computed at scrape time:
+# (name, type, help, [(labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+Collector = Callable[[], Iterable[Family]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(s[0]), s[1], s[2]) for key, s in self._series.items()]
+        lines = []
+        label_names = self.labels + ("le",)
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(label_names, key + (_format_value(float(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics recorded in-process plus collectors evaluated at scrape time"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being handled")
+W3_REQUEST_SECONDS = REGISTRY.histogram(
+    "w3_request_duration_seconds", "W3 profile API call latency by outcome", ("status",),
+)
+W3_TIMEOUTS = REGISTRY.counter("w3_request_timeouts_total", "W3 profile API calls that timed out")
+
+
+def register_cache(name: str, stats: Callable[[], Dict]) -> None:
+    """
+    Export a cache's stats() at scrape time
+
+    `hit_ratio`, `entries`, `bytes` and `inflight` become gauges labelled
+    with the cache name; every other integer counter becomes
+    cache_events_total{cache, event}.
+    """
+    gauges = ("hit_ratio", "entries", "bytes", "inflight")
+
+    def collect() -> Iterable[Family]:
+        values = stats()
+        for key in gauges:
+            if key in values:
+                yield f"cache_{key}", "gauge", f"Cache {key.replace('_', ' ')}", [({"cache": name}, values[key])]
+        events = [
+            ({"cache": name, "event": key}, value)
+            for key, value in values.items()
+            if key not in gauges and not key.startswith("max_") and isinstance(value, int)
+        ]
+        yield "cache_events_total", "counter", "Cache lookups and maintenance events", events
+
+    REGISTRY.add_collector(collect)
+
+
+def _db_collector() -> Iterable[Family]:
+    from app.core.database import engine
+    from app.core.sql_instrumentation import sql_metrics
+
+    pool = engine.pool
+    size = pool.size() if hasattr(pool, "size") else 0
+    yield "db_pool_size", "gauge", "Configured connection pool size", [({}, size)]
+    if hasattr(pool, "checkedout"):
+        yield "db_pool_checked_out", "gauge", "Connections currently checked out", [({}, pool.checkedout())]
+        yield "db_pool_overflow", "gauge", "Connections open beyond pool_size (negative while below)", [({}, pool.overflow())]
+
+    snapshot = sql_metrics.snapshot()
+    yield "db_statements_total", "counter", "SQL statements executed", [({}, snapshot["statements"])]
+    yield "db_statement_seconds_total", "counter", "Time spent executing SQL", [({}, snapshot["sql_ms"] / 1000)]
+    yield "db_pool_checkouts_total", "counter", "Pool checkouts", [({}, snapshot["pool"]["checkouts"])]
+    yield "db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a pooled connection", [
+        ({}, snapshot["pool"]["checkout_wait_ms"] / 1000)
+    ]
+
+
+def _admission_collector() -> Iterable[Family]:
+    from app.core.admission import BULKHEADS
+
+    stats = [bulkhead.stats() for bulkhead in BULKHEADS]
+    yield "bulkhead_active", "gauge", "Requests running inside a bulkhead", [
+        ({"bulkhead": s["name"]}, s["active"]) for s in stats
+    ]
+    yield "bulkhead_queue_depth", "gauge", "Requests waiting for a bulkhead slot", [
+        ({"bulkhead": s["name"]}, s["queue_depth"]) for s in stats
+    ]
+    yield "bulkhead_rejections_total", "counter", "Requests shed with 503", [
+        ({"bulkhead": s["name"], "reason": reason}, s[f"rejected_{reason}"])
+        for s in stats
+        for reason in ("queue_full", "timeout")
+    ]
+
+
+REGISTRY.add_collector(_db_collector)
+REGISTRY.add_collector(_admission_collector)
+
+
+class MetricsMiddleware:
+    """Record in-flight requests and latency per route template"""
+
+    def __init__(self, app: ASGIApp, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route_template(scope) if scope.get("route") else "<unmatched>",
+                status=str(status_code),
+            )
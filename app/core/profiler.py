@@ -0,0 +1,174 @@
+import hashlib
+import hmac
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile-request"
+PROFILE_QUERY_FLAG = "profile"
+PROFILE_SUFFIX = ".speedscope.json"
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profiler_available() -> bool:
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def sign_profile_request(method: str, path: str, timestamp: int = None, secret: str = None) -> str:
+    """
+    Build an X-Profile-Request header value: "<unix ts>.<hex HMAC-SHA256>"
+
+    The signature covers the timestamp, method and path, so a header only
+    works for one endpoint and for PROFILER_SIGNATURE_TTL seconds.
+    """
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    key = (secret if secret is not None else settings.PROFILER_SECRET).encode()
+    digest = hmac.new(key, f"{timestamp}:{method.upper()}:{path}".encode(), hashlib.sha256).hexdigest()
+    return f"{timestamp}.{digest}"
+
+
+def verify_profile_signature(value: str, method: str, path: str) -> bool:
+    if not settings.PROFILER_SECRET or "." not in value:
+        return False
+    timestamp, _, _ = value.partition(".")
+    if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > settings.PROFILER_SIGNATURE_TTL:
+        return False
+    return hmac.compare_digest(value, sign_profile_request(method, path, int(timestamp)))
+
+
+class ProfileStore:
+    """Bounded ring of profile files in PROFILER_DIR; the oldest are deleted first"""
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    @staticmethod
+    def new_name(method: str, path: str) -> str:
+        return "{}-{}-{}-{}{}".format(
+            time.strftime("%Y%m%dT%H%M%S", time.gmtime()),
+            method.lower(),
+            _UNSAFE.sub("_", path.strip("/"))[:80],
+            uuid.uuid4().hex[:8],
+            PROFILE_SUFFIX,
+        )
+
+    def save(self, name: str, data: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f".{name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(self.directory, name))
+        self._prune()
+
+    def list(self) -> List[Dict]:
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(PROFILE_SUFFIX):
+                stat = entry.stat()
+                profiles.append({"name": entry.name, "size": stat.st_size, "created_at": stat.st_mtime})
+        return sorted(profiles, key=lambda p: p["created_at"], reverse=True)
+
+    def path(self, name: str) -> Optional[str]:
+        """Absolute path of a stored profile, or None (names outside the ring are rejected)"""
+        if name != os.path.basename(name) or not name.endswith(PROFILE_SUFFIX):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def _prune(self) -> None:
+        for profile in self.list()[self.max_profiles:]:
+            try:
+                os.remove(os.path.join(self.directory, profile["name"]))
+            except OSError:
+                pass
+
+
+profile_store = ProfileStore(settings.PROFILER_DIR, settings.PROFILER_MAX_PROFILES)
+
+
+class ProfilerMiddleware:
+    """
+    Run selected requests under pyinstrument and store a speedscope profile.
+
+    Only added when PROFILER_ENABLED is set, so unprofiled deployments pay
+    nothing. Samples the event loop thread; DB work offloaded to the
+    threadpool shows up as time awaiting it. One request is profiled at a
+    time; concurrent triggers run unprofiled with X-Profile-Skipped.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(settings.PROFILER_PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        if not await self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if self._busy:
+            await self.app(scope, receive, self._with_header(send, "X-Profile-Skipped", "busy"))
+            return
+
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        name = profile_store.new_name(scope["method"], scope["path"])
+        profiler = Profiler(interval=settings.PROFILER_INTERVAL, async_mode="enabled")
+        self._busy = True
+        profiler.start()
+        try:
+            await self.app(scope, receive, self._with_header(send, "X-Profile-Id", name))
+        finally:
+            profiler.stop()
+            self._busy = False
+            try:
+                # Rendering and the file write stay off the event loop
+                await run_in_threadpool(lambda: profile_store.save(name, profiler.output(renderer=SpeedscopeRenderer())))
+                logger.info(f"Stored profile {name} for {scope['method']} {scope['path']}")
+            except Exception as e:
+                logger.error(f"Failed to store profile for {scope['path']}: {str(e)}")
+
+    @staticmethod
+    async def _requested(scope: Scope) -> bool:
+        request = Request(scope)
+        signature = request.headers.get(PROFILE_HEADER)
+        if signature is not None:
+            if verify_profile_signature(signature, scope["method"], scope["path"]):
+                return True
+            logger.warning(f"Rejected profile signature for {scope['method']} {scope['path']}")
+            return False
+
+        if request.query_params.get(PROFILE_QUERY_FLAG) in ("1", "true"):
+            from app.auth.dependencies import get_current_user_optional, is_admin
+
+            return "session" in scope and is_admin(await get_current_user_optional(request))
+        return False
+
+    @staticmethod
+    def _with_header(send: Send, header: str, value: str) -> Send:
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(header, value)
+            await send(message)
+        return send_wrapper
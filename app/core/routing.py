@@ -0,0 +1,26 @@
+from starlette.types import Scope
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Matched route template for a request (e.g. /api/users/{user_id}), used to
+    label per-route stats without one series per raw path. Falls back to the
+    raw path when no route matched.
+
+    The matched route may only know its path relative to the router it was
+    included from, so the router prefix is recovered from the raw path.
+    """
+    path = scope["path"]
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return path
+
+    params = {name: str(value) for name, value in (scope.get("path_params") or {}).items()}
+    try:
+        rendered = template.format(**params)
+    except (KeyError, IndexError, ValueError):
+        return template
+    if rendered and path.endswith(rendered):
+        return path[:len(path) - len(rendered)] + template
+    return template
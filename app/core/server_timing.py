@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.sql_instrumentation import current_sql_stats
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """Durations recorded by instrumentation points during one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._durations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            entry = self._durations.setdefault(name, [0.0, 0])
+            entry[0] += duration_ms
+            entry[1] += 1
+
+    def header(self) -> str:
+        """Server-Timing header value, e.g. db;dur=12.3;desc="4 queries", w3;dur=80.1"""
+        metrics = []
+        sql = current_sql_stats()
+        if sql is not None and sql.statements:
+            metrics.append(f'db;dur={sql.sql_ms:.1f};desc="{sql.statements} queries"')
+        with self._lock:
+            durations = dict(self._durations)
+        if "w3" in durations:
+            total, calls = durations.pop("w3")
+            metrics.append(f'w3;dur={total:.1f};desc="{calls} calls"')
+        for name, (total, _) in durations.items():
+            metrics.append(f"{name};dur={total:.1f}")
+        metrics.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_timing(name: str, duration_ms: float) -> None:
+    """Add a duration to the current request's Server-Timing (no-op outside a request)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.record(name, duration_ms)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that reports its encoding time as the `render` timing"""
+
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        record_timing("render", (time.perf_counter() - started) * 1000)
+        return body
+
+
+class ServerTimingMiddleware:
+    """Add a Server-Timing header with DB, W3 and render time to every response"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                value = timings.header()
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", value)
+                headers.append("Timing-Allow-Origin", settings.FRONTEND_URL)
+                if settings.SERVER_TIMING_ACCESS_LOG:
+                    logger.info(f'{scope["method"]} {scope["path"]} {message["status"]} server-timing: {value}')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
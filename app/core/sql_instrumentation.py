@@ -0,0 +1,274 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.routing import route_template
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a parameterized statement so identical shapes compare equal"""
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class RequestSQLStats:
+    """
+    SQL activity of a single request.
+
+    Shared by every thread the request's DB work runs on (the context
+    variable is copied into threadpool workers), hence the lock.
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.sql_ms = 0.0
+        self.checkouts = 0
+        self.checkout_wait_ms = 0.0
+        self.connections_opened = 0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.checkouts - self.connections_opened, 0)
+
+    def record_statement(self, shape: str, duration_ms: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.sql_ms += duration_ms
+            self.shapes[shape] += 1
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_ms += wait_ms
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def repeated_shapes(self, threshold: int = None) -> List[Dict]:
+        """Statement shapes executed at least `threshold` times (N+1 candidates)"""
+        threshold = threshold or settings.SQL_N_PLUS_ONE_THRESHOLD
+        return [
+            {"statement": shape, "count": count}
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def summary(self) -> Dict:
+        return {
+            "statements": self.statements,
+            "sql_ms": round(self.sql_ms, 2),
+            "checkouts": self.checkouts,
+            "checkout_wait_ms": round(self.checkout_wait_ms, 2),
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+        }
+
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def current_sql_stats() -> Optional[RequestSQLStats]:
+    """SQL stats of the request being handled, or None outside a request"""
+    return _current.get()
+
+
+class SQLMetricsRegistry:
+    """Process-wide SQL and pool aggregates, overall and per route template"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict] = {}
+        self._pool = {
+            "checkouts": 0,
+            "checkout_wait_ms": 0.0,
+            "max_checkout_wait_ms": 0.0,
+            "connections_opened": 0,
+            "checkins": 0,
+            "held_ms": 0.0,
+            "max_held_ms": 0.0,
+        }
+        self._statements = 0
+        self._sql_ms = 0.0
+
+    def record_statement(self, duration_ms: float) -> None:
+        with self._lock:
+            self._statements += 1
+            self._sql_ms += duration_ms
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self._pool["checkouts"] += 1
+            self._pool["checkout_wait_ms"] += wait_ms
+            self._pool["max_checkout_wait_ms"] = max(self._pool["max_checkout_wait_ms"], wait_ms)
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self._pool["connections_opened"] += 1
+
+    def record_checkin(self, held_ms: float) -> None:
+        with self._lock:
+            self._pool["checkins"] += 1
+            self._pool["held_ms"] += held_ms
+            self._pool["max_held_ms"] = max(self._pool["max_held_ms"], held_ms)
+
+    def record_request(self, route: str, stats: RequestSQLStats, n_plus_one: bool) -> None:
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {
+                    "requests": 0,
+                    "statements": 0,
+                    "max_statements": 0,
+                    "sql_ms": 0.0,
+                    "checkout_wait_ms": 0.0,
+                    "n_plus_one_requests": 0,
+                }
+            entry["requests"] += 1
+            entry["statements"] += stats.statements
+            entry["max_statements"] = max(entry["max_statements"], stats.statements)
+            entry["sql_ms"] += stats.sql_ms
+            entry["checkout_wait_ms"] += stats.checkout_wait_ms
+            if n_plus_one:
+                entry["n_plus_one_requests"] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            routes = {
+                route: {
+                    **entry,
+                    "sql_ms": round(entry["sql_ms"], 2),
+                    "checkout_wait_ms": round(entry["checkout_wait_ms"], 2),
+                    "avg_statements": round(entry["statements"] / entry["requests"], 2),
+                    "avg_sql_ms": round(entry["sql_ms"] / entry["requests"], 2),
+                }
+                for route, entry in sorted(self._routes.items())
+            }
+            pool = {key: round(value, 2) if isinstance(value, float) else value for key, value in self._pool.items()}
+            pool["connections_reused"] = max(pool["checkouts"] - pool["connections_opened"], 0)
+            return {
+                "statements": self._statements,
+                "sql_ms": round(self._sql_ms, 2),
+                "pool": pool,
+                "routes": routes,
+            }
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+sql_metrics = SQLMetricsRegistry()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait_ms = (time.perf_counter() - started) * 1000
+            sql_metrics.record_checkout(wait_ms)
+            stats = _current.get()
+            if stats is not None:
+                stats.record_checkout(wait_ms)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach statement and pool listeners to an engine"""
+
+    # Start times are keyed by cursor and dropped by handle_error when a
+    # statement fails, so failed statements do not accumulate in conn.info
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", {})[id(cursor)] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop(id(cursor), None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        sql_metrics.record_statement(duration_ms)
+        stats = _current.get()
+        if stats is not None:
+            stats.record_statement(statement_shape(statement), duration_ms)
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        cursor = getattr(context.execution_context, "cursor", None)
+        if context.connection is not None and cursor is not None:
+            context.connection.info.get("query_started", {}).pop(id(cursor), None)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_conn, connection_record):
+        sql_metrics.record_connect()
+        stats = _current.get()
+        if stats is not None:
+            stats.record_connect()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_conn, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_conn, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            sql_metrics.record_checkin((time.perf_counter() - checked_out_at) * 1000)
+
+
+class SQLInstrumentationMiddleware:
+    """Collect SQL stats per request, log them and feed the aggregate registry"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            if stats.statements or stats.checkouts:
+                self._finish(scope, stats)
+
+    @staticmethod
+    def _finish(scope: Scope, stats: RequestSQLStats) -> None:
+        route = f"{scope['method']} {route_template(scope)}"
+        repeated = stats.repeated_shapes()
+        sql_metrics.record_request(route, stats, bool(repeated))
+
+        if settings.SQL_REQUEST_LOGGING:
+            summary = stats.summary()
+            logger.info(
+                f"{route}: {summary['statements']} statements, {summary['sql_ms']}ms SQL, "
+                f"{summary['checkouts']} checkouts ({summary['checkout_wait_ms']}ms wait, "
+                f"{summary['connections_reused']} reused)"
+            )
+        for shape in repeated:
+            logger.warning(
+                f"Possible N+1 in {route}: statement executed {shape['count']} times: "
+                f"{shape['statement'][:200]}"
+            )
@@ -1,19 +1,79 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from authlib.integrations.starlette_client import OAuth
 from app.core.config import settings
+from app.core.admission import AdmissionControlMiddleware, configure_thread_limiter
+from app.core.sql_instrumentation import SQLInstrumentationMiddleware
+from app.core.metrics import MetricsMiddleware, REGISTRY, PROMETHEUS_CONTENT_TYPE
+from app.core.server_timing import ServerTimingMiddleware, TimedJSONResponse
+from app.core.profiler import ProfilerMiddleware, profiler_available
 from app.api.routes import users, skills, projects, assets, user_skills, user_cert, request, professional_eminence, team
 from app.auth import routes as auth_routes
-from app.api.routes import manager_emp
+from app.api.routes import manager_emp, ops, search
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.services.w3_profile_service import W3ProfileService
+from app.services.org_sync import OrgSyncWorker
+from app.services.skills_catalog import skills_catalog
+from app.services.expert_index import expert_index
+from app.services.people_index import people_index
+from app.services.similarity_index import similarity_index
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared resources live for the whole process, not per request
+    if settings.ADMISSION_CONTROL_ENABLED:
+        configure_thread_limiter()
+    await W3ProfileService.startup()
+    await OrgSyncWorker.start()
+    await skills_catalog.start()
+    await expert_index.start()
+    await people_index.start()
+    await similarity_index.start()
+    try:
+        yield
+    finally:
+        await similarity_index.stop()
+        await people_index.stop()
+        await expert_index.stop()
+        await skills_catalog.stop()
+        await OrgSyncWorker.stop()
+        await W3ProfileService.shutdown()
 
 
 app = FastAPI(
     title="Skills Management API",
     description="API for managing user skills, projects, certifications, and assets with IBM AppID OAuth",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
+# Per-request SQL statement counts, timings and N+1 detection
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    app.add_middleware(SQLInstrumentationMiddleware)
+
+# Opt-in request profiler; not installed at all unless enabled
+if settings.PROFILER_ENABLED:
+    if profiler_available():
+        app.add_middleware(ProfilerMiddleware)
+    else:
+        logger.warning("PROFILER_ENABLED is set but the 'pyinstrument' package is not installed; profiling disabled")
+
+# Server-Timing header: db, w3 and render breakdown per response
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Admission control (inside CORS, so shed responses still get CORS headers)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -21,6 +81,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor pagination and profiling headers must be readable by the frontend
+    expose_headers=[NEXT_CURSOR_HEADER, "X-Profile-Id"],
 )
 
 # Session Middleware (Required for OAuth)
@@ -32,6 +94,10 @@ app.add_middleware(
     https_only=False,  # Set to True in production with HTTPS
 )
 
+# Route latency and in-flight requests (outermost, so shed requests are counted too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # OAuth Configuration for IBM AppID
 oauth = OAuth()
 oauth.register(
@@ -56,6 +122,8 @@ app.include_router(request.router, prefix="/api/requests", tags=["requests"])
 app.include_router(professional_eminence.router, prefix="/api/professional-eminence", tags=["professional-eminence"])
 app.include_router(team.router, prefix="/api/team", tags=["team-management"])
 app.include_router(manager_emp.router, prefix="/manager-emp", tags=["Manager-Employee Mapping"])
+app.include_router(ops.router, prefix="/api/ops", tags=["operations"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
 
 @app.get("/")
 async def root():
@@ -65,6 +133,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
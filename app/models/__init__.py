@@ -6,5 +6,6 @@ from app.models.user_skills import UserSkill
 from app.models.user_cert import UserCert
 from app.models.request import Request
 from app.models.professional_eminence import ProfessionalEminence
+from app.models.org_sync_state import OrgSyncState
 
-__all__ = ["User", "Skill", "Project", "Asset", "UserSkill", "UserCert", "Request", "ProfessionalEminence"]
\ No newline at end of file
+__all__ = ["User", "Skill", "Project", "Asset", "UserSkill", "UserCert", "Request", "ProfessionalEminence", "OrgSyncState"]
\ No newline at end of file
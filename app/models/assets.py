@@ -7,7 +7,7 @@ class Asset(Base):
     __table_args__ = {'schema': 'FSQ87086'}
     
     id = Column("ID", Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"))
+    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"), index=True)
     asset_name = Column("ASSET_NAME", String(255))
     asset_desc = Column("ASSET_DESC", Text)
     used_in_project = Column("USED_IN_PROJECT", String(255))
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.core.database import Base
+
+class OrgSyncState(Base):
+    """Last W3 snapshot of a manager's direct reports, used to resolve teams locally"""
+    __tablename__ = "ORG_SYNC_STATE"
+    __table_args__ = {'schema': 'FSQ87086'}
+    
+    # Not a foreign key: managers and reportees may not be registered in USERS yet
+    manager_id = Column("MANAGER_ID", String(50), primary_key=True)
+    manager_info = Column("MANAGER_INFO", Text)  # JSON from W3ProfileService.extract_manager_info
+    reportee_ids = Column("REPORTEE_IDS", Text)  # JSON list of functional reports, in W3 order
+    reportee_count = Column("REPORTEE_COUNT", Integer, default=0)
+    synced_at = Column("SYNCED_AT", DateTime, index=True)
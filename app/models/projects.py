@@ -7,7 +7,7 @@ class Project(Base):
     __table_args__ = {'schema': 'FSQ87086'}
     
     id = Column("ID", Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"))
+    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"), index=True)
     project_name = Column("PROJECT_NAME", String(255))
     client_name = Column("CLIENT_NAME", String(255))
     tech_used = Column("TECH_USED", Text)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, TEXT
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, TEXT, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Request(Base):
     __tablename__ = "REQUEST"
-    __table_args__ = {'schema': 'FSQ87086'}
+    __table_args__ = (
+        # Manager approval queue: WHERE MANAGER_ID = ? AND STATUS = 'pending'
+        Index("ix_FSQ87086_REQUEST_MANAGER_ID_STATUS", "MANAGER_ID", "STATUS"),
+        {'schema': 'FSQ87086'},
+    )
     
     request_id = Column("REQUEST_ID", Integer, primary_key=True, index=True, autoincrement=True)
     manager_id = Column("MANAGER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="SET NULL"))
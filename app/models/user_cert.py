@@ -7,7 +7,7 @@ class UserCert(Base):
     __table_args__ = {'schema': 'FSQ87086'}
     
     id = Column("ID", Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"))
+    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"), index=True)
     cert_type = Column("CERT_TYPE", String(100))
     cert_name = Column("CERT_NAME", String(255))
     cert_file_path = Column("CERT_FILE_PATH", String(512))
@@ -7,7 +7,7 @@ class UserSkill(Base):
     __table_args__ = {'schema': 'FSQ87086'}
     
     id = Column("ID", Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"))
+    user_id = Column("USER_ID", String(50), ForeignKey("FSQ87086.USERS.USER_ID", ondelete="CASCADE"), index=True)
     skill_id = Column("SKILL_ID", Integer, ForeignKey("FSQ87086.SKILLS.SKILL_ID", ondelete="CASCADE"))
     proficiency_level = Column("PROFICIENCY_LEVEL", String(50))
     platform = Column("PLATFORM", String(100))
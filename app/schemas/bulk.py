@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List
+
+class BulkCreatedItem(BaseModel):
+    index: int
+    id: int
+
+class BulkItemError(BaseModel):
+    index: int
+    error: str
+
+class BulkCreateResponse(BaseModel):
+    created_count: int
+    error_count: int
+    created: List[BulkCreatedItem]
+    errors: List[BulkItemError]
+
+class BulkUpsertResponse(BaseModel):
+    received: int
+    inserted: int
+    existing: int
+    error_count: int
+    errors: List[BulkItemError]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class ExpertSkillMatch(BaseModel):
+    id: int
+    proficiency_level: Optional[str] = None
+    yoe: Optional[str] = None
+    score: float
+
+class Expert(BaseModel):
+    user_id: str
+    score: float
+    skills: List[ExpertSkillMatch]
+
+class ExpertSearchResponse(BaseModel):
+    total: int
+    experts: List[Expert]
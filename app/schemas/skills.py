@@ -20,3 +20,7 @@ class SkillResponse(SkillBase):
     skill_id: int
     class Config:
         from_attributes = True
+
+class SkillSuggestion(SkillResponse):
+    usage: int
+    fuzzy: bool = False
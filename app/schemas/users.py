@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -23,3 +23,18 @@ class UserResponse(UserBase):
     user_id: str
     class Config:
         from_attributes = True
+
+class UserSearchResult(BaseModel):
+    user_id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    user_type: Optional[str] = None
+
+class SimilarUser(UserSearchResult):
+    score: float
+    shared_skills: List[int] = []
+    shared_cert_categories: List[str] = []
+
+class SimilarUsersResponse(BaseModel):
+    user_id: str
+    similar: List[SimilarUser]
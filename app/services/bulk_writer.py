@@ -0,0 +1,113 @@
+import logging
+from typing import Any, Dict, List, Sequence, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.reportee_loader import chunked
+from app.services.row_writer import column_keys, final_table, is_db2, with_scalar_defaults
+
+logger = logging.getLogger(__name__)
+
+
+def insert_returning_ids(db: Session, model, rows: Sequence[Dict[str, Any]]) -> List:
+    """
+    Insert rows with multi-row VALUES statements and return their generated
+    primary keys in input order, without re-selecting each row
+
+    On DB2 each chunk is a single
+    `SELECT <pk> FROM FINAL TABLE (INSERT ... VALUES (...), (...)) ORDER BY INPUT SEQUENCE`;
+    dialects with INSERT ... RETURNING use it instead. Runs in the caller's
+    transaction (no commit).
+
+    Args:
+        db: Database session
+        model: Mapped class with a single-column primary key
+        rows: Dicts keyed by ORM attribute name, all with the same keys
+    """
+    table = model.__table__
+    primary_key = list(table.primary_key.columns)[0]
+    keys = column_keys(model)
+
+    ids = []
+    for chunk in chunked(list(rows), settings.BULK_INSERT_CHUNK_SIZE):
+        values = [{keys[attr]: value for attr, value in row.items()} for row in chunk]
+        if is_db2(db):
+            values = [with_scalar_defaults(table, row) for row in values]
+            returned = final_table(db, insert(table).values(values), [primary_key], input_order=True)
+            ids.extend(row[0] for row in returned)
+        else:
+            stmt = insert(table).returning(primary_key, sort_by_parameter_order=True)
+            ids.extend(db.execute(stmt, values).scalars())
+    return ids
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc']) or 'item'}: {e['msg']}" for e in error.errors()
+    )
+
+
+def bulk_create(
+    db: Session,
+    model,
+    schema: Type[BaseModel],
+    items: Sequence[Any],
+    overrides: Dict[str, Any],
+) -> Dict:
+    """
+    Validate and insert a list of items, reporting failures per item
+
+    Valid items are inserted in one transaction. If that fails (e.g. a bad
+    foreign key on one row), the rows are retried one by one in savepoints
+    so the good rows are still created and each failure is reported.
+
+    Args:
+        db: Database session
+        model: Mapped class to insert into
+        schema: Pydantic create schema used to validate each item
+        items: Raw request items
+        overrides: Fields forced on every item (e.g. the current user's user_id)
+
+    Returns:
+        {"created_count", "error_count", "created": [{"index", "id"}], "errors": [{"index", "error"}]}
+    """
+    created: List[Dict] = []
+    errors: List[Dict] = []
+    valid: List = []
+
+    for index, raw in enumerate(items):
+        if not isinstance(raw, dict):
+            errors.append({"index": index, "error": "item must be an object"})
+            continue
+        try:
+            valid.append((index, schema(**{**raw, **overrides}).dict()))
+        except ValidationError as e:
+            errors.append({"index": index, "error": validation_message(e)})
+
+    if valid:
+        try:
+            ids = insert_returning_ids(db, model, [data for _, data in valid])
+            db.commit()
+            created = [{"index": index, "id": id_} for (index, _), id_ in zip(valid, ids)]
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Bulk insert into {model.__tablename__} failed, retrying row by row: {str(e)}")
+            for index, data in valid:
+                try:
+                    with db.begin_nested():
+                        created.extend({"index": index, "id": id_} for id_ in insert_returning_ids(db, model, [data]))
+                except SQLAlchemyError as row_error:
+                    errors.append({"index": index, "error": str(getattr(row_error, "orig", None) or row_error)})
+            db.commit()
+
+    errors.sort(key=lambda e: e["index"])
+    return {
+        "created_count": len(created),
+        "error_count": len(errors),
+        "created": created,
+        "errors": errors,
+    }
@@ -0,0 +1,343 @@
+import asyncio
+import heapq
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.async_db import with_session
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.models.user_skills import UserSkill
+from app.services.index_builds import IndexBuilds
+from app.services.reportee_loader import chunked
+
+logger = logging.getLogger(__name__)
+
+# UserSkill attributes with posting lists (matched case-insensitively)
+INDEXED_FIELDS = (
+    "platform", "segment", "product_portfolio", "speciality_area",
+    "product_line", "proficiency_level", "status",
+)
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _normalize(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    return value or None
+
+
+def proficiency_rank(level: Any) -> int:
+    """
+    Position of a proficiency level on EXPERT_PROFICIENCY_SCALE (1-based)
+
+    Numeric levels ("3", "L3") are taken as the rank directly; unknown
+    levels rank 0.
+    """
+    normalized = _normalize(level)
+    if normalized is None:
+        return 0
+    scale = settings.expert_proficiency_scale
+    if normalized in scale:
+        return scale.index(normalized) + 1
+    match = _NUMBER.search(normalized)
+    return min(int(float(match.group())), len(scale)) if match else 0
+
+
+def parse_yoe(yoe: Any) -> float:
+    """Years of experience from free text such as "5", "5+" or "3-5" (first number)"""
+    match = _NUMBER.search(str(yoe or ""))
+    return float(match.group()) if match else 0.0
+
+
+class _Posting:
+    """What the index keeps per USER_SKILLS row"""
+
+    __slots__ = ("row_id", "user_id", "terms", "rank", "yoe", "score", "proficiency_level", "yoe_text")
+
+    def __init__(self, row: Mapping[str, Any]):
+        self.row_id = row["id"]
+        self.user_id = row["user_id"]
+        self.terms = tuple(
+            (field, value) for field in INDEXED_FIELDS
+            if (value := _normalize(row.get(field))) is not None
+        )
+        self.rank = proficiency_rank(row.get("proficiency_level"))
+        self.yoe = parse_yoe(row.get("yoe"))
+        # Mean of proficiency rank / scale length and capped years / cap
+        scale = max(len(settings.expert_proficiency_scale), 1)
+        cap = settings.EXPERT_YOE_CAP
+        self.score = round(0.5 * self.rank / scale + 0.5 * min(self.yoe, cap) / cap, 4)
+        self.proficiency_level = row.get("proficiency_level")
+        self.yoe_text = row.get("yoe")
+
+
+def _row_dict(item: Any) -> Dict[str, Any]:
+    fields = ("id", "user_id", "yoe") + INDEXED_FIELDS
+    if isinstance(item, Mapping):
+        return {f: item.get(f) for f in fields}
+    return {f: getattr(item, f) for f in fields}
+
+
+class _Index:
+    """Posting lists: (field, normalized value) -> USER_SKILLS row IDs"""
+
+    def __init__(self):
+        self.rows: Dict[int, _Posting] = {}
+        self.postings: Dict[Tuple[str, str], Set[int]] = {}
+        self.rows_by_user: Dict[str, Set[int]] = {}
+
+    def add(self, posting: _Posting) -> None:
+        self.remove(posting.row_id)
+        self.rows[posting.row_id] = posting
+        self.rows_by_user.setdefault(posting.user_id, set()).add(posting.row_id)
+        for term in posting.terms:
+            self.postings.setdefault(term, set()).add(posting.row_id)
+
+    def remove(self, row_id: int) -> None:
+        posting = self.rows.pop(row_id, None)
+        if posting is None:
+            return
+        user_rows = self.rows_by_user.get(posting.user_id)
+        if user_rows is not None:
+            user_rows.discard(row_id)
+            if not user_rows:
+                del self.rows_by_user[posting.user_id]
+        for term in posting.terms:
+            ids = self.postings.get(term)
+            if ids is not None:
+                ids.discard(row_id)
+                if not ids:
+                    del self.postings[term]
+
+    def remove_user(self, user_id: str) -> None:
+        for row_id in list(self.rows_by_user.get(user_id, ())):
+            self.remove(row_id)
+
+
+class ExpertIndex:
+    """
+    In-process inverted index over USER_SKILLS for the expert finder.
+
+    Every indexed field value maps to the set of skill rows carrying it, so a
+    query intersects a handful of sets (smallest first) instead of scanning
+    the table; filters on proficiency and years then run over the surviving
+    rows only. Skill rows, not users, are indexed so that all criteria must
+    hold for the same skill.
+
+    Built at startup, patched by the user-skills routes after each commit,
+    and optionally rebuilt every EXPERT_INDEX_REBUILD_INTERVAL seconds to pick
+    up writes from other workers. Builds are single-flight, and writes that
+    land while a build is reading the table are journaled and replayed onto
+    the new index before it is swapped in (see IndexBuilds).
+    """
+
+    def __init__(self, rebuild_interval: float):
+        self.rebuild_interval = rebuild_interval
+        self._index: Optional[_Index] = None
+        self._lock = threading.RLock()
+        self._builds = IndexBuilds(self._lock)
+        self._task: Optional[asyncio.Task] = None
+        self._built_at: Optional[float] = None
+        self._counters = {"builds": 0, "build_failures": 0, "updates": 0, "queries": 0}
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def ensure_ready(self) -> None:
+        """Build the index if there is none yet, or wait for the build in flight (blocking)"""
+        self._builds.ensure_built(lambda: self.ready, self.build)
+
+    def build(self) -> None:
+        """Read USER_SKILLS and swap in a fresh index (blocking; one build at a time)"""
+        started = time.perf_counter()
+        try:
+            self._builds.run(self._read, self._install)
+        except Exception:
+            with self._lock:
+                self._counters["build_failures"] += 1
+            raise
+        index = self._index
+        logger.info(f"Expert index built: {len(index.rows)} skills, {len(index.postings)} terms "
+                    f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def _read(self) -> _Index:
+        index = _Index()
+        for row in with_session(self._fetch):
+            index.add(_Posting(row))
+        return index
+
+    def _install(self, index: _Index, journal: List[Tuple[str, Any]]) -> None:
+        for op, value in journal:
+            if op == "put":
+                index.add(_Posting(value))
+            elif op == "remove_user":
+                index.remove_user(value)
+            else:
+                index.remove(value)
+        self._index = index
+        self._built_at = time.monotonic()
+        self._counters["builds"] += 1
+
+    def put(self, items: Iterable[Any]) -> None:
+        """Index created or updated skill rows (ORM objects or row dicts); failures are logged, not raised"""
+        try:
+            rows = [_row_dict(item) for item in items]
+            with self._lock:
+                for row in rows:
+                    self._builds.record(("put", row))
+                    if self._index is not None:
+                        self._index.add(_Posting(row))
+                self._counters["updates"] += len(rows)
+        except Exception as e:
+            logger.warning(f"Expert index: could not index skills, left to the next rebuild: {str(e)}")
+
+    def put_ids(self, db: Session, row_ids: List[int]) -> None:
+        """Index rows by ID after a bulk insert; failures are logged, not raised (the write is committed)"""
+        try:
+            rows = []
+            for chunk in chunked(row_ids, settings.DB2_IN_CLAUSE_CHUNK_SIZE):
+                rows.extend(db.query(UserSkill).filter(UserSkill.id.in_(chunk)).all())
+        except Exception as e:
+            logger.warning(f"Expert index: could not index {len(row_ids)} new skills, left to the next rebuild: {str(e)}")
+            return
+        self.put(rows)
+
+    def remove(self, row_id: int) -> None:
+        """Drop a deleted skill row"""
+        with self._lock:
+            self._builds.record(("remove", row_id))
+            if self._index is not None:
+                self._index.remove(row_id)
+            self._counters["updates"] += 1
+
+    def remove_user(self, user_id: str) -> None:
+        """Drop every skill row of a deleted user"""
+        with self._lock:
+            self._builds.record(("remove_user", user_id))
+            if self._index is not None:
+                self._index.remove_user(user_id)
+            self._counters["updates"] += 1
+
+    def search(
+        self,
+        criteria: Dict[str, Optional[str]],
+        min_rank: int = 0,
+        min_yoe: float = 0.0,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Users with a skill matching every criterion, best first
+
+        Args:
+            criteria: INDEXED_FIELDS -> value (None = any)
+            min_rank: Minimum proficiency_rank of the matching skill
+            min_yoe: Minimum years of experience of the matching skill
+            limit: Max users returned
+
+        Returns:
+            {"total": matching users, "experts": [{"user_id", "score", "skills": [...]}]}
+            Each user's score is that of their best matching skill (see
+            _Posting.score); only the top `limit` users are sorted.
+        """
+        terms = [(field, _normalize(value)) for field, value in criteria.items() if _normalize(value) is not None]
+
+        with self._lock:
+            self._counters["queries"] += 1
+            index = self._index
+            if terms:
+                postings = sorted((index.postings.get(term, set()) for term in terms), key=len)
+                candidates = postings[0].intersection(*postings[1:])
+            else:
+                candidates = index.rows.keys()
+            matches = [
+                posting for posting in map(index.rows.__getitem__, candidates)
+                if posting.rank >= min_rank and posting.yoe >= min_yoe
+            ]
+
+        best: Dict[str, float] = {}
+        for posting in matches:
+            if posting.score > best.get(posting.user_id, -1.0):
+                best[posting.user_id] = posting.score
+        top = heapq.nsmallest(limit, best.items(), key=lambda item: (-item[1], item[0]))
+
+        skills: Dict[str, List[_Posting]] = {user_id: [] for user_id, _ in top}
+        for posting in matches:
+            if posting.user_id in skills:
+                skills[posting.user_id].append(posting)
+
+        experts = []
+        for user_id, score in top:
+            user_skills = sorted(skills[user_id], key=lambda p: (-p.score, p.row_id))
+            experts.append({
+                "user_id": user_id,
+                "score": score,
+                "skills": [
+                    {
+                        "id": posting.row_id,
+                        "proficiency_level": posting.proficiency_level,
+                        "yoe": posting.yoe_text,
+                        "score": posting.score,
+                    }
+                    for posting in user_skills
+                ],
+            })
+        return {"total": len(best), "experts": experts}
+
+    def stats(self) -> Dict:
+        index = self._index
+        return {
+            **self._counters,
+            "entries": len(index.rows) if index else 0,
+            "terms": len(index.postings) if index else 0,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+        }
+
+    @staticmethod
+    def _fetch(db: Session) -> List[Dict[str, Any]]:
+        columns = [getattr(UserSkill, f) for f in ("id", "user_id", "yoe") + INDEXED_FIELDS]
+        return [
+            dict(zip(("id", "user_id", "yoe") + INDEXED_FIELDS, row))
+            for row in db.query(*columns).yield_per(settings.DB2_IN_CLAUSE_CHUNK_SIZE)
+        ]
+
+    async def start(self) -> None:
+        """Build the index and start the periodic rebuild"""
+        try:
+            await run_in_threadpool(self.build)
+        except Exception as e:
+            # Not fatal: the search endpoint builds on first use
+            logger.error(f"Expert index build failed: {str(e)}")
+        if self.rebuild_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebuild_interval)
+            try:
+                await run_in_threadpool(self.build)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Expert index rebuild failed, keeping current index: {str(e)}")
+
+
+expert_index = ExpertIndex(settings.EXPERT_INDEX_REBUILD_INTERVAL)
+register_cache("expert_index", expert_index.stats)
@@ -0,0 +1,62 @@
+import threading
+from typing import Any, Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class IndexBuilds:
+    """
+    Coordinates the full rebuilds of an in-memory index.
+
+    - Builds are single-flight: one full table read at a time per index. A
+      request that finds the index cold waits for the build in flight
+      (ensure_built) instead of starting its own scan.
+    - Writes recorded while a build reads the table are journaled and
+      handed to the build, which replays them onto the fresh data before
+      swapping it in.
+
+    The journal is guarded by the owning index's lock: `record` must be
+    called with that lock held (alongside the write to the live index), and
+    `install` runs with it held, so every write lands either in the old
+    index and the journal, or in the new index.
+    """
+
+    def __init__(self, lock):
+        self._lock = lock
+        self._build_lock = threading.RLock()
+        self._journal: Optional[List[Any]] = None
+
+    def record(self, entry: Any) -> None:
+        """Journal a write for the build in flight, if any (index lock held)"""
+        if self._journal is not None:
+            self._journal.append(entry)
+
+    def run(self, read: Callable[[], T], install: Callable[[T, List[Any]], None]) -> None:
+        """
+        Run one build (blocking)
+
+        Args:
+            read: Loads and prepares the new data, without the index lock
+            install: Called with the data and the writes journaled during
+                `read`, under the index lock; replays them and swaps in
+        """
+        with self._build_lock:
+            with self._lock:
+                self._journal = []
+            try:
+                data = read()
+            except Exception:
+                with self._lock:
+                    self._journal = None
+                raise
+            with self._lock:
+                journal, self._journal = self._journal, None
+                install(data, journal)
+
+    def ensure_built(self, ready: Callable[[], bool], build: Callable[[], None]) -> None:
+        """Build unless `ready()`; callers arriving during a build wait for it instead of starting another"""
+        if ready():
+            return
+        with self._build_lock:
+            if not ready():
+                build()
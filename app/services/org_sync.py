@@ -0,0 +1,331 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, or_, select, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.async_db import AsyncDB
+from app.core.config import settings
+from app.models.manager_emp import ManagerEmp
+from app.models.org_sync_state import OrgSyncState
+from app.models.users import User
+from app.services.reportee_loader import chunked
+from app.services.w3_profile_service import W3ProfileService
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    # SYNCED_AT is a naive TIMESTAMP holding UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class OrgHierarchyService:
+    """
+    Local store of the W3 reporting hierarchy.
+
+    Each synced manager has an ORG_SYNC_STATE row holding the W3 manager info
+    and the full list of functional reports. Registered users additionally get
+    MANAGER_EMP edges and USERS.MANAGER_ID / IS_MANAGER kept in step.
+
+    A row with SYNCED_AT NULL is a pending entry: a reportee queued by its
+    manager's sync (W3 report lists carry no manager flag, so each reportee's
+    own profile decides) and not fetched yet. The sync worker processes
+    pending rows first, which walks the tree down from every known manager.
+    """
+
+    @staticmethod
+    def is_fresh(state: OrgSyncState, max_age: float = None) -> bool:
+        max_age = settings.ORG_SYNC_MAX_AGE if max_age is None else max_age
+        return bool(state.synced_at) and _utcnow() - state.synced_at <= timedelta(seconds=max_age)
+
+    @staticmethod
+    def team_from_state(state: OrgSyncState) -> Tuple[Dict, List[str]]:
+        return json.loads(state.manager_info or "{}"), json.loads(state.reportee_ids or "[]")
+
+    @classmethod
+    async def resolve_team(cls, adb: AsyncDB, manager_id: str) -> Optional[Tuple[Dict, List[str]]]:
+        """
+        Resolve a manager's info and direct reportee IDs
+
+        With TEAM_HIERARCHY_SOURCE="local" a fresh ORG_SYNC_STATE row is used
+        without calling W3. Otherwise (or when local data is missing or stale)
+        the W3 profile is fetched; in local mode the result is written back
+        so the next request is served locally.
+
+        Args:
+            adb: Async data access used for the local store
+            manager_id: Manager's user ID
+
+        Returns:
+            (manager_info, reportee_ids), or None if the manager is unknown to W3
+        """
+        use_local = settings.TEAM_HIERARCHY_SOURCE == "local"
+        state = await adb.run(Session.get, OrgSyncState, manager_id) if use_local else None
+        if state is not None and (state.synced_at is None or state.manager_info is None):
+            state = None  # queued for the sync worker, or unknown to W3 when last tried
+
+        if state is not None and cls.is_fresh(state):
+            return cls.team_from_state(state)
+
+        profile_data = await W3ProfileService.get_user_profile(manager_id)
+        if not profile_data:
+            if state is not None:
+                logger.warning(f"W3 profile unavailable for {manager_id}, serving stale local hierarchy")
+                return cls.team_from_state(state)
+            return None
+
+        manager_info = W3ProfileService.extract_manager_info(profile_data)
+        reportee_ids = W3ProfileService.extract_reportees(profile_data)
+
+        # Only managers are worth keeping; org walks also resolve individual contributors
+        if use_local and (manager_info.get("is_manager") or reportee_ids):
+            try:
+                await adb.run(cls.apply_team, manager_id, manager_info, reportee_ids)
+            except Exception as e:
+                logger.error(f"Failed to store hierarchy for manager {manager_id}: {str(e)}")
+
+        return manager_info, reportee_ids
+
+    @staticmethod
+    def apply_team(db: Session, manager_id: str, manager_info: Dict, reportee_ids: List[str]) -> None:
+        """
+        Upsert a manager's team into the local store and commit
+
+        Args:
+            db: Database session
+            manager_id: Manager's user ID
+            manager_info: Output of W3ProfileService.extract_manager_info
+            reportee_ids: Output of W3ProfileService.extract_reportees
+        """
+        unique_ids = list(dict.fromkeys(reportee_ids))
+
+        registered = set()
+        for chunk in chunked(unique_ids + [manager_id], settings.DB2_IN_CLAUSE_CHUNK_SIZE):
+            registered.update(uid for (uid,) in db.query(User.user_id).filter(User.user_id.in_(chunk)).all())
+
+        if manager_id in registered:
+            registered.discard(manager_id)
+            db.query(User).filter(User.user_id == manager_id).update(
+                {User.is_manager: bool(manager_info.get("is_manager")) or bool(unique_ids)},
+                synchronize_session=False,
+            )
+
+            existing = {
+                employee_id
+                for (employee_id,) in db.query(ManagerEmp.employee_id).filter(
+                    ManagerEmp.manager_id == manager_id
+                ).all()
+            }
+            departed = existing - registered
+            if departed:
+                db.query(ManagerEmp).filter(
+                    ManagerEmp.manager_id == manager_id,
+                    ManagerEmp.employee_id.in_(list(departed)),
+                ).delete(synchronize_session=False)
+            for employee_id in unique_ids:
+                if employee_id in registered and employee_id not in existing:
+                    db.add(ManagerEmp(manager_id=manager_id, employee_id=employee_id))
+
+            # USERS.MANAGER_ID is a foreign key, so only set it for a registered manager
+            for chunk in chunked([uid for uid in unique_ids if uid in registered], settings.DB2_IN_CLAUSE_CHUNK_SIZE):
+                db.query(User).filter(User.user_id.in_(chunk)).update(
+                    {User.manager_id: manager_id},
+                    synchronize_session=False,
+                )
+
+        OrgHierarchyService._queue_reportees(db, unique_ids)
+
+        state = db.get(OrgSyncState, manager_id) or OrgSyncState(manager_id=manager_id)
+        state.manager_info = json.dumps(manager_info)
+        state.reportee_ids = json.dumps(reportee_ids)
+        state.reportee_count = len(reportee_ids)
+        state.synced_at = _utcnow()
+        db.add(state)
+        db.commit()
+
+    @staticmethod
+    def _queue_reportees(db: Session, reportee_ids: List[str]) -> None:
+        """
+        Queue reportees for the sync worker (does not commit)
+
+        Reportees never fetched get a pending row. Reportees last seen
+        without reports are re-queued once older than ORG_SYNC_MAX_AGE (they
+        are not refreshed on their own, see stale_managers), so a new manager
+        is found on the next sync of their own manager.
+
+        Each chunk runs in a savepoint: a reportee stored concurrently (by
+        another sync in the batch or another worker) only skips that chunk.
+        """
+        cutoff = _utcnow() - timedelta(seconds=settings.ORG_SYNC_MAX_AGE)
+        for chunk in chunked(reportee_ids, settings.DB2_IN_CLAUSE_CHUNK_SIZE):
+            try:
+                with db.begin_nested():
+                    known = {
+                        mid for (mid,) in db.query(OrgSyncState.manager_id).filter(
+                            OrgSyncState.manager_id.in_(chunk)
+                        ).all()
+                    }
+                    db.add_all(OrgSyncState(manager_id=uid, reportee_count=0) for uid in chunk if uid not in known)
+                    db.query(OrgSyncState).filter(
+                        OrgSyncState.manager_id.in_(chunk),
+                        OrgSyncState.reportee_count == 0,
+                        OrgSyncState.synced_at < cutoff,
+                    ).update({OrgSyncState.synced_at: None}, synchronize_session=False)
+            except IntegrityError:
+                logger.info(f"Org sync: {len(chunk)} reportees stored concurrently, queued on a later sync")
+
+    @staticmethod
+    def defer_pending(db: Session, manager_id: str) -> None:
+        """
+        Record that W3 returned no profile, so the ID stops heading the queue
+
+        Stamps the pending row, or inserts a stamped row for a known manager
+        that has none (in a savepoint, as a concurrent sync may insert it
+        first). The row keeps no manager info, so it is retried once older
+        than ORG_SYNC_MAX_AGE and is never served as a team.
+        """
+        now = _utcnow()
+        updated = db.query(OrgSyncState).filter(
+            OrgSyncState.manager_id == manager_id,
+            OrgSyncState.synced_at.is_(None),
+        ).update({OrgSyncState.synced_at: now}, synchronize_session=False)
+        if not updated and db.get(OrgSyncState, manager_id) is None:
+            try:
+                with db.begin_nested():
+                    db.add(OrgSyncState(manager_id=manager_id, reportee_count=0, synced_at=now))
+            except IntegrityError:
+                logger.info(f"Org sync: state of {manager_id} stored concurrently")
+        db.commit()
+
+    @staticmethod
+    def stale_managers(db: Session, limit: int, max_age: float = None) -> List[str]:
+        """
+        Managers and queued reportees to fetch from W3, most urgent first
+
+        1. Known managers without a sync state row: users flagged IS_MANAGER,
+           managers in MANAGER_EMP and every USERS.MANAGER_ID
+        2. Pending rows (reportees queued by their manager's sync)
+        3. Managers (rows with reportees) and IDs W3 had no profile for,
+           synced longer than max_age ago, oldest first
+        """
+        max_age = settings.ORG_SYNC_MAX_AGE if max_age is None else max_age
+        cutoff = _utcnow() - timedelta(seconds=max_age)
+
+        known = union(
+            select(User.user_id.label("manager_id")).where(User.is_manager.is_(True)),
+            select(ManagerEmp.manager_id.label("manager_id")),
+            select(User.manager_id.label("manager_id")).where(User.manager_id.isnot(None)),
+        ).subquery()
+        never_synced = db.query(known.c.manager_id).outerjoin(
+            OrgSyncState, OrgSyncState.manager_id == known.c.manager_id
+        ).filter(
+            OrgSyncState.manager_id.is_(None),
+        ).limit(limit).all()
+        manager_ids = [uid for (uid,) in never_synced]
+
+        if len(manager_ids) < limit:
+            queued = db.query(OrgSyncState.manager_id).filter(
+                or_(
+                    OrgSyncState.synced_at.is_(None),
+                    and_(
+                        OrgSyncState.synced_at < cutoff,
+                        or_(OrgSyncState.reportee_count > 0, OrgSyncState.manager_info.is_(None)),
+                    ),
+                )
+            ).order_by(
+                case((OrgSyncState.synced_at.is_(None), 0), else_=1),
+                OrgSyncState.synced_at,
+            ).limit(limit - len(manager_ids)).all()
+            manager_ids.extend(mid for (mid,) in queued)
+
+        return manager_ids
+
+
+class OrgSyncWorker:
+    """
+    Background job that incrementally refreshes the local hierarchy from W3
+
+    Each run fetches a batch from OrgHierarchyService.stale_managers; storing
+    a manager's team queues its reportees, so successive runs walk down the
+    reporting tree from the managers already known locally.
+    """
+
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start(cls) -> None:
+        if not settings.ORG_SYNC_ENABLED or cls._task is not None:
+            return
+        cls._task = asyncio.create_task(cls._run())
+        logger.info("Org hierarchy sync started")
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        try:
+            await cls._task
+        except asyncio.CancelledError:
+            pass
+        cls._task = None
+        logger.info("Org hierarchy sync stopped")
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            try:
+                synced = await cls.sync_once()
+                if synced:
+                    logger.info(f"Org hierarchy sync refreshed {synced} managers")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Org hierarchy sync failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(settings.ORG_SYNC_INTERVAL)
+
+    @classmethod
+    async def sync_once(cls, limit: int = None) -> int:
+        """
+        Refresh one batch of stale managers
+
+        Returns:
+            Number of managers whose hierarchy was stored
+        """
+        limit = limit or settings.ORG_SYNC_BATCH_SIZE
+        adb = AsyncDB(settings.ORG_SYNC_CONCURRENCY)
+        manager_ids = await adb.run(OrgHierarchyService.stale_managers, limit)
+        if not manager_ids:
+            return 0
+
+        semaphore = asyncio.Semaphore(settings.ORG_SYNC_CONCURRENCY)
+
+        async def sync_manager(manager_id: str) -> bool:
+            async with semaphore:
+                try:
+                    profile_data = await W3ProfileService.fetch_user_profile(manager_id)
+                except Exception as e:
+                    logger.warning(f"Org sync: W3 lookup failed for {manager_id}: {e}")
+                    return False
+            if not profile_data:
+                await adb.run(OrgHierarchyService.defer_pending, manager_id)
+                return False
+            await adb.run(
+                OrgHierarchyService.apply_team,
+                manager_id,
+                W3ProfileService.extract_manager_info(profile_data),
+                W3ProfileService.extract_reportees(profile_data),
+            )
+            return True
+
+        results = await asyncio.gather(*(sync_manager(mid) for mid in manager_ids), return_exceptions=True)
+        for manager_id, result in zip(manager_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Org sync: failed to store hierarchy for {manager_id}: {result}")
+        return sum(1 for result in results if result is True)
+
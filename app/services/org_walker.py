@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.async_db import AsyncDB
+from app.core.config import settings
+from app.services.org_sync import OrgHierarchyService
+
+logger = logging.getLogger(__name__)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+class OrgTreeWalker:
+    """
+    Breadth-first walk of a manager's reporting tree.
+
+    Each level's manager profiles are resolved concurrently (bounded by a
+    semaphore) through OrgHierarchyService, so the local hierarchy store and
+    the W3 profile cache are used when available. Visited IDs are tracked so
+    dotted-line or cyclic reporting data cannot expand a user twice.
+    """
+
+    def __init__(self, adb: AsyncDB, concurrency: int = None):
+        self.adb = adb
+        self.concurrency = concurrency or settings.W3_FANOUT_CONCURRENCY
+
+    async def walk(self, root_id: str, depth: int) -> Optional[Dict]:
+        """
+        Walk the hierarchy below root_id
+
+        Args:
+            root_id: Manager's user ID
+            depth: Number of levels below the manager to include (1 = direct reports)
+
+        Returns:
+            Dict with manager info, nodes {user_id: {"level", "reports_to"}} in
+            breadth-first order and per-level metadata, or None if the root
+            manager is unknown
+        """
+        started = time.perf_counter()
+        root_team = await OrgHierarchyService.resolve_team(self.adb, root_id)
+        if root_team is None:
+            return None
+        manager_info, direct_reports = root_team
+
+        visited = {root_id}
+        nodes: Dict[str, Dict] = {}
+        levels: List[Dict] = []
+        frontier: List[Tuple[str, List[str]]] = [(root_id, direct_reports)]
+        root_ms = _elapsed_ms(started)
+
+        for level in range(1, depth + 1):
+            level_started = time.perf_counter()
+            level_ids = []
+            for parent_id, reports in frontier:
+                for user_id in reports:
+                    if user_id in visited:
+                        continue
+                    visited.add(user_id)
+                    nodes[user_id] = {"level": level, "reports_to": parent_id}
+                    level_ids.append(user_id)
+
+            # Only fan out to this level's profiles if another level is wanted
+            next_frontier: List[Tuple[str, List[str]]] = []
+            failures = 0
+            if level < depth and level_ids:
+                teams = await self._resolve_many(level_ids)
+                for user_id, team in zip(level_ids, teams):
+                    if isinstance(team, Exception):
+                        failures += 1
+                        logger.warning(f"Org walk: could not resolve team for {user_id}: {team}")
+                    elif team and team[1]:
+                        next_frontier.append((user_id, team[1]))
+
+            levels.append({
+                "level": level,
+                "user_count": len(level_ids),
+                "profiles_resolved": len(level_ids) if level < depth else 0,
+                "managers_found": len(next_frontier),
+                "failures": failures,
+                "duration_ms": _elapsed_ms(level_started),
+            })
+
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        return {
+            "manager": manager_info,
+            "nodes": nodes,
+            "metadata": {
+                "requested_depth": depth,
+                "depth_reached": len(levels),
+                "concurrency": self.concurrency,
+                "root_ms": root_ms,
+                "levels": levels,
+                "walk_ms": _elapsed_ms(started),
+            },
+        }
+
+    async def _resolve_many(self, user_ids: List[str]) -> List:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def resolve(user_id: str):
+            async with semaphore:
+                return await OrgHierarchyService.resolve_team(self.adb, user_id)
+
+        return await asyncio.gather(*(resolve(uid) for uid in user_ids), return_exceptions=True)
@@ -0,0 +1,315 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.async_db import with_session
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.models.users import User
+from app.services.index_builds import IndexBuilds
+from app.services.reportee_loader import chunked
+
+logger = logging.getLogger(__name__)
+
+# USERS attributes kept per person (and returned by /api/users/search)
+PERSON_FIELDS = ("user_id", "name", "email", "user_type")
+_WORD = re.compile(r"\w+")
+# Batches larger than this re-sort the whole key array instead of inserting in place
+_RESORT_THRESHOLD = 64
+
+
+def _tokens(name: Optional[str], email: Optional[str]) -> Tuple[str, ...]:
+    """Searchable keys of a person: name words, email local-part words, and the full email"""
+    tokens = set(_WORD.findall(name.casefold())) if name else set()
+    if email:
+        email = email.casefold()
+        tokens.update(_WORD.findall(email.split("@", 1)[0]))
+        tokens.add(email)
+    return tuple(tokens)
+
+
+def _person(item: Any) -> Tuple:
+    if isinstance(item, Mapping):
+        return tuple(item.get(f) for f in PERSON_FIELDS)
+    return tuple(getattr(item, f) for f in PERSON_FIELDS)
+
+
+class _Directory:
+    """
+    People in parallel lists addressed by slot, plus one sorted key array
+
+    `keys` holds every (token, slot) pair sorted by token then slot, split
+    into a list of strings and an array of slots; a prefix query is two
+    binary searches on `keys` and a walk over the matching part of `slots`.
+    A build assigns slots in name order, so people sharing a token are
+    listed by name (people added since then come after them). Deleted
+    people leave a free slot that the next insert reuses.
+    """
+
+    def __init__(self):
+        self.people: List[Optional[Tuple]] = []
+        self.tokens: List[Tuple[str, ...]] = []
+        self.slot_of: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.keys: List[str] = []
+        self.slots = array("l")
+
+    def __len__(self) -> int:
+        return len(self.slot_of)
+
+    def add(self, person: Tuple, index_keys: bool = True) -> None:
+        user_id = person[0]
+        self.remove(user_id)
+        tokens = _tokens(person[1], person[2])
+        slot = self.free.pop() if self.free else len(self.people)
+        if slot == len(self.people):
+            self.people.append(None)
+            self.tokens.append(())
+        self.people[slot] = person
+        self.tokens[slot] = tokens
+        self.slot_of[user_id] = slot
+        if index_keys:
+            for token in tokens:
+                lo, hi = bisect_left(self.keys, token), bisect_right(self.keys, token)
+                i = lo + bisect_right(self.slots[lo:hi], slot)
+                self.keys.insert(i, token)
+                self.slots.insert(i, slot)
+
+    def remove(self, user_id: str) -> None:
+        slot = self.slot_of.pop(user_id, None)
+        if slot is None:
+            return
+        for token in self.tokens[slot]:
+            for i in range(bisect_left(self.keys, token), bisect_right(self.keys, token)):
+                if self.slots[i] == slot:
+                    del self.keys[i]
+                    del self.slots[i]
+                    break
+        self.people[slot] = None
+        self.tokens[slot] = ()
+        self.free.append(slot)
+
+    def sort_keys_array(self) -> None:
+        """Rebuild the key array from the live people"""
+        pairs = sorted(
+            (token, slot) for slot in self.slot_of.values() for token in self.tokens[slot]
+        )
+        self.keys = [token for token, _ in pairs]
+        self.slots = array("l", (slot for _, slot in pairs))
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        # Every key starting with `prefix` sorts before prefix + U+10FFFF
+        return bisect_left(self.keys, prefix), bisect_left(self.keys, prefix + "\U0010ffff")
+
+
+class PeopleIndex:
+    """
+    In-process typeahead index over USERS name and email.
+
+    A query is split into words and a person matches when every word is a
+    prefix of one of their name words, email local-part words, or (for
+    queries containing "@") their full email. Matching never touches the
+    database: the people under the other words' key ranges are intersected,
+    then the narrowest word's range is walked in sorted order until `limit`
+    of them are found.
+
+    Built at startup, patched by the users routes after each commit, and
+    optionally rebuilt every PEOPLE_INDEX_REBUILD_INTERVAL seconds to pick up
+    writes from other workers. Builds are single-flight, and writes that land
+    while a build is reading the table are journaled and replayed before the
+    new index is swapped in (see IndexBuilds).
+    """
+
+    def __init__(self, rebuild_interval: float):
+        self.rebuild_interval = rebuild_interval
+        self._directory: Optional[_Directory] = None
+        self._lock = threading.RLock()
+        self._builds = IndexBuilds(self._lock)
+        self._task: Optional[asyncio.Task] = None
+        self._built_at: Optional[float] = None
+        self._counters = {"builds": 0, "build_failures": 0, "updates": 0, "queries": 0}
+
+    @property
+    def ready(self) -> bool:
+        return self._directory is not None
+
+    def ensure_ready(self) -> None:
+        """Build the index if there is none yet, or wait for the build in flight (blocking)"""
+        self._builds.ensure_built(lambda: self.ready, self.build)
+
+    def build(self) -> None:
+        """Read USERS and swap in a fresh index (blocking; one build at a time)"""
+        started = time.perf_counter()
+        try:
+            self._builds.run(self._read, self._install)
+        except Exception:
+            with self._lock:
+                self._counters["build_failures"] += 1
+            raise
+        directory = self._directory
+        logger.info(f"People index built: {len(directory)} users, {len(directory.keys)} keys "
+                    f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def _read(self) -> _Directory:
+        people = with_session(self._fetch)
+        directory = _Directory()
+        for person in sorted(people, key=lambda p: ((p[1] or "").casefold(), p[0])):
+            directory.add(person, index_keys=False)
+        directory.sort_keys_array()
+        return directory
+
+    def _install(self, directory: _Directory, journal: List[Tuple[str, Any]]) -> None:
+        for op, value in journal:
+            if op == "put":
+                directory.add(value)
+            else:
+                directory.remove(value)
+        self._directory = directory
+        self._built_at = time.monotonic()
+        self._counters["builds"] += 1
+
+    def put(self, items: Iterable[Any]) -> None:
+        """Index created or updated users (ORM objects or row dicts); failures are logged, not raised"""
+        try:
+            people = [_person(item) for item in items]
+            with self._lock:
+                directory = self._directory
+                resort = directory is not None and len(people) > _RESORT_THRESHOLD
+                for person in people:
+                    self._builds.record(("put", person))
+                    if directory is not None:
+                        directory.add(person, index_keys=not resort)
+                if resort:
+                    directory.sort_keys_array()
+                self._counters["updates"] += len(people)
+        except Exception as e:
+            logger.warning(f"People index: could not index users, left to the next rebuild: {str(e)}")
+
+    def put_ids(self, db: Session, user_ids: List[str]) -> None:
+        """Index users by ID after a bulk import; failures are logged, not raised (the write is committed)"""
+        try:
+            rows = []
+            columns = [getattr(User, f) for f in PERSON_FIELDS]
+            for chunk in chunked(user_ids, settings.DB2_IN_CLAUSE_CHUNK_SIZE):
+                rows.extend(
+                    dict(zip(PERSON_FIELDS, row))
+                    for row in db.query(*columns).filter(User.user_id.in_(chunk)).all()
+                )
+        except Exception as e:
+            logger.warning(f"People index: could not index {len(user_ids)} users, left to the next rebuild: {str(e)}")
+            return
+        self.put(rows)
+
+    def remove(self, user_id: str) -> None:
+        """Drop a deleted user"""
+        with self._lock:
+            self._builds.record(("remove", user_id))
+            if self._directory is not None:
+                self._directory.remove(user_id)
+            self._counters["updates"] += 1
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        People matching every word of `query`
+
+        Ordered by the matched word, then by name: the key range of the
+        narrowest word is walked in order and the walk stops after `limit`
+        people, so broad one-letter queries cost no more than narrow ones.
+        """
+        query = query.strip().casefold()
+        words = [query] if "@" in query else _WORD.findall(query)
+        if not words:
+            return []
+
+        with self._lock:
+            self._counters["queries"] += 1
+            directory = self._directory
+            ranges = [directory.prefix_range(word) for word in words]
+            narrowest = min(range(len(words)), key=lambda i: ranges[i][1] - ranges[i][0])
+            lo, hi = ranges[narrowest]
+            # People matching the other words: one set intersection instead
+            # of checking tokens while walking (many may fail before `limit` match)
+            allowed = None
+            for i, (other_lo, other_hi) in enumerate(ranges):
+                if i != narrowest:
+                    people = set(directory.slots[other_lo:other_hi])
+                    allowed = people if allowed is None else allowed & people
+
+            matches: List[int] = []
+            seen = set()
+            for slot in directory.slots[lo:hi]:
+                if slot in seen or (allowed is not None and slot not in allowed):
+                    continue
+                seen.add(slot)
+                matches.append(slot)
+                if len(matches) == limit:
+                    break
+            return [dict(zip(PERSON_FIELDS, directory.people[slot])) for slot in matches]
+
+    def lookup(self, user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """PERSON_FIELDS of the given users that are indexed"""
+        with self._lock:
+            directory = self._directory
+            if directory is None:
+                return {}
+            slots = ((user_id, directory.slot_of.get(user_id)) for user_id in user_ids)
+            return {
+                user_id: dict(zip(PERSON_FIELDS, directory.people[slot]))
+                for user_id, slot in slots if slot is not None
+            }
+
+    def stats(self) -> Dict:
+        directory = self._directory
+        return {
+            **self._counters,
+            "entries": len(directory) if directory else 0,
+            "keys": len(directory.keys) if directory else 0,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+        }
+
+    @staticmethod
+    def _fetch(db: Session) -> List[Tuple]:
+        columns = [getattr(User, f) for f in PERSON_FIELDS]
+        return [tuple(row) for row in db.query(*columns).yield_per(settings.DB2_IN_CLAUSE_CHUNK_SIZE)]
+
+    async def start(self) -> None:
+        """Build the index and start the periodic rebuild"""
+        try:
+            await run_in_threadpool(self.build)
+        except Exception as e:
+            # Not fatal: the search endpoint builds on first use
+            logger.error(f"People index build failed: {str(e)}")
+        if self.rebuild_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebuild_interval)
+            try:
+                await run_in_threadpool(self.build)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"People index rebuild failed, keeping current index: {str(e)}")
+
+
+people_index = PeopleIndex(settings.PEOPLE_INDEX_REBUILD_INTERVAL)
+register_cache("people_index", people_index.stats)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A loader returns (value, cacheable). A value of None with cacheable=True is a
+# negative result (e.g. 404) and is cached for the negative TTL; cacheable=False
+# results (transient upstream errors) are returned but never stored.
+Loader = Callable[[], Awaitable[Tuple[Optional[Dict], bool]]]
+
+# Rough per-entry bookkeeping overhead used in the byte budget
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "stale_until")
+
+    def __init__(self, value: Optional[Dict], size: int, expires_at: float, stale_until: float):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    @property
+    def negative(self) -> bool:
+        return self.value is None
+
+
+class ProfileCache:
+    """
+    Bounded in-process cache for W3 profile lookups.
+
+    - Entries are fresh for `ttl` seconds, then served stale for up to
+      `stale_ttl` more seconds while a background refresh runs.
+    - Negative results (profile not found) are cached for `negative_ttl`.
+    - Least recently used entries are evicted once either `max_entries` or the
+      approximate `max_bytes` budget is exceeded.
+    - Concurrent misses for the same key share a single upstream call.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float,
+        negative_ttl: float,
+        max_entries: int,
+        max_bytes: int,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._bytes = 0
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "uncacheable": 0,
+        }
+
+    async def get(self, key: str, loader: Loader) -> Optional[Dict]:
+        """
+        Return the cached value for `key`, loading it through `loader` on a miss
+
+        Args:
+            key: Cache key (W3 user ID or email)
+            loader: Coroutine factory performing the upstream call
+
+        Returns:
+            Cached or freshly loaded value (None for negative results)
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            if now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self._counters["negative_hits" if entry.negative else "hits"] += 1
+                return entry.value
+
+            if now < entry.stale_until:
+                # Serve stale immediately and refresh in the background
+                self._entries.move_to_end(key)
+                self._counters["stale_hits"] += 1
+                if key not in self._inflight:
+                    self._counters["refreshes"] += 1
+                    self._start_load(key, loader)
+                return entry.value
+
+            self._remove(key)
+            self._counters["expirations"] += 1
+
+        if key in self._inflight:
+            self._counters["coalesced"] += 1
+        else:
+            self._counters["misses"] += 1
+
+        # shield() so a cancelled caller does not cancel the shared upstream call
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry"""
+        self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Return counters and occupancy for tuning"""
+        lookups = (
+            self._counters["hits"]
+            + self._counters["stale_hits"]
+            + self._counters["negative_hits"]
+            + self._counters["misses"]
+            + self._counters["coalesced"]
+        )
+        served_from_cache = lookups - self._counters["misses"] - self._counters["coalesced"]
+        return {
+            **self._counters,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "inflight": len(self._inflight),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hit_ratio": round(served_from_cache / lookups, 4) if lookups else 0.0,
+        }
+
+    def _start_load(self, key: str, loader: Loader) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._load_done(key, t))
+        return task
+
+    def _load_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception so background refresh failures are not reported
+        # as "never retrieved"; foreground callers still see it via await
+        if not task.cancelled() and task.exception() is not None and key in self._entries:
+            self._counters["refresh_failures"] += 1
+            logger.warning(f"Background refresh failed for {key}, keeping stale entry: {task.exception()}")
+
+    async def _load(self, key: str, loader: Loader) -> Optional[Dict]:
+        value, cacheable = await loader()
+        if cacheable:
+            self._store(key, value)
+        else:
+            self._counters["uncacheable"] += 1
+        return value
+
+    def _store(self, key: str, value: Optional[Dict]) -> None:
+        now = time.monotonic()
+        if value is None:
+            size = ENTRY_OVERHEAD_BYTES
+            expires_at = now + self.negative_ttl
+            stale_until = expires_at
+        else:
+            size = len(json.dumps(value, default=str)) + ENTRY_OVERHEAD_BYTES
+            expires_at = now + self.ttl
+            stale_until = expires_at + self.stale_ttl
+
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = _Entry(value, size, expires_at, stale_until)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._counters["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
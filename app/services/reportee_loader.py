@@ -0,0 +1,324 @@
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal_column, select, union_all
+from sqlalchemy.orm import Session, load_only
+
+from app.core.config import settings
+from app.models.users import User
+from app.models.assets import Asset
+from app.models.user_skills import UserSkill
+from app.models.projects import Project
+from app.models.user_cert import UserCert
+from app.models.professional_eminence import ProfessionalEminence
+
+logger = logging.getLogger(__name__)
+
+
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    """Split a sequence into consecutive slices of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# Response fields per section, in payload order. Eminence exposes user_id as employee_id.
+ASSET_FIELDS = ("id", "asset_name", "asset_desc", "used_in_project", "ai_adoption", "your_contribution", "status", "url")
+SKILL_FIELDS = ("id", "platform", "segment", "proficiency_level", "skill_type", "yoe", "status")
+PROJECT_FIELDS = ("id", "project_name", "client_name", "your_role", "tech_used", "is_foak", "status", "asset_used", "asset_name")
+CERTIFICATION_FIELDS = ("id", "cert_name", "cert_type", "cert_cat", "issue_date", "status")
+EMINENCE_FIELDS = ("id", "employee_id", "manager_id", "url", "eminence_type", "description", "scope")
+
+FIELD_ATTRIBUTES = {"employee_id": "user_id"}
+
+# Large Text (LOB) columns left out of the team payload unless include_text is set
+LARGE_TEXT_FIELDS = frozenset({"asset_desc", "your_contribution", "tech_used"})
+
+
+def serialize_row(row, fields: Sequence[str]) -> Dict:
+    """Serialize the given fields of an ORM row, rendering dates as ISO strings"""
+    data = {}
+    for field in fields:
+        value = getattr(row, FIELD_ATTRIBUTES.get(field, field))
+        if isinstance(value, date):
+            value = value.isoformat()
+        data[field] = value
+    return data
+
+
+def serialize_certification(c: UserCert) -> Dict:
+    return serialize_row(c, CERTIFICATION_FIELDS)
+
+
+class ReporteeDataLoader:
+    """
+    Batch loader for the per-reportee sections returned by the team endpoints.
+
+    Instead of one query per reportee per section, each section is fetched for
+    a whole chunk of reportees with a single `IN (...)` query and the rows are
+    grouped by user_id in memory. The number of statements issued therefore
+    depends on the number of chunks, not on the number of reportees.
+
+    `load`/`iter_batches` run the queries sequentially on `db`; `load_async`
+    runs each chunk's independent queries in parallel through an AsyncDB.
+    """
+
+    # (flag, response key, count key, model, response fields)
+    SECTIONS = (
+        ("include_assets", "assets", "assets_count", Asset, ASSET_FIELDS),
+        ("include_skills", "skills", "skills_count", UserSkill, SKILL_FIELDS),
+        ("include_projects", "projects", "projects_count", Project, PROJECT_FIELDS),
+        ("include_certifications", "certifications", "certifications_count", UserCert, CERTIFICATION_FIELDS),
+        ("include_eminence", "professional_eminence", "eminence_count", ProfessionalEminence, EMINENCE_FIELDS),
+    )
+
+    # (summary key, model) counted by count_sections
+    COUNTED_SECTIONS = (
+        ("assets", Asset),
+        ("skills", UserSkill),
+        ("projects", Project),
+        ("certifications", UserCert),
+        ("eminence", ProfessionalEminence),
+    )
+
+    def __init__(self, db: Optional[Session] = None, chunk_size: int = None, include_text: bool = False):
+        self.db = db
+        self.chunk_size = chunk_size or settings.DB2_IN_CLAUSE_CHUNK_SIZE
+        self.include_text = include_text
+        self.query_count = 0
+        self._section_fields = {key: self._fields(fields) for _, key, _, _, fields in self.SECTIONS}
+
+    def load(
+        self,
+        reportee_ids: Sequence[str],
+        include_skills: bool = True,
+        include_projects: bool = True,
+        include_assets: bool = True,
+        include_certifications: bool = True,
+        include_eminence: bool = False,
+    ) -> List[Dict]:
+        """
+        Load reportee data for all reportee IDs
+
+        Args:
+            reportee_ids: Reportee user IDs, in the order they should be returned
+            include_*: Which sections to load for each registered reportee
+
+        Returns:
+            List of reportee dicts, one per reportee ID
+        """
+        reportees = []
+        for batch in self.iter_batches(
+            reportee_ids,
+            include_skills=include_skills,
+            include_projects=include_projects,
+            include_assets=include_assets,
+            include_certifications=include_certifications,
+            include_eminence=include_eminence,
+        ):
+            reportees.extend(batch)
+        return reportees
+
+    def iter_batches(
+        self,
+        reportee_ids: Sequence[str],
+        include_skills: bool = True,
+        include_projects: bool = True,
+        include_assets: bool = True,
+        include_certifications: bool = True,
+        include_eminence: bool = False,
+    ) -> Iterator[List[Dict]]:
+        """Yield reportee dicts one chunk of reportee IDs at a time"""
+        sections = self._enabled_sections(
+            include_skills, include_projects, include_assets, include_certifications, include_eminence
+        )
+        for chunk in chunked(list(reportee_ids), self.chunk_size):
+            try:
+                unique_ids = list(dict.fromkeys(chunk))
+                users = self._fetch_users(self.db, unique_ids)
+                registered_ids = [uid for uid in unique_ids if uid in users]
+                rows = {}
+                if registered_ids:
+                    for key, model in sections:
+                        rows[key] = self._fetch_section(self.db, model, self._section_fields[key], registered_ids)
+                self.query_count += 1 + (len(sections) if registered_ids else 0)
+                yield self._assemble(chunk, users, rows)
+            except Exception as e:
+                self.db.rollback()
+                yield self._chunk_error(chunk, e)
+
+    async def load_async(
+        self,
+        adb,
+        reportee_ids: Sequence[str],
+        include_skills: bool = True,
+        include_projects: bool = True,
+        include_assets: bool = True,
+        include_certifications: bool = True,
+        include_eminence: bool = False,
+    ) -> List[Dict]:
+        """
+        Same result as `load`, with each chunk's section queries running
+        concurrently on separate pooled connections
+
+        The user lookup runs first so that, as in `iter_batches`, sections are
+        only queried for reportees registered in USERS.
+
+        Args:
+            adb: AsyncDB used to run the queries off the event loop
+            reportee_ids, include_*: As for `load`
+        """
+        sections = self._enabled_sections(
+            include_skills, include_projects, include_assets, include_certifications, include_eminence
+        )
+        reportees = []
+        for chunk in chunked(list(reportee_ids), self.chunk_size):
+            unique_ids = list(dict.fromkeys(chunk))
+            try:
+                users = await adb.run(self._fetch_users, unique_ids)
+                self.query_count += 1
+                registered_ids = [uid for uid in unique_ids if uid in users]
+                results = []
+                if registered_ids and sections:
+                    results = await adb.gather(*(
+                        (self._fetch_section, model, self._section_fields[key], registered_ids)
+                        for key, model in sections
+                    ))
+                    self.query_count += len(sections)
+            except Exception as e:
+                reportees.extend(self._chunk_error(chunk, e))
+                continue
+            rows = {key: result for (key, _), result in zip(sections, results)}
+            reportees.extend(self._assemble(chunk, users, rows))
+        return reportees
+
+    def count_sections(self, reportee_ids: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Count registered users and section rows per reportee
+
+        All counts for a chunk of reportees come back from a single
+        `UNION ALL` of grouped counts, so a summary costs one round trip
+        per chunk instead of one per section.
+
+        Args:
+            reportee_ids: Reportee user IDs
+
+        Returns:
+            Dict keyed by user_id (registered reportees only) of
+            {"assets": n, "skills": n, "projects": n, "certifications": n, "eminence": n}
+        """
+        registered = set()
+        section_counts = defaultdict(dict)
+        unique_ids = list(dict.fromkeys(reportee_ids))
+        for chunk in chunked(unique_ids, self.chunk_size):
+            self.query_count += 1
+            for section, user_id, row_count in self.db.execute(self._section_counts_statement(chunk)).all():
+                if section == "users":
+                    registered.add(user_id)
+                else:
+                    section_counts[user_id][section] = row_count
+
+        return {
+            user_id: {key: section_counts[user_id].get(key, 0) for key, _ in self.COUNTED_SECTIONS}
+            for user_id in unique_ids
+            if user_id in registered
+        }
+
+    def _section_counts_statement(self, user_ids: Sequence[str]):
+        # Section names are inlined: DB2 cannot type parameter markers in a select list
+        parts = [
+            select(
+                literal_column("'users'").label("section"),
+                User.user_id.label("user_id"),
+                func.count().label("row_count"),
+            ).where(User.user_id.in_(user_ids)).group_by(User.user_id)
+        ]
+        for key, model in self.COUNTED_SECTIONS:
+            parts.append(
+                select(
+                    literal_column(f"'{key}'"),
+                    model.user_id,
+                    func.count(model.id),
+                ).where(model.user_id.in_(user_ids)).group_by(model.user_id)
+            )
+        return union_all(*parts)
+
+    def _enabled_sections(
+        self,
+        include_skills: bool,
+        include_projects: bool,
+        include_assets: bool,
+        include_certifications: bool,
+        include_eminence: bool,
+    ) -> List[Tuple[str, type]]:
+        include = {
+            "include_skills": include_skills,
+            "include_projects": include_projects,
+            "include_assets": include_assets,
+            "include_certifications": include_certifications,
+            "include_eminence": include_eminence,
+        }
+        return [(key, model) for flag, key, _, model, _ in self.SECTIONS if include[flag]]
+
+    def _assemble(self, chunk: Sequence[str], users: Dict[str, User], rows: Dict[str, Dict[str, List]]) -> List[Dict]:
+        batch = []
+        for reportee_id in chunk:
+            user = users.get(reportee_id)
+            if not user:
+                logger.warning(f"Reportee {reportee_id} not found in database")
+                batch.append({
+                    "user_id": reportee_id,
+                    "in_database": False,
+                    "message": "User not yet registered in system"
+                })
+                continue
+
+            reportee_data = {
+                "user_id": user.user_id,
+                "name": user.name,
+                "email": user.email,
+                "user_type": user.user_type,
+                "in_database": True
+            }
+            for _, key, count_key, _, _ in self.SECTIONS:
+                if key not in rows:
+                    continue
+                section_rows = rows[key].get(reportee_id, [])
+                fields = self._section_fields[key]
+                reportee_data[key] = [serialize_row(row, fields) for row in section_rows]
+                reportee_data[count_key] = len(section_rows)
+            batch.append(reportee_data)
+        return batch
+
+    @staticmethod
+    def _chunk_error(chunk: Sequence[str], error: Exception) -> List[Dict]:
+        logger.error(f"Error loading reportee chunk of {len(chunk)} users: {str(error)}")
+        return [
+            {"user_id": reportee_id, "error": str(error), "in_database": False}
+            for reportee_id in chunk
+        ]
+
+    def _fields(self, fields: Sequence[str]) -> Sequence[str]:
+        if self.include_text:
+            return fields
+        return tuple(f for f in fields if f not in LARGE_TEXT_FIELDS)
+
+    @staticmethod
+    def _fetch_users(db: Session, user_ids: Sequence[str]) -> Dict[str, User]:
+        return {
+            u.user_id: u
+            for u in db.query(User).filter(User.user_id.in_(list(user_ids))).all()
+        }
+
+    @staticmethod
+    def _fetch_section(db: Session, model, fields: Sequence[str], user_ids: Sequence[str]) -> Dict[str, List]:
+        grouped = defaultdict(list)
+        # Load only the serialized columns; unused and deferred LOBs never leave DB2
+        columns = {"user_id"} | {FIELD_ATTRIBUTES.get(f, f) for f in fields}
+        query = db.query(model).options(
+            load_only(*(getattr(model, c) for c in columns))
+        ).filter(model.user_id.in_(list(user_ids))).order_by(model.id)
+        for row in query.all():
+            grouped[row.user_id].append(row)
+        return grouped
@@ -0,0 +1,142 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+DB2_DIALECTS = frozenset({"ibm_db_sa", "db2"})
+
+
+def is_db2(db: Session) -> bool:
+    return db.get_bind().dialect.name in DB2_DIALECTS
+
+
+def _attributes(model) -> List[Tuple[str, Any]]:
+    """(ORM attribute name, table column) pairs in table order"""
+    return [(prop.key, prop.columns[0]) for prop in inspect(model).column_attrs]
+
+
+def column_keys(model) -> Dict[str, str]:
+    """ORM attribute name -> table column key"""
+    return {key: column.key for key, column in _attributes(model)}
+
+
+def with_scalar_defaults(table, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add the scalar Python-side defaults (`Column(default=...)`) of columns
+    missing from `values`, keyed by table column key
+
+    final_table() runs compiled SQL on the driver, which skips the
+    execution step that fills these in, so omitted columns such as
+    USERS.IS_MANAGER would otherwise be stored as NULL.
+    """
+    defaults = {
+        column.key: column.default.arg
+        for column in table.columns
+        if column.key not in values and column.default is not None and column.default.is_scalar
+    }
+    return {**defaults, **values} if defaults else values
+
+
+def final_table(db: Session, dml, columns: Sequence, input_order: bool = False) -> List[Tuple]:
+    """
+    Run an INSERT or UPDATE wrapped in a DB2 data-change table reference
+
+    `SELECT <columns> FROM FINAL TABLE (<dml>)` returns the affected rows as
+    they are after the change (generated keys and defaults included) in the
+    same statement. The ibm_db_sa dialect has no RETURNING support, so the
+    statement is compiled here and run on the driver directly.
+
+    Args:
+        db: Database session (the statement joins its transaction)
+        dml: Core insert() or update() construct
+        columns: Table columns to select
+        input_order: Add ORDER BY INPUT SEQUENCE (multi-row inserts only)
+
+    Returns:
+        Result tuples with the dialect's result processing applied
+    """
+    dialect = db.get_bind().dialect
+    compiled = dml.compile(dialect=dialect)
+    quote = dialect.identifier_preparer.quote
+    sql = f"SELECT {', '.join(quote(c.name) for c in columns)} FROM FINAL TABLE ({compiled})"
+    if input_order:
+        sql += " ORDER BY INPUT SEQUENCE"
+
+    params = []
+    for name in compiled.positiontup:
+        value = compiled.params[name]
+        processor = compiled.binds[name].type.dialect_impl(dialect).bind_processor(dialect)
+        params.append(processor(value) if processor else value)
+
+    processors = [c.type.dialect_impl(dialect).result_processor(dialect, None) for c in columns]
+    return [
+        tuple(p(v) if p else v for p, v in zip(processors, row))
+        for row in db.connection().exec_driver_sql(sql, tuple(params))
+    ]
+
+
+def insert_row(db: Session, model, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Insert one row and return it as stored, in a single statement
+
+    Replaces add/commit/refresh, which costs a second SELECT per create.
+    Does not commit.
+
+    Args:
+        db: Database session
+        model: Mapped class
+        data: Values keyed by ORM attribute name
+
+    Returns:
+        The new row keyed by ORM attribute name (generated keys included)
+    """
+    attributes = _attributes(model)
+    keys = column_keys(model)
+    columns = [column for _, column in attributes]
+    values = {keys[attr]: value for attr, value in data.items()}
+
+    if is_db2(db):
+        stmt = insert(model.__table__).values(with_scalar_defaults(model.__table__, values))
+        row = final_table(db, stmt, columns)[0]
+    else:
+        row = db.execute(insert(model.__table__).values(values).returning(*columns)).one()
+    return {attr: value for (attr, _), value in zip(attributes, row)}
+
+
+def update_row(db: Session, model, match: Dict[str, Any], data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Guarded single-statement update: `UPDATE ... SET ... WHERE <match>`
+
+    The updated row comes back from the same statement, so there is no
+    SELECT before (to find the row) or after (to refresh it). Does not commit.
+
+    Args:
+        db: Database session
+        model: Mapped class
+        match: Equality filters keyed by ORM attribute name, e.g. the primary
+            key plus USER_ID for owner-only updates
+        data: Values to set keyed by ORM attribute name; when empty the
+            matching row is only read
+
+    Returns:
+        The updated row keyed by ORM attribute name, or None when no row
+        matched
+    """
+    attributes = _attributes(model)
+    keys = column_keys(model)
+    columns = [column for _, column in attributes]
+    table = model.__table__
+    condition = and_(*(table.c[keys[attr]] == value for attr, value in match.items()))
+
+    if not data:
+        rows = db.execute(select(*columns).where(condition)).all()
+    else:
+        stmt = update(table).where(condition).values({keys[attr]: value for attr, value in data.items()})
+        if is_db2(db):
+            rows = final_table(db, stmt, columns)
+        else:
+            rows = db.execute(stmt.returning(*columns)).all()
+
+    if not rows:
+        return None
+    return {attr: value for (attr, _), value in zip(attributes, rows[0])}
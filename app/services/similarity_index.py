@@ -0,0 +1,399 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.async_db import with_session
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.models.user_cert import UserCert
+from app.models.user_skills import UserSkill
+from app.services.expert_index import parse_yoe, proficiency_rank
+from app.services.index_builds import IndexBuilds
+from app.services.reportee_loader import chunked
+from app.services.skills_catalog import TAXONOMY_FIELDS, CatalogSnapshot, skills_catalog
+
+logger = logging.getLogger(__name__)
+
+_SKILL_FIELDS = ("id", "user_id", "skill_id", "proficiency_level", "yoe") + TAXONOMY_FIELDS
+
+# Feature keys: ("skill", skill_id) for catalog skills, ("path", taxonomy values)
+# for skills outside the catalog, ("cert", category) for certification categories
+Feature = Tuple[str, Hashable]
+
+
+def _skill_row(item: Any) -> Dict[str, Any]:
+    if isinstance(item, Mapping):
+        return {f: item.get(f) for f in _SKILL_FIELDS}
+    return {f: getattr(item, f) for f in _SKILL_FIELDS}
+
+
+def skill_feature(row: Mapping[str, Any], snapshot: CatalogSnapshot) -> Tuple[Feature, float]:
+    """
+    Feature and weight of one USER_SKILLS row
+
+    Holding the skill weighs 1; proficiency (rank / scale length) and capped
+    years of experience (yoe / EXPERT_YOE_CAP) add up to 1 each.
+    """
+    skill_id = row["skill_id"]
+    if skill_id is None or skill_id not in snapshot.by_id:
+        path = tuple(row[f] for f in TAXONOMY_FIELDS)
+        skill_id = snapshot.by_path.get(path)
+    feature = ("skill", skill_id) if skill_id is not None else ("path", path)
+    scale = max(len(settings.expert_proficiency_scale), 1)
+    cap = settings.EXPERT_YOE_CAP
+    weight = 1.0 + proficiency_rank(row["proficiency_level"]) / scale + min(parse_yoe(row["yoe"]), cap) / cap
+    return feature, weight
+
+
+class _Profiles:
+    """
+    Raw per-user inputs: skill rows by row ID and certification categories
+
+    Kept so that one skill write can recompute its user's vector without
+    reading the database.
+    """
+
+    def __init__(self):
+        self.skills: Dict[int, Tuple[str, Feature, float]] = {}
+        self.skills_by_user: Dict[str, Set[int]] = {}
+        self.certs: Dict[str, Set[str]] = {}
+
+    def put_skill(self, skill_row_id: int, user_id: str, feature: Feature, weight: float) -> Optional[str]:
+        """Returns the previous owner when the row moved to another user"""
+        previous = self.remove_skill(skill_row_id)
+        self.skills[skill_row_id] = (user_id, feature, weight)
+        self.skills_by_user.setdefault(user_id, set()).add(skill_row_id)
+        return previous if previous != user_id else None
+
+    def remove_skill(self, skill_row_id: int) -> Optional[str]:
+        entry = self.skills.pop(skill_row_id, None)
+        if entry is None:
+            return None
+        user_id = entry[0]
+        rows = self.skills_by_user.get(user_id)
+        if rows is not None:
+            rows.discard(skill_row_id)
+            if not rows:
+                del self.skills_by_user[user_id]
+        return user_id
+
+    def remove_user(self, user_id: str) -> None:
+        for skill_row_id in list(self.skills_by_user.get(user_id, ())):
+            self.remove_skill(skill_row_id)
+        self.certs.pop(user_id, None)
+
+    def users(self) -> List[str]:
+        return sorted(set(self.skills_by_user) | set(self.certs))
+
+    def vector(self, user_id: str) -> Dict[Feature, float]:
+        """L2-normalized profile; repeated skills keep their highest weight"""
+        vector: Dict[Feature, float] = {}
+        for skill_row_id in self.skills_by_user.get(user_id, ()):
+            _, feature, weight = self.skills[skill_row_id]
+            if weight > vector.get(feature, 0.0):
+                vector[feature] = weight
+        for category in self.certs.get(user_id, ()):
+            vector[("cert", category)] = settings.SIMILARITY_CERT_WEIGHT
+        norm = sum(w * w for w in vector.values()) ** 0.5
+        return {feature: w / norm for feature, w in vector.items()} if norm else {}
+
+
+class _Matrix:
+    """
+    Normalized user profiles as a sparse users x features matrix
+
+    Stored twice as plain NumPy arrays: CSR (rows = users) to read one
+    user's vector, and CSC (columns = features) to score everyone against a
+    query vector in one bincount over the query's columns.
+    """
+
+    def __init__(self, vectors: Mapping[str, Mapping[Feature, float]]):
+        self.users: List[str] = list(vectors)
+        self.row_of: Dict[str, int] = {user_id: i for i, user_id in enumerate(self.users)}
+        self.features: List[Feature] = sorted({f for vector in vectors.values() for f in vector}, key=repr)
+        self.column_of: Dict[Feature, int] = {f: j for j, f in enumerate(self.features)}
+
+        lengths = np.fromiter((len(v) for v in vectors.values()), dtype=np.int64, count=len(self.users))
+        self.indptr = np.zeros(len(self.users) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        nnz = int(self.indptr[-1])
+        self.indices = np.fromiter(
+            (self.column_of[f] for v in vectors.values() for f in v), dtype=np.int32, count=nnz
+        )
+        self.data = np.fromiter((w for v in vectors.values() for w in v.values()), dtype=np.float32, count=nnz)
+
+        row_ids = np.repeat(np.arange(len(self.users), dtype=np.int32), lengths)
+        order = np.argsort(self.indices, kind="stable")
+        self.col_rows = row_ids[order]
+        self.col_data = self.data[order]
+        self.col_ptr = np.zeros(len(self.features) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=len(self.features)), out=self.col_ptr[1:])
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indptr[-1])
+
+    def vector(self, user_id: str) -> Dict[Feature, float]:
+        row = self.row_of[user_id]
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return {self.features[j]: float(w) for j, w in zip(self.indices[start:end], self.data[start:end])}
+
+    def scores(self, query: Mapping[Feature, float]) -> np.ndarray:
+        """Dot product of every row with `query` (cosine, rows being normalized)"""
+        rows, weights = [], []
+        for feature, weight in query.items():
+            column = self.column_of.get(feature)
+            if column is None:
+                continue
+            start, end = self.col_ptr[column], self.col_ptr[column + 1]
+            rows.append(self.col_rows[start:end])
+            weights.append(self.col_data[start:end] * weight)
+        if not rows:
+            return np.zeros(len(self.users), dtype=np.float64)
+        return np.bincount(np.concatenate(rows), weights=np.concatenate(weights), minlength=len(self.users))
+
+
+class SimilarityIndex:
+    """
+    Look-alike colleagues by cosine similarity of skill profiles.
+
+    Every user is a sparse vector over catalog skills (weighted by
+    proficiency and years of experience, see skill_feature) and
+    certification categories, L2-normalized and held in a precomputed
+    _Matrix; a query scores all users with vectorized NumPy and keeps the
+    top k with argpartition. Queries never touch the database.
+
+    Rebuilt at startup and every SIMILARITY_INDEX_REBUILD_INTERVAL seconds.
+    Between rebuilds the user-skills routes patch it: the changed user's
+    vector is recomputed from the raw rows kept in memory and held in a small
+    overlay that shadows the user's matrix row. Certification changes are
+    picked up by the next rebuild. Builds are single-flight, and writes that
+    land during a build are journaled and replayed into the new index's
+    overlay (see IndexBuilds).
+    """
+
+    def __init__(self, rebuild_interval: float):
+        self.rebuild_interval = rebuild_interval
+        self._profiles: Optional[_Profiles] = None
+        self._matrix: Optional[_Matrix] = None
+        # Users whose vector changed since the matrix was built ({} = removed)
+        self._overlay: Dict[str, Dict[Feature, float]] = {}
+        self._lock = threading.RLock()
+        self._builds = IndexBuilds(self._lock)
+        self._task: Optional[asyncio.Task] = None
+        self._built_at: Optional[float] = None
+        self._counters = {"builds": 0, "build_failures": 0, "updates": 0, "queries": 0}
+
+    @property
+    def ready(self) -> bool:
+        return self._matrix is not None
+
+    def ensure_ready(self) -> None:
+        """Build the index if there is none yet, or wait for the build in flight (blocking)"""
+        self._builds.ensure_built(lambda: self.ready, self.build)
+
+    def build(self) -> None:
+        """Read USER_SKILLS and USER_CERT categories and swap in a fresh matrix (blocking; one build at a time)"""
+        started = time.perf_counter()
+        try:
+            self._builds.run(self._read, self._install)
+        except Exception:
+            with self._lock:
+                self._counters["build_failures"] += 1
+            raise
+        matrix = self._matrix
+        logger.info(f"Similarity index built: {len(matrix.users)} users, {len(matrix.features)} "
+                    f"features, {matrix.nnz} entries in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def _read(self) -> Tuple[CatalogSnapshot, _Profiles, _Matrix]:
+        snapshot = skills_catalog.get()
+        skill_rows, cert_rows = with_session(self._fetch)
+        profiles = _Profiles()
+        for row in skill_rows:
+            profiles.put_skill(row["id"], row["user_id"], *skill_feature(row, snapshot))
+        for user_id, category in cert_rows:
+            profiles.certs.setdefault(user_id, set()).add(category.strip().lower())
+        matrix = _Matrix({user_id: profiles.vector(user_id) for user_id in profiles.users()})
+        return snapshot, profiles, matrix
+
+    def _install(self, built: Tuple[CatalogSnapshot, _Profiles, _Matrix], journal: List[Tuple[str, Any]]) -> None:
+        snapshot, profiles, matrix = built
+        # Writes made during the build go to the overlay of the new matrix
+        changed: Set[str] = set()
+        for op, value in journal:
+            changed |= self._apply(profiles, op, value, snapshot)
+        self._matrix = matrix
+        self._profiles = profiles
+        self._overlay = {user_id: profiles.vector(user_id) for user_id in changed}
+        self._built_at = time.monotonic()
+        self._counters["builds"] += 1
+
+    @staticmethod
+    def _apply(profiles: _Profiles, op: str, value: Any, snapshot: CatalogSnapshot) -> Set[str]:
+        """Apply one write to the raw profiles; returns the users whose vector changed"""
+        if op == "put":
+            previous = profiles.put_skill(value["id"], value["user_id"], *skill_feature(value, snapshot))
+            return {value["user_id"], previous} - {None}
+        if op == "remove":
+            user_id = profiles.remove_skill(value)
+            return {user_id} if user_id else set()
+        profiles.remove_user(value)
+        return {value}
+
+    def _write(self, op: str, values: List[Any]) -> None:
+        """
+        Apply committed writes; failures are logged, not raised (the write is committed)
+
+        Skill rows are mapped with the catalog snapshot in memory, even an
+        expired one; the catalog is only loaded when there is none at all.
+        """
+        try:
+            snapshot = (skills_catalog.current() or skills_catalog.get()) if op == "put" else None
+            with self._lock:
+                for value in values:
+                    self._builds.record((op, value))
+                    if self._profiles is not None:
+                        for user_id in self._apply(self._profiles, op, value, snapshot):
+                            self._overlay[user_id] = self._profiles.vector(user_id)
+                self._counters["updates"] += len(values)
+        except Exception as e:
+            logger.warning(f"Similarity index: could not apply {len(values)} writes ({op}), "
+                           f"left to the next rebuild: {str(e)}")
+
+    def put(self, items: Iterable[Any]) -> None:
+        """Re-profile the owners of created or updated skill rows (ORM objects or row dicts)"""
+        self._write("put", [_skill_row(item) for item in items])
+
+    def put_ids(self, db: Session, row_ids: List[int]) -> None:
+        """Re-profile after a bulk insert; failures are logged, not raised (the write is committed)"""
+        try:
+            rows = []
+            for chunk in chunked(row_ids, settings.DB2_IN_CLAUSE_CHUNK_SIZE):
+                rows.extend(db.query(UserSkill).filter(UserSkill.id.in_(chunk)).all())
+        except Exception as e:
+            logger.warning(f"Similarity index: could not apply {len(row_ids)} new skills, left to the next rebuild: {str(e)}")
+            return
+        self.put(rows)
+
+    def remove(self, skill_id: int) -> None:
+        """Drop a deleted skill row"""
+        self._write("remove", [skill_id])
+
+    def remove_user(self, user_id: str) -> None:
+        """Drop a deleted user"""
+        self._write("remove_user", [user_id])
+
+    def similar(self, user_id: str, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Users most similar to `user_id`, best first
+
+        Returns:
+            [{"user_id", "score", "shared_skills", "shared_cert_categories"}],
+            only users with a positive score; None when `user_id` has no profile
+        """
+        with self._lock:
+            self._counters["queries"] += 1
+            matrix, overlay = self._matrix, dict(self._overlay)
+
+        if user_id in overlay:
+            query = overlay[user_id]
+        elif user_id in matrix.row_of:
+            query = matrix.vector(user_id)
+        else:
+            return None
+        if not query:
+            return None
+
+        scores = matrix.scores(query)
+        # Overlaid users are scored from their current vector instead of their matrix row
+        shadowed = [matrix.row_of[u] for u in overlay if u in matrix.row_of]
+        scores[shadowed] = 0.0
+        if user_id in matrix.row_of:
+            scores[matrix.row_of[user_id]] = 0.0
+
+        candidates = []
+        k = min(limit, len(scores))
+        if k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates = [(float(scores[i]), matrix.users[i]) for i in top if scores[i] > 0]
+        for other, vector in overlay.items():
+            if other != user_id and vector:
+                score = sum(w * vector[f] for f, w in query.items() if f in vector)
+                if score > 0:
+                    candidates.append((score, other))
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+
+        results = []
+        for score, other in candidates[:limit]:
+            vector = overlay[other] if other in overlay else matrix.vector(other)
+            shared = [f for f in query if f in vector]
+            results.append({
+                "user_id": other,
+                "score": round(score, 4),
+                "shared_skills": sorted(f[1] for f in shared if f[0] == "skill"),
+                "shared_cert_categories": sorted(f[1] for f in shared if f[0] == "cert"),
+            })
+        return results
+
+    def stats(self) -> Dict:
+        matrix = self._matrix
+        return {
+            **self._counters,
+            "entries": len(matrix.users) if matrix else 0,
+            "features": len(matrix.features) if matrix else 0,
+            "nonzeros": matrix.nnz if matrix else 0,
+            "overlay": len(self._overlay),
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+        }
+
+    @staticmethod
+    def _fetch(db: Session) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+        columns = [getattr(UserSkill, f) for f in _SKILL_FIELDS]
+        skill_rows = [
+            dict(zip(_SKILL_FIELDS, row))
+            for row in db.query(*columns).yield_per(settings.DB2_IN_CLAUSE_CHUNK_SIZE)
+        ]
+        cert_rows = db.query(UserCert.user_id, UserCert.cert_cat).filter(
+            UserCert.cert_cat.isnot(None)
+        ).distinct().all()
+        return skill_rows, [(user_id, category) for user_id, category in cert_rows if category.strip()]
+
+    async def start(self) -> None:
+        """Build the index and start the periodic rebuild"""
+        try:
+            await run_in_threadpool(self.build)
+        except Exception as e:
+            # Not fatal: the endpoint builds on first use
+            logger.error(f"Similarity index build failed: {str(e)}")
+        if self.rebuild_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebuild_interval)
+            try:
+                await run_in_threadpool(self.build)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Similarity index rebuild failed, keeping current index: {str(e)}")
+
+
+similarity_index = SimilarityIndex(settings.SIMILARITY_INDEX_REBUILD_INTERVAL)
+register_cache("similarity_index", similarity_index.stats)
@@ -0,0 +1,146 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user_skills import UserSkill
+from app.models.users import User
+from app.services.expert_index import proficiency_rank
+from app.services.reportee_loader import chunked
+from app.services.skills_catalog import SKILL_FIELDS, TAXONOMY_FIELDS, skills_catalog
+
+logger = logging.getLogger(__name__)
+
+# Skills held by at most this many reportees are reported as bus-factor risks
+BUS_FACTOR_THRESHOLD = 1
+
+
+def _load_rows(db: Session, reportee_ids: List[str], skill_status: Optional[str]) -> List[Tuple]:
+    """
+    Reportees LEFT JOIN their USER_SKILLS rows
+
+    One query per DB2_IN_CLAUSE_CHUNK_SIZE reportees (a single query for any
+    normal team). Reportees without skills come back once with NULL skill
+    columns, so names arrive with the skills.
+    """
+    join_on = User.user_id == UserSkill.user_id
+    if skill_status:
+        join_on = and_(join_on, UserSkill.status == skill_status)
+    columns = [User.user_id, User.name, UserSkill.skill_id, UserSkill.proficiency_level] + [
+        getattr(UserSkill, f) for f in TAXONOMY_FIELDS
+    ]
+    rows: List[Tuple] = []
+    for chunk in chunked(reportee_ids, settings.DB2_IN_CLAUSE_CHUNK_SIZE):
+        rows.extend(
+            db.query(*columns).outerjoin(UserSkill, join_on).filter(User.user_id.in_(chunk)).all()
+        )
+    return rows
+
+
+def build_skill_matrix(
+    db: Session,
+    reportee_ids: List[str],
+    skill_status: Optional[str] = None,
+    all_skills: bool = False,
+) -> Dict[str, Any]:
+    """
+    Reportees x skills matrix of encoded proficiency levels, with aggregates
+
+    Rows follow `reportee_ids`; columns are catalog skills in skill_id order
+    (all of them with `all_skills`, else those held by someone on the team),
+    followed by skills that are not in the catalog, keyed by taxonomy path.
+    A cell is 0 when the reportee does not hold the skill, else the 1-based
+    rank of the level on EXPERT_PROFICIENCY_SCALE (unrecognized levels count
+    as 1); when a skill was recorded more than once the highest level wins.
+
+    Args:
+        db: Database session
+        reportee_ids: Team members (matrix rows)
+        skill_status: Only count skills with this status (None = any)
+        all_skills: Include catalog skills nobody on the team holds
+
+    Returns:
+        Columnar payload: {"users", "skills", "levels", "matrix", "aggregates"}
+    """
+    snapshot = skills_catalog.get()
+    rows = _load_rows(db, reportee_ids, skill_status)
+
+    names: Dict[str, Optional[str]] = {}
+    user_index = {user_id: i for i, user_id in enumerate(reportee_ids)}
+    column_of: Dict[Any, int] = {}
+    columns: List[Any] = []
+    if all_skills:
+        columns.extend(snapshot.ids)
+        column_of.update((skill_id, i) for i, skill_id in enumerate(snapshot.ids))
+    ranks: Dict[Any, int] = {}
+    cells_r: List[int] = []
+    cells_c: List[int] = []
+    cells_v: List[int] = []
+
+    for user_id, name, skill_id, level, *path in rows:
+        names[user_id] = name
+        if skill_id is None and all(value is None for value in path):
+            continue  # reportee without skills
+        if skill_id is None or skill_id not in snapshot.by_id:
+            skill_id = snapshot.by_path.get(tuple(path), tuple(path))
+        column = column_of.get(skill_id)
+        if column is None:
+            column = column_of[skill_id] = len(columns)
+            columns.append(skill_id)
+        rank = ranks.get(level)
+        if rank is None:
+            rank = ranks[level] = max(proficiency_rank(level), 1)
+        cells_r.append(user_index[user_id])
+        cells_c.append(column)
+        cells_v.append(rank)
+
+    matrix = np.zeros((len(reportee_ids), len(columns)), dtype=np.int8)
+    np.maximum.at(matrix, (np.asarray(cells_r, dtype=np.intp), np.asarray(cells_c, dtype=np.intp)),
+                  np.asarray(cells_v, dtype=np.int8))
+
+    # Catalog skills by skill_id, then uncatalogued paths
+    order = sorted(range(len(columns)), key=lambda i: (
+        (0, columns[i], ()) if isinstance(columns[i], int) else (1, 0, tuple(v or "" for v in columns[i]))
+    ))
+    matrix = matrix[:, order]
+    columns = [columns[i] for i in order]
+
+    held = matrix > 0
+    holders = held.sum(axis=0)
+    breadth = held.sum(axis=1)
+    coverage = np.round(holders / max(len(reportee_ids), 1), 4)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_level = np.where(holders > 0, np.round(matrix.sum(axis=0) / holders, 2), 0.0)
+
+    skills: Dict[str, List] = {f: [] for f in SKILL_FIELDS}
+    for column in columns:
+        if isinstance(column, int):
+            entry = snapshot.by_id[column]
+        else:
+            entry = dict(zip(TAXONOMY_FIELDS, column), skill_id=None)
+        for f in SKILL_FIELDS:
+            skills[f].append(entry[f])
+
+    return {
+        "users": {
+            "user_id": list(reportee_ids),
+            "name": [names.get(user_id) for user_id in reportee_ids],
+            "in_database": [user_id in names for user_id in reportee_ids],
+        },
+        "skills": skills,
+        "levels": list(settings.expert_proficiency_scale),
+        "matrix": matrix.tolist(),
+        "aggregates": {
+            "holders": holders.tolist(),
+            "coverage": coverage.tolist(),
+            "mean_level": mean_level.tolist(),
+            "bus_factor": {
+                "threshold": BUS_FACTOR_THRESHOLD,
+                "skills": np.flatnonzero(holders <= BUS_FACTOR_THRESHOLD).tolist(),
+            },
+            "breadth": breadth.tolist(),
+        },
+    }
@@ -0,0 +1,397 @@
+import asyncio
+import difflib
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.async_db import with_session
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.models.skills import Skill
+from app.models.user_skills import UserSkill
+
+logger = logging.getLogger(__name__)
+
+SKILL_FIELDS = ("skill_id", "platform", "segment", "product_portfolio", "speciality_area")
+# Catalog levels whose words are searchable by /api/skills/suggest
+TAXONOMY_FIELDS = ("platform", "segment", "product_portfolio", "speciality_area")
+_WORD = re.compile(r"\w+")
+# Minimum similarity for the typo-tolerant fallback (difflib ratio)
+FUZZY_CUTOFF = 0.75
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Case-folded words of a catalog value or query"""
+    return _WORD.findall(value.casefold()) if value else []
+
+
+def path_index(skills: Iterable[Dict[str, Any]]) -> Dict[Tuple, int]:
+    """Taxonomy path (TAXONOMY_FIELDS values) -> skill_id"""
+    return {tuple(s[f] for f in TAXONOMY_FIELDS): s["skill_id"] for s in skills}
+
+
+def skill_to_dict(skill: Any) -> Dict[str, Any]:
+    """Catalog entry for a Skill row (ORM object or row_writer dict)"""
+    if isinstance(skill, Mapping):
+        return {f: skill[f] for f in SKILL_FIELDS}
+    return {f: getattr(skill, f) for f in SKILL_FIELDS}
+
+
+def _name_key(value: Optional[str]) -> Tuple[bool, str]:
+    # Missing levels sort last instead of failing the comparison
+    return value is None, value or ""
+
+
+def build_tree(skills: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Nest skills as platform -> segment -> product_portfolio -> speciality_area, names sorted"""
+    nested: Dict = {}
+    for skill in skills:
+        nested.setdefault(skill["platform"], {}).setdefault(skill["segment"], {}).setdefault(
+            skill["product_portfolio"], []
+        ).append({"speciality_area": skill["speciality_area"], "skill_id": skill["skill_id"]})
+
+    def by_name(levels: Dict):
+        return sorted(levels.items(), key=lambda item: _name_key(item[0]))
+
+    return [
+        {
+            "platform": platform,
+            "segments": [
+                {
+                    "segment": segment,
+                    "product_portfolios": [
+                        {
+                            "product_portfolio": portfolio,
+                            "speciality_areas": sorted(
+                                areas, key=lambda a: (_name_key(a["speciality_area"]), a["skill_id"])
+                            ),
+                        }
+                        for portfolio, areas in by_name(portfolios)
+                    ],
+                }
+                for segment, portfolios in by_name(segments)
+            ],
+        }
+        for platform, segments in by_name(nested)
+    ]
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the SKILLS table.
+
+    A snapshot is never modified after construction; changes build a new one
+    that replaces the old with a single reference assignment, so readers on
+    any thread see either the old or the new catalog, never a mix. Entries
+    are shared between readers and must be treated as read-only.
+
+    The tree (with its serialized body and ETag) and the prefix index are
+    derived on first use, so a burst of single-skill writes only rebuilds
+    them once, for the snapshot that is actually read. Concurrent first uses
+    derive identical values, so there is no lock.
+    """
+
+    __slots__ = (
+        "skills", "ids", "by_id", "by_path", "loaded_at", "usage",
+        "_tree", "_body", "_etag", "_tokens", "_token_skills", "_fuzzy_keys",
+    )
+
+    def __init__(self, skills: Iterable[Dict[str, Any]], loaded_at: float, usage: Mapping[int, int] = None):
+        self.skills: Tuple[Dict[str, Any], ...] = tuple(sorted(skills, key=lambda s: s["skill_id"]))
+        self.ids: Tuple[int, ...] = tuple(s["skill_id"] for s in self.skills)
+        self.by_id: Dict[int, Dict[str, Any]] = {s["skill_id"]: s for s in self.skills}
+        # USER_SKILLS rows without SKILL_ID reference the catalog by taxonomy path
+        self.by_path: Dict[Tuple, int] = path_index(self.skills)
+        self.loaded_at = loaded_at
+        # USER_SKILLS rows per skill, for ranking suggestions
+        self.usage: Mapping[int, int] = usage or {}
+        self._tree: Optional[List[Dict[str, Any]]] = None
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._tokens: Optional[Tuple[str, ...]] = None
+        self._token_skills: Optional[Tuple[Tuple[int, ...], ...]] = None
+        self._fuzzy_keys: Dict[Tuple[int, str], Dict[str, List[int]]] = {}
+
+    @property
+    def tree(self) -> List[Dict[str, Any]]:
+        if self._tree is None:
+            self._tree = build_tree(self.skills)
+        return self._tree
+
+    @property
+    def body(self) -> bytes:
+        # Serialized once per snapshot; /api/skills/tree sends these bytes as-is
+        if self._body is None:
+            self._body = json.dumps(self.tree, separators=(",", ":")).encode()
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self._etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        return self._etag
+
+    @property
+    def tokens(self) -> Tuple[str, ...]:
+        """Sorted distinct words of the catalog (the prefix index)"""
+        if self._tokens is None:
+            self._index_tokens()
+        return self._tokens
+
+    @property
+    def token_skills(self) -> Tuple[Tuple[int, ...], ...]:
+        """Skills containing each word of `tokens`"""
+        if self._token_skills is None:
+            self._index_tokens()
+        return self._token_skills
+
+    def _index_tokens(self) -> None:
+        postings: Dict[str, Set[int]] = {}
+        for skill in self.skills:
+            for field in TAXONOMY_FIELDS:
+                for token in tokenize(skill[field]):
+                    postings.setdefault(token, set()).add(skill["skill_id"])
+        tokens = tuple(sorted(postings))
+        self._token_skills = tuple(tuple(postings[t]) for t in tokens)
+        self._tokens = tokens
+
+    def page(self, after: Optional[List], skip: int, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Slice one page in skill_id order, like pagination.paginate
+
+        Returns:
+            (items, has_more)
+        """
+        start = bisect_right(self.ids, after[0]) if after is not None else skip
+        return list(self.skills[start:start + limit]), start + limit < len(self.skills)
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """Skills with a word starting with `prefix` (binary search on the sorted words)"""
+        matches: Set[int] = set()
+        i = bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            matches.update(self.token_skills[i])
+            i += 1
+        return matches
+
+    def _fuzzy_matches(self, prefix: str) -> Set[int]:
+        """Skills with a word whose first len(prefix) characters are close to `prefix`"""
+        # Candidate word prefixes share the first letter (typos there are rare)
+        # and have the query's length; they map to positions in self.tokens.
+        # Memoized on first use; concurrent first uses build identical dicts, so no lock
+        memo_key = (len(prefix), prefix[0])
+        keys = self._fuzzy_keys.get(memo_key)
+        if keys is None:
+            keys = {}
+            for i in range(bisect_left(self.tokens, prefix[0]), len(self.tokens)):
+                token = self.tokens[i]
+                if not token.startswith(prefix[0]):
+                    break
+                keys.setdefault(token[:len(prefix)], []).append(i)
+            self._fuzzy_keys[memo_key] = keys
+        matches: Set[int] = set()
+        for key in difflib.get_close_matches(prefix, keys, n=5, cutoff=FUZZY_CUTOFF):
+            for i in keys[key]:
+                matches.update(self.token_skills[i])
+        return matches
+
+    def suggest(self, query: str, limit: int, fuzzy: bool = True) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Skills where every query word is a prefix of some catalog word, most used first
+
+        When nothing matches and `fuzzy` is set, each query word may instead
+        be a near miss (difflib similarity >= FUZZY_CUTOFF, same first letter)
+        of a word prefix.
+
+        Returns:
+            (skills, fuzzy_used)
+        """
+        words = tokenize(query)
+        if not words:
+            return [], False
+
+        matches = set.intersection(*(self._prefix_matches(w) for w in words))
+        fuzzy_used = False
+        if not matches and fuzzy:
+            matches = set.intersection(*(self._prefix_matches(w) or self._fuzzy_matches(w) for w in words))
+            fuzzy_used = bool(matches)
+
+        ranked = sorted(matches, key=lambda skill_id: (-self.usage.get(skill_id, 0), skill_id))
+        return [self.by_id[skill_id] for skill_id in ranked[:limit]], fuzzy_used
+
+
+class SkillsCatalog:
+    """
+    Process-wide cache of the skills catalog.
+
+    - Loaded at startup and reloaded every `ttl` seconds by a background task,
+      so changes made by other workers or directly in DB2 show up; request
+      handlers only read the current snapshot and never query the database.
+    - Writes through the skills routes patch the snapshot immediately
+      (copy-on-write). Writes that land while a load is reading the table
+      are journaled and replayed onto the loaded rows before they are
+      swapped in, including during the very first load.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self._journal: Optional[List] = None
+        self._loads_running = 0
+        self._task: Optional[asyncio.Task] = None
+        self._counters = {"loads": 0, "load_failures": 0, "updates": 0}
+
+    def get(self) -> CatalogSnapshot:
+        """
+        Current snapshot
+
+        Loads synchronously only when there is none yet, or when it expired
+        and the background refresher is not running (e.g. outside the app
+        lifespan). With ttl <= 0 a snapshot never expires. Blocking; call
+        from sync routes or a worker thread.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or self._expired(snapshot):
+            return self.load()
+        return snapshot
+
+    def _expired(self, snapshot: CatalogSnapshot) -> bool:
+        return self.ttl > 0 and self._task is None and time.monotonic() - snapshot.loaded_at > self.ttl
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """Current snapshot even if expired, never loading (None before the first load)"""
+        return self._snapshot
+
+    def load(self) -> CatalogSnapshot:
+        """Read the whole SKILLS table and swap it in (blocking)"""
+        with self._lock:
+            if self._loads_running == 0:
+                self._journal = []
+            # Overlapping loads share the journal, each replaying from where it started
+            replay_from = len(self._journal)
+            self._loads_running += 1
+        try:
+            skills, usage = with_session(self._fetch)
+        except Exception:
+            with self._lock:
+                self._finish_load()
+                self._counters["load_failures"] += 1
+            raise
+
+        with self._lock:
+            by_id = {skill["skill_id"]: skill for skill in skills}
+            for change in self._journal[replay_from:]:
+                change(by_id)
+            self._finish_load()
+            snapshot = CatalogSnapshot(by_id.values(), time.monotonic(), usage)
+            self._snapshot = snapshot
+            self._counters["loads"] += 1
+        return snapshot
+
+    def _finish_load(self) -> None:
+        self._loads_running -= 1
+        if self._loads_running == 0:
+            self._journal = None
+
+    def put(self, skill: Any) -> None:
+        """Add or replace one skill after a committed create/update"""
+        entry = skill_to_dict(skill)
+        self._update(lambda by_id: by_id.__setitem__(entry["skill_id"], entry))
+
+    def remove(self, skill_id: int) -> None:
+        """Drop one skill after a committed delete"""
+        self._update(lambda by_id: by_id.pop(skill_id, None))
+
+    def _update(self, change) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(change)
+            if self._snapshot is not None:
+                by_id = dict(self._snapshot.by_id)
+                change(by_id)
+                self._snapshot = CatalogSnapshot(by_id.values(), self._snapshot.loaded_at, self._snapshot.usage)
+            self._counters["updates"] += 1
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next get() reloads"""
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        return {
+            **self._counters,
+            "entries": len(snapshot.skills) if snapshot else 0,
+            "tokens": len(snapshot._tokens) if snapshot and snapshot._tokens is not None else 0,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None,
+            "etag": snapshot._etag if snapshot else None,
+            "ttl": self.ttl,
+        }
+
+    @staticmethod
+    def _fetch(db: Session) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
+        """Catalog rows and USER_SKILLS usage per skill"""
+        skills = [skill_to_dict(skill) for skill in db.query(Skill).all()]
+
+        usage: Counter = Counter()
+        for skill_id, count in db.query(UserSkill.skill_id, func.count()).filter(
+            UserSkill.skill_id.isnot(None)
+        ).group_by(UserSkill.skill_id).all():
+            usage[skill_id] += count
+
+        # Rows without SKILL_ID reference the catalog by their taxonomy values
+        by_path = path_index(skills)
+        path_columns = [getattr(UserSkill, f) for f in TAXONOMY_FIELDS]
+        for *path, count in db.query(*path_columns, func.count()).filter(
+            UserSkill.skill_id.is_(None)
+        ).group_by(*path_columns).all():
+            skill_id = by_path.get(tuple(path))
+            if skill_id is not None:
+                usage[skill_id] += count
+        return skills, dict(usage)
+
+    async def start(self) -> None:
+        """Load the catalog and start the TTL refresher"""
+        try:
+            await run_in_threadpool(self.load)
+            logger.info(f"Skills catalog loaded: {len(self._snapshot.skills)} skills")
+        except Exception as e:
+            # Not fatal: the first request retries the load
+            logger.error(f"Skills catalog load failed: {str(e)}")
+        if self.ttl > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl)
+            try:
+                await run_in_threadpool(self.load)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Skills catalog refresh failed, keeping current snapshot: {str(e)}")
+
+
+skills_catalog = SkillsCatalog(settings.SKILLS_CATALOG_TTL)
+register_cache("skills_catalog", skills_catalog.stats)
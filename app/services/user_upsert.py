@@ -0,0 +1,216 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import cast, exists, insert, inspect, literal, or_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.users import User
+from app.schemas.users import UserCreate
+from app.services.bulk_writer import validation_message
+from app.services.reportee_loader import chunked
+from app.services.row_writer import column_keys, final_table, is_db2
+
+logger = logging.getLogger(__name__)
+
+# Attributes written on registration, in MERGE column order
+USER_FIELDS = ("user_id", "email", "name", "user_type", "manager_id", "is_manager")
+
+
+def _columns() -> List:
+    keys = column_keys(User)
+    return [User.__table__.c[keys[attr]] for attr in USER_FIELDS]
+
+
+def _stored_columns() -> List[Tuple[str, Any]]:
+    """(ORM attribute name, table column) of every USERS column, as returned by upsert_user"""
+    return [(prop.key, prop.columns[0]) for prop in inspect(User).column_attrs]
+
+
+def find_user(db: Session, user_id: str, email: str) -> Optional[Dict[str, Any]]:
+    """The user registered under user_id, else the one registered with email (one query)"""
+    stored = _stored_columns()
+    matches = db.execute(
+        select(*(column for _, column in stored)).where(
+            or_(User.__table__.c.USER_ID == user_id, User.__table__.c.EMAIL == email)
+        ).limit(2)
+    ).all()
+    users = [{attr: value for (attr, _), value in zip(stored, row)} for row in matches]
+    for user in users:
+        if user["user_id"] == user_id:
+            return user
+    return users[0] if users else None
+
+
+def _insert_if_new(row: Dict[str, Any]):
+    """INSERT INTO USERS SELECT <row> WHERE NOT EXISTS (a user with the same USER_ID or EMAIL)"""
+    table = User.__table__
+    columns = _columns()
+    values = select(*(cast(literal(row[attr], type_=c.type), c.type) for attr, c in zip(USER_FIELDS, columns))).where(
+        ~exists().where(or_(table.c.USER_ID == row["user_id"], table.c.EMAIL == row["email"]))
+    )
+    return insert(table).from_select(columns, values)
+
+
+def _merge_db2(db: Session, rows: Sequence[Dict[str, Any]]) -> int:
+    """
+    MERGE INTO USERS USING (VALUES ...) ON USER_ID or EMAIL
+    WHEN NOT MATCHED THEN INSERT ... ELSE IGNORE
+
+    Users that already exist (by ID or email) are left untouched.
+    Returns the number of rows inserted.
+    """
+    dialect = db.get_bind().dialect
+    preparer = dialect.identifier_preparer
+    columns = _columns()
+    names = [preparer.quote(c.name) for c in columns]
+    user_id, email = names[0], names[1]
+    casts = ", ".join(f"CAST(? AS {dialect.type_compiler_instance.process(c.type)})" for c in columns)
+    sql = (
+        f"MERGE INTO {preparer.format_table(User.__table__)} AS T "
+        f"USING (VALUES {', '.join(f'({casts})' for _ in rows)}) AS S ({', '.join(names)}) "
+        f"ON T.{user_id} = S.{user_id} OR T.{email} = S.{email} "
+        f"WHEN NOT MATCHED THEN INSERT ({', '.join(names)}) VALUES ({', '.join('S.' + n for n in names)}) "
+        f"ELSE IGNORE"
+    )
+
+    processors = [c.type.dialect_impl(dialect).bind_processor(dialect) for c in columns]
+    params = tuple(
+        processor(row[attr]) if processor else row[attr]
+        for row in rows
+        for attr, processor in zip(USER_FIELDS, processors)
+    )
+    return db.connection().exec_driver_sql(sql, params).rowcount
+
+
+def _insert_missing(db: Session, rows: Sequence[Dict[str, Any]]) -> int:
+    """Portable equivalent of _merge_db2: INSERT ... SELECT ... WHERE NOT EXISTS, one row at a time"""
+    return sum(db.execute(_insert_if_new(row)).rowcount for row in rows)
+
+
+def merge_users(db: Session, rows: Sequence[Dict[str, Any]]) -> int:
+    """
+    Insert the users that do not exist yet, by user_id or email, in one
+    statement on DB2. Does not commit.
+
+    Args:
+        db: Database session
+        rows: Validated UserCreate dicts with unique user_id and email
+
+    Returns:
+        Number of users inserted
+    """
+    if not rows:
+        return 0
+    if is_db2(db):
+        return _merge_db2(db, rows)
+    return _insert_missing(db, rows)
+
+
+def upsert_user(db: Session, data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """
+    Register a user unless one exists with the same user_id or email
+
+    A returning user (every login) costs one lookup. A first login runs one
+    `SELECT ... FROM FINAL TABLE (INSERT ... SELECT ... WHERE NOT EXISTS)`,
+    which returns the stored row; MERGE cannot be wrapped in FINAL TABLE on
+    DB2 for LUW, hence the lookup first. The insert is not retried: when a
+    concurrent login registered the user in between, the statement inserts
+    nothing (or, if both ran before either committed, hits the unique key
+    and is rolled back) and the other login's row is read instead.
+
+    Args:
+        db: Database session
+        data: UserCreate dict
+
+    Returns:
+        (user, created): the user keyed by ORM attribute name, and whether
+        this call inserted it
+    """
+    existing = find_user(db, data["user_id"], data["email"])
+    if existing is not None:
+        return existing, False
+
+    stored = _stored_columns()
+    columns = [column for _, column in stored]
+    try:
+        stmt = _insert_if_new(data)
+        if is_db2(db):
+            rows = final_table(db, stmt, columns)
+        else:
+            rows = db.execute(stmt.returning(*columns)).all()
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        logger.info(f"Concurrent registration of {data['user_id']}: {str(e)}")
+        rows = []
+
+    if rows:
+        return {attr: value for (attr, _), value in zip(stored, rows[0])}, True
+    return find_user(db, data["user_id"], data["email"]), False
+
+
+def import_users(db: Session, items: Sequence[Any]) -> Dict:
+    """
+    Insert users in batches of USER_IMPORT_BATCH_SIZE, skipping existing ones
+
+    Each batch is one MERGE and one commit. If a batch fails (e.g. MANAGER_ID
+    names a user that is not registered yet), its rows are retried one by
+    one in savepoints and the failures reported. Send managers before their
+    reports so manager IDs resolve.
+
+    Args:
+        db: Database session
+        items: Raw UserCreate objects
+
+    Returns:
+        {"received", "inserted", "existing", "error_count", "errors": [{"index", "error"}]}
+    """
+    errors: List[Dict] = []
+    valid: List[Tuple[int, Dict]] = []
+    seen_ids, seen_emails = set(), set()
+
+    for index, raw in enumerate(items):
+        if not isinstance(raw, dict):
+            errors.append({"index": index, "error": "item must be an object"})
+            continue
+        try:
+            data = UserCreate(**raw).dict()
+        except ValidationError as e:
+            errors.append({"index": index, "error": validation_message(e)})
+            continue
+        if data["user_id"] in seen_ids or data["email"] in seen_emails:
+            errors.append({"index": index, "error": "duplicate user_id or email in request"})
+            continue
+        seen_ids.add(data["user_id"])
+        seen_emails.add(data["email"])
+        valid.append((index, data))
+
+    inserted = 0
+    failed = 0
+    for batch in chunked(valid, settings.USER_IMPORT_BATCH_SIZE):
+        try:
+            inserted += merge_users(db, [data for _, data in batch])
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"User import batch of {len(batch)} failed, retrying row by row: {str(e)}")
+            for index, data in batch:
+                try:
+                    with db.begin_nested():
+                        inserted += merge_users(db, [data])
+                except SQLAlchemyError as row_error:
+                    failed += 1
+                    errors.append({"index": index, "error": str(getattr(row_error, "orig", None) or row_error)})
+            db.commit()
+
+    errors.sort(key=lambda e: e["index"])
+    return {
+        "received": len(items),
+        "inserted": inserted,
+        "existing": len(valid) - inserted - failed,
+        "error_count": len(errors),
+        "errors": errors,
+    }
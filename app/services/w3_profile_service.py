@@ -1,20 +1,85 @@
 import httpx
 import logging
-from typing import List, Optional, Dict
+import time
+from typing import List, Optional, Dict, Tuple
 from fastapi import HTTPException
+from app.core.config import settings
+from app.core.metrics import W3_REQUEST_SECONDS, W3_TIMEOUTS, register_cache
+from app.core.server_timing import record_timing
+from app.services.profile_cache import ProfileCache
 
 logger = logging.getLogger(__name__)
 
 class W3ProfileService:
     """Service to interact with IBM W3 Unified Profile API"""
     
-    BASE_URL = "https://w3-unified-profile-api.ibm.com/v3/profiles"
-    TIMEOUT = 30.0  # seconds
+    BASE_URL = settings.W3_PROFILE_API_URL
     
-    @staticmethod
-    async def get_user_profile(user_id: str) -> Optional[Dict]:
+    # One long-lived client per process so connections (and their TLS
+    # sessions) are kept alive and reused across requests
+    _client: Optional[httpx.AsyncClient] = None
+    
+    # Shared profile cache; dashboard loads hit several team endpoints for the same manager
+    cache = ProfileCache(
+        ttl=settings.W3_PROFILE_CACHE_TTL,
+        stale_ttl=settings.W3_PROFILE_CACHE_STALE_TTL,
+        negative_ttl=settings.W3_PROFILE_CACHE_NEGATIVE_TTL,
+        max_entries=settings.W3_PROFILE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.W3_PROFILE_CACHE_MAX_BYTES,
+    )
+    
+    @classmethod
+    def _build_client(cls) -> httpx.AsyncClient:
+        """Create the pooled HTTP client from settings"""
+        http2 = settings.W3_HTTP2_ENABLED
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("W3_HTTP2_ENABLED is set but the 'h2' package is not installed; using HTTP/1.1")
+                http2 = False
+        
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(
+                connect=settings.W3_HTTP_CONNECT_TIMEOUT,
+                read=settings.W3_HTTP_READ_TIMEOUT,
+                write=settings.W3_HTTP_READ_TIMEOUT,
+                pool=settings.W3_HTTP_POOL_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.W3_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.W3_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.W3_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    
+    @classmethod
+    async def startup(cls) -> None:
+        """Open the shared client (called from the application lifespan)"""
+        if cls._client is None or cls._client.is_closed:
+            cls._client = cls._build_client()
+            logger.info("W3 profile HTTP client started")
+    
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close the shared client and release pooled connections"""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+            logger.info("W3 profile HTTP client closed")
+    
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """Return the shared client, creating it if the lifespan has not run (e.g. scripts)"""
+        if cls._client is None or cls._client.is_closed:
+            cls._client = cls._build_client()
+        return cls._client
+    
+    @classmethod
+    async def get_user_profile(cls, user_id: str) -> Optional[Dict]:
         """
-        Fetch user profile from W3 API
+        Fetch user profile from W3 API, served from the profile cache when possible
         
         Args:
             user_id: User ID or email
@@ -22,27 +87,60 @@ class W3ProfileService:
         Returns:
             User profile data or None if not found
         """
-        url = f"{W3ProfileService.BASE_URL}/{user_id}/profile_combined"
+        if not settings.W3_PROFILE_CACHE_ENABLED:
+            return await cls.fetch_user_profile(user_id)
+        return await cls.cache.get(user_id, lambda: cls._request_profile(user_id))
+    
+    @classmethod
+    async def fetch_user_profile(cls, user_id: str) -> Optional[Dict]:
+        """
+        Fetch user profile from W3 API, bypassing the cache
+        
+        Args:
+            user_id: User ID or email
+            
+        Returns:
+            User profile data or None if not found
+        """
+        profile, _ = await cls._request_profile(user_id)
+        return profile
+    
+    @classmethod
+    async def _request_profile(cls, user_id: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Perform the profile_combined call
+        
+        Returns:
+            (profile data or None, whether the result may be cached)
+        """
+        url = f"{cls.BASE_URL}/{user_id}/profile_combined"
+        started = time.perf_counter()
         
         try:
-            async with httpx.AsyncClient(timeout=W3ProfileService.TIMEOUT) as client:
-                response = await client.get(url)
+            try:
+                response = await cls.get_client().get(url)
+            finally:
+                record_timing("w3", (time.perf_counter() - started) * 1000)
+            W3_REQUEST_SECONDS.observe(time.perf_counter() - started, status=str(response.status_code))
+            
+            if response.status_code == 200:
+                return response.json(), True
+            elif response.status_code == 404:
+                logger.warning(f"User {user_id} not found in W3 API")
+                return None, True
+            else:
+                logger.error(f"W3 API error for user {user_id}: {response.status_code}")
+                return None, False
                 
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    logger.warning(f"User {user_id} not found in W3 API")
-                    return None
-                else:
-                    logger.error(f"W3 API error for user {user_id}: {response.status_code}")
-                    return None
-                    
         except httpx.TimeoutException:
+            W3_TIMEOUTS.inc()
+            W3_REQUEST_SECONDS.observe(time.perf_counter() - started, status="timeout")
             logger.error(f"Timeout fetching profile for user {user_id}")
             raise HTTPException(status_code=504, detail="External API timeout")
         except Exception as e:
+            W3_REQUEST_SECONDS.observe(time.perf_counter() - started, status="error")
             logger.error(f"Error fetching W3 profile for {user_id}: {str(e)}")
-            return None
+            return None, False
     
     @staticmethod
     def extract_reportees(profile_data: Dict) -> List[str]:
@@ -96,3 +194,6 @@ class W3ProfileService:
         except Exception as e:
             logger.error(f"Error extracting manager info: {str(e)}")
             return {}
+
+
+register_cache("w3_profile", W3ProfileService.cache.stats)
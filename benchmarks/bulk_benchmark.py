@@ -0,0 +1,109 @@
+"""
+Benchmark: one-at-a-time creates vs the bulk create path.
+
+Inserts the same USER_SKILLS rows into a scratch SQLite copy of the schema
+(see index_benchmark.py) twice: once the way POST /api/user-skills/ does it
+(add, commit, refresh per row) and once through `bulk_create`, which
+validates every item and inserts them with multi-row statements that return
+the generated IDs. `--latency-ms` adds a simulated network round trip to
+every statement, which is where the difference shows against a remote DB2.
+
+    python benchmarks/bulk_benchmark.py --items 500 --latency-ms 1
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models import User, UserSkill  # noqa: E402
+from app.models.manager_emp import ManagerEmp  # noqa: E402,F401  (mapper referenced by User)
+from app.schemas.user_skills import UserSkillCreate  # noqa: E402
+from app.services.bulk_writer import bulk_create  # noqa: E402
+from index_benchmark import build_engine  # noqa: E402
+
+USER_ID = "U0000001"
+
+
+def payload(count: int):
+    return [
+        {
+            "user_id": USER_ID,
+            "proficiency_level": "Expert",
+            "platform": f"P{i % 13}",
+            "segment": "Segment",
+            "product_portfolio": "Portfolio",
+            "speciality_area": "Area",
+            "product_line": "Line",
+            "skill_type": "primary",
+            "yoe": str(i % 20),
+        }
+        for i in range(count)
+    ]
+
+
+def single_rows(session_factory, items) -> float:
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        for raw in items:
+            new_item = UserSkill(**UserSkillCreate(**raw).dict())
+            db.add(new_item)
+            db.commit()
+            db.refresh(new_item)
+        return time.perf_counter() - started
+    finally:
+        db.close()
+
+
+def bulk(session_factory, items) -> float:
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        result = bulk_create(db, UserSkill, UserSkillCreate, items, {"user_id": USER_ID})
+        elapsed = time.perf_counter() - started
+        assert result["created_count"] == len(items), result["errors"][:3]
+        return elapsed
+    finally:
+        db.close()
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = build_engine(args.db)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{"USER_ID": USER_ID, "NAME": "Bench", "EMAIL": "bench@example.com"}])
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def round_trip(conn, cursor, statement, parameters, context, executemany):
+        statements["count"] += 1
+        if args.latency_ms:
+            time.sleep(args.latency_ms / 1000)
+
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    items = payload(args.items)
+
+    print(f"{args.items} items, simulated round trip {args.latency_ms}ms\n")
+    print(f"{'path':<12} {'seconds':>9} {'rows/s':>10} {'statements':>11}")
+    for label, run in (("single", single_rows), ("bulk", bulk)):
+        statements["count"] = 0
+        elapsed = run(session_factory, items)
+        print(f"{label:<12} {elapsed:9.3f} {args.items / elapsed:10.0f} {statements['count']:>11}")
+
+    engine.dispose()
+    for path in (args.db, f"{args.db}.fsq"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--db", default="/tmp/bulk_benchmark.sqlite")
+    main(parser.parse_args())
@@ -0,0 +1,115 @@
+"""
+Benchmark: expert finder on the in-memory inverted index vs the equivalent SQL.
+
+Seeds USER_SKILLS in a scratch SQLite copy of the schema (see
+index_benchmark.py), builds the ExpertIndex from it, then times the same
+searches through ExpertIndex.search and as a filtered SELECT over
+USER_SKILLS (what a database-backed finder would run before ranking).
+
+    python benchmarks/expert_index_benchmark.py --users 20000 --skills-per-user 8
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.models import User, UserSkill  # noqa: E402
+from app.models.manager_emp import ManagerEmp  # noqa: E402,F401  (mapper referenced by User)
+from app.services.expert_index import ExpertIndex  # noqa: E402
+from index_benchmark import build_engine  # noqa: E402
+
+PLATFORMS = [f"Platform {i}" for i in range(12)]
+AREAS = [f"Area {i}" for i in range(60)]
+LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+QUERIES = (
+    ("platform", {"platform": "Platform 3"}),
+    ("platform+area", {"platform": "Platform 3", "speciality_area": "Area 7"}),
+    ("platform+area+level", {"platform": "Platform 3", "speciality_area": "Area 7", "proficiency_level": "Expert"}),
+)
+
+
+def seed(engine, users: int, skills_per_user: int) -> None:
+    rng = random.Random(42)
+    user_ids = [f"U{i:07d}" for i in range(users)]
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"USER_ID": uid, "NAME": uid, "EMAIL": f"{uid.lower()}@example.com"} for uid in user_ids
+        ])
+        rows = [
+            {
+                "USER_ID": uid,
+                "PLATFORM": rng.choice(PLATFORMS),
+                "SEGMENT": "Segment",
+                "PRODUCT_PORTFOLIO": "Portfolio",
+                "SPECIALITY_AREA": rng.choice(AREAS),
+                "PRODUCT_LINE": "Line",
+                "PROFICIENCY_LEVEL": rng.choice(LEVELS),
+                "YOE": str(rng.randrange(0, 20)),
+                "STATUS": "approved",
+            }
+            for uid in user_ids for _ in range(skills_per_user)
+        ]
+        for start in range(0, len(rows), 10000):
+            conn.execute(insert(UserSkill.__table__), rows[start:start + 10000])
+
+
+def sql_search(session_factory, criteria) -> None:
+    db = session_factory()
+    try:
+        stmt = select(UserSkill.id, UserSkill.user_id, UserSkill.proficiency_level, UserSkill.yoe)
+        for field, value in criteria.items():
+            stmt = stmt.where(func.lower(getattr(UserSkill, field)) == value.lower())
+        db.execute(stmt).all()
+    finally:
+        db.close()
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = build_engine(args.db)
+    print(f"Seeding {args.users} users x {args.skills_per_user} skills...")
+    seed(engine, args.users, args.skills_per_user)
+
+    session_factory = sessionmaker(bind=engine)
+    database.SessionLocal = session_factory
+    index = ExpertIndex(rebuild_interval=0)
+    build_ms = median_ms(index.build, 1)
+    print(f"Index build: {build_ms:.0f}ms, {index.stats()['terms']} terms\n")
+
+    print(f"{'query':<22} {'matches':>8} {'index p50':>11} {'sql p50':>10} {'speedup':>8}")
+    for label, criteria in QUERIES:
+        matches = index.search(criteria, limit=20)["total"]
+        index_ms = median_ms(lambda: index.search(criteria, limit=20), args.repeat)
+        sql_ms = median_ms(lambda: sql_search(session_factory, criteria), args.repeat)
+        print(f"{label:<22} {matches:>8} {index_ms:9.3f}ms {sql_ms:8.3f}ms {sql_ms / max(index_ms, 1e-6):7.1f}x")
+
+    engine.dispose()
+    for path in (args.db, f"{args.db}.fsq"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--skills-per-user", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--db", default="/tmp/expert_index_benchmark.sqlite")
+    main(parser.parse_args())
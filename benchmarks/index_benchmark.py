@@ -0,0 +1,151 @@
+"""
+Before/after benchmark for the USER_ID and REQUEST(MANAGER_ID, STATUS) indexes.
+
+Builds the schema from the models in a scratch SQLite database (the
+FSQ87086 schema is attached), seeds it, drops the indexes added by migration
+c8a4f2d61e57, then times the hot per-user lookups and the manager approval
+queue and prints their query plans; the indexes are then created and the
+same queries measured again.
+
+SQLite stands in for DB2 so the script runs anywhere; for DB2 plans, run
+the printed statements through db2expln / EXPLAIN PLAN on a copy of the data.
+
+    python benchmarks/index_benchmark.py --users 5000 --rows-per-user 10
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, insert, select, text  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import Asset, Project, Request, User, UserCert, UserSkill  # noqa: E402
+
+INDEXES = (
+    (Asset, "ix_FSQ87086_ASSETS_USER_ID"),
+    (Project, "ix_FSQ87086_PROJECTS_USER_ID"),
+    (UserCert, "ix_FSQ87086_USER_CERT_USER_ID"),
+    (UserSkill, "ix_FSQ87086_USER_SKILLS_USER_ID"),
+    (Request, "ix_FSQ87086_REQUEST_MANAGER_ID_STATUS"),
+)
+
+
+def build_engine(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_conn, connection_record):
+        dbapi_conn.execute(f"ATTACH DATABASE '{path}.fsq' AS FSQ87086")
+
+    if os.path.exists(f"{path}.fsq"):
+        os.remove(f"{path}.fsq")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def seed(engine, users: int, rows_per_user: int, batch: int = 5000) -> None:
+    rng = random.Random(42)
+    user_ids = [f"U{i:07d}" for i in range(users)]
+    managers = user_ids[: max(1, users // 20)]
+
+    def flush(table, rows):
+        with engine.begin() as conn:
+            for start in range(0, len(rows), batch):
+                conn.execute(insert(table), rows[start:start + batch])
+
+    flush(User.__table__, [
+        {"USER_ID": uid, "NAME": f"User {uid}", "EMAIL": f"{uid.lower()}@example.com", "USER_TYPE": "employee"}
+        for uid in user_ids
+    ])
+    per_user = [(uid, n) for uid in user_ids for n in range(rows_per_user)]
+    flush(Asset.__table__, [{"USER_ID": uid, "ASSET_NAME": f"asset {n}", "STATUS": "approved"} for uid, n in per_user])
+    flush(Project.__table__, [{"USER_ID": uid, "PROJECT_NAME": f"project {n}", "STATUS": "approved"} for uid, n in per_user])
+    flush(UserCert.__table__, [{"USER_ID": uid, "CERT_NAME": f"cert {n}", "STATUS": "approved"} for uid, n in per_user])
+    flush(UserSkill.__table__, [{"USER_ID": uid, "PLATFORM": f"P{n % 7}", "STATUS": "approved"} for uid, n in per_user])
+    flush(Request.__table__, [
+        {
+            "USER_ID": uid,
+            "MANAGER_ID": rng.choice(managers),
+            "STATUS": "pending" if rng.random() < 0.1 else "approved",
+            "SECTION_TYPE": "skills",
+        }
+        for uid, n in per_user
+    ])
+
+
+def statements(sample_user: str, sample_manager: str):
+    for model in (Asset, Project, UserCert, UserSkill):
+        yield f"{model.__tablename__} by USER_ID", select(model.__table__).where(model.__table__.c.USER_ID == sample_user)
+    request = Request.__table__
+    yield "REQUEST pending queue", select(request).where(
+        request.c.MANAGER_ID == sample_manager, request.c.STATUS == "pending"
+    )
+
+
+def measure(engine, users: int, iterations: int):
+    rng = random.Random(7)
+    results = {}
+    with engine.connect() as conn:
+        for label, _ in statements("U0000000", "U0000000"):
+            timings = []
+            plan = None
+            for _ in range(iterations):
+                uid = f"U{rng.randrange(users):07d}"
+                manager = f"U{rng.randrange(max(1, users // 20)):07d}"
+                stmt = dict(statements(uid, manager))[label]
+                started = time.perf_counter()
+                conn.execute(stmt).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+                if plan is None:
+                    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+                    plan = "; ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+            timings.sort()
+            results[label] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1], plan)
+    return results
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = build_engine(args.db)
+    print(f"Seeding {args.users} users x {args.rows_per_user} rows per table...")
+    seed(engine, args.users, args.rows_per_user)
+
+    indexes = [next(i for i in model.__table__.indexes if i.name == name) for model, name in INDEXES]
+    for index in indexes:
+        index.drop(engine)
+    before = measure(engine, args.users, args.iterations)
+
+    for index in indexes:
+        index.create(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    after = measure(engine, args.users, args.iterations)
+
+    print(f"\n{'query':<28} {'before p50':>11} {'p95':>9} {'after p50':>11} {'p95':>9} {'speedup':>8}")
+    for label in before:
+        b50, b95, _ = before[label]
+        a50, a95, _ = after[label]
+        print(f"{label:<28} {b50:9.3f}ms {b95:7.3f}ms {a50:9.3f}ms {a95:7.3f}ms {b50 / max(a50, 1e-6):7.1f}x")
+    print("\nPlans:")
+    for label in before:
+        print(f"  {label}\n    before: {before[label][2]}\n    after:  {after[label][2]}")
+
+    engine.dispose()
+    for path in (args.db, f"{args.db}.fsq"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--rows-per-user", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--db", default="/tmp/index_benchmark.sqlite")
+    main(parser.parse_args())
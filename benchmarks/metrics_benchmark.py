@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: per-request cost of metrics recording.
+
+Drives a minimal ASGI app directly (no server, no network) with and without
+MetricsMiddleware and reports the added cost per request, plus the raw cost
+of a histogram observation and of rendering /metrics.
+
+    python benchmarks/metrics_benchmark.py --requests 50000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.metrics import REGISTRY, Histogram, MetricsMiddleware  # noqa: E402
+
+
+class _Route:
+    path = "/api/users/{user_id}"
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = _Route()
+    scope["path_params"] = {"user_id": "123"}
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def drive(app, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/api/users/123"}
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+def main(args: argparse.Namespace) -> None:
+    histogram = Histogram("bench_seconds", "benchmark", ("route",))
+    started = time.perf_counter()
+    for i in range(args.requests):
+        histogram.observe(i % 100 / 1000, route="/api/users/{user_id}")
+    observe_ns = (time.perf_counter() - started) / args.requests * 1e9
+
+    bare = asyncio.run(drive(endpoint, args.requests))
+    instrumented = asyncio.run(drive(MetricsMiddleware(endpoint), args.requests))
+    overhead_us = (instrumented - bare) / args.requests * 1e6
+
+    started = time.perf_counter()
+    for _ in range(args.renders):
+        body = REGISTRY.render()
+    render_ms = (time.perf_counter() - started) / args.renders * 1000
+
+    print(f"histogram observe:        {observe_ns:8.0f} ns")
+    print(f"request without metrics:  {bare / args.requests * 1e6:8.2f} us")
+    print(f"request with metrics:     {instrumented / args.requests * 1e6:8.2f} us")
+    print(f"middleware overhead:      {overhead_us:8.2f} us per request")
+    print(f"/metrics render:          {render_ms:8.2f} ms ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--renders", type=int, default=100)
+    main(parser.parse_args())
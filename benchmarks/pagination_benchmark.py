@@ -0,0 +1,93 @@
+"""
+Benchmark: offset vs keyset (cursor) pagination at increasing page depth.
+
+Seeds USER_SKILLS in a scratch SQLite copy of the schema (see
+index_benchmark.py), then fetches pages 1, 10, 100 and 1000 of one user's
+rows with `skip` and with the cursor returned by the previous page, using
+the same `paginate` helper as the API.
+
+    python benchmarks/pagination_benchmark.py --rows 60000 --limit 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.pagination import decode_cursor, paginate  # noqa: E402
+from app.models import User, UserSkill  # noqa: E402
+from app.models.manager_emp import ManagerEmp  # noqa: E402,F401  (mapper referenced by User)
+from index_benchmark import build_engine  # noqa: E402
+
+USER_ID = "U0000001"
+
+
+def seed(engine, rows: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{"USER_ID": USER_ID, "NAME": "Bench", "EMAIL": "bench@example.com"}])
+        for start in range(0, rows, 10000):
+            conn.execute(insert(UserSkill.__table__), [
+                {"USER_ID": USER_ID, "PLATFORM": f"P{i % 13}", "STATUS": "approved"}
+                for i in range(start, min(rows, start + 10000))
+            ])
+
+
+def time_page(session_factory, limit: int, skip: int = 0, after=None, repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            query = db.query(UserSkill).filter(UserSkill.user_id == USER_ID)
+            started = time.perf_counter()
+            paginate(query, UserSkill, after, skip, limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+    return statistics.median(timings)
+
+
+def cursor_before_page(session_factory, limit: int, page: int):
+    """Cursor pointing just before `page` (what a client holds after page - 1)"""
+    if page == 1:
+        return None
+    db = session_factory()
+    try:
+        query = db.query(UserSkill).filter(UserSkill.user_id == USER_ID)
+        _, cursor = paginate(query, UserSkill, None, (page - 1) * limit - 1, 1)
+        return decode_cursor(cursor, 1)
+    finally:
+        db.close()
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = build_engine(args.db)
+    print(f"Seeding {args.rows} USER_SKILLS rows for one user...")
+    seed(engine, args.rows)
+    session_factory = sessionmaker(bind=engine)
+
+    print(f"\n{'page':>6} {'offset p50':>12} {'cursor p50':>12}")
+    for page in args.pages:
+        if (page - 1) * args.limit >= args.rows:
+            continue
+        offset_ms = time_page(session_factory, args.limit, skip=(page - 1) * args.limit)
+        cursor_ms = time_page(session_factory, args.limit, after=cursor_before_page(session_factory, args.limit, page))
+        print(f"{page:>6} {offset_ms:10.3f}ms {cursor_ms:10.3f}ms")
+
+    engine.dispose()
+    for path in (args.db, f"{args.db}.fsq"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=60000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--db", default="/tmp/pagination_benchmark.sqlite")
+    main(parser.parse_args())
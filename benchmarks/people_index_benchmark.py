@@ -0,0 +1,114 @@
+"""
+Benchmark: people typeahead on the in-memory index vs the equivalent SQL.
+
+Seeds USERS in a scratch SQLite copy of the schema (see index_benchmark.py),
+builds the PeopleIndex from it, then replays keystroke sequences (every
+prefix of a query, as a user types it) through PeopleIndex.search and as a
+LIKE query over NAME and EMAIL (what a database-backed search would run).
+
+    python benchmarks/people_index_benchmark.py --users 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, or_, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.models import User  # noqa: E402
+from app.models.manager_emp import ManagerEmp  # noqa: E402,F401  (mapper referenced by User)
+from app.services.people_index import PeopleIndex  # noqa: E402
+from index_benchmark import build_engine  # noqa: E402
+
+FIRST = ["James", "Mary", "Priya", "Wei", "Carlos", "Aisha", "Lukas", "Yuki", "Olga", "Tunde",
+         "Anil", "Sofia", "Kenji", "Fatima", "Liam", "Chloe", "Ravi", "Ingrid", "Omar", "Mei"]
+LAST = ["Smith", "Kumar", "Chen", "Garcia", "Okafor", "Schmidt", "Tanaka", "Ivanova", "Haddad",
+        "Nguyen", "Patel", "Rossi", "Kowalski", "Silva", "Dubois", "Murphy", "Sato", "Ali"]
+QUERIES = ("priya kum", "chen", "sofia.rossi", "t")
+
+
+def seed(engine, users: int) -> None:
+    rng = random.Random(42)
+    rows = []
+    for i in range(users):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        rows.append({
+            "USER_ID": f"U{i:07d}",
+            "NAME": f"{first} {last}",
+            "EMAIL": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "USER_TYPE": "employee",
+        })
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 10000):
+            conn.execute(insert(User.__table__), rows[start:start + 10000])
+
+
+def sql_search(session_factory, query: str, limit: int) -> None:
+    db = session_factory()
+    try:
+        stmt = select(User.user_id, User.name, User.email, User.user_type)
+        for word in query.replace(".", " ").split():
+            pattern = f"%{word.lower()}%"
+            stmt = stmt.where(or_(func.lower(User.name).like(pattern), func.lower(User.email).like(pattern)))
+        db.execute(stmt.order_by(User.name).limit(limit)).all()
+    finally:
+        db.close()
+
+
+def keystrokes(query: str):
+    return [query[:i] for i in range(1, len(query) + 1) if query[:i].strip()]
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = build_engine(args.db)
+    print(f"Seeding {args.users} users...")
+    seed(engine, args.users)
+
+    session_factory = sessionmaker(bind=engine)
+    database.SessionLocal = session_factory
+    index = PeopleIndex(rebuild_interval=0)
+    started = time.perf_counter()
+    index.build()
+    print(f"Index build: {(time.perf_counter() - started) * 1000:.0f}ms, {index.stats()['keys']} keys\n")
+
+    print(f"{'typed':<14} {'keys':>5} {'index p50':>11} {'index q/s':>10} {'sql p50':>10}")
+    for query in QUERIES:
+        prefixes = keystrokes(query)
+        index_ms, sql_ms = [], []
+        for _ in range(args.repeat):
+            for prefix in prefixes:
+                t = time.perf_counter()
+                index.search(prefix, args.limit)
+                index_ms.append((time.perf_counter() - t) * 1000)
+        for prefix in prefixes:
+            t = time.perf_counter()
+            sql_search(session_factory, prefix, args.limit)
+            sql_ms.append((time.perf_counter() - t) * 1000)
+        p50 = statistics.median(index_ms)
+        print(f"{query:<14} {len(prefixes):>5} {p50:9.3f}ms {1000 / statistics.mean(index_ms):10.0f} "
+              f"{statistics.median(sql_ms):8.3f}ms")
+
+    started = time.perf_counter()
+    for i in range(1000):
+        index.put([{"user_id": f"N{i}", "name": f"New Person{i}", "email": f"new{i}@example.com", "user_type": "e"}])
+    print(f"\nIncremental put: {(time.perf_counter() - started):.3f}ms per user")
+
+    engine.dispose()
+    for path in (args.db, f"{args.db}.fsq"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--db", default="/tmp/people_index_benchmark.sqlite")
+    main(parser.parse_args())
@@ -0,0 +1,132 @@
+"""
+Benchmark: "similar employees" on the precomputed sparse matrix.
+
+Seeds a catalog, USER_SKILLS and USER_CERT in a scratch SQLite copy of the
+schema (see index_benchmark.py), builds the SimilarityIndex, then times
+top-k queries against scoring every profile with a plain Python dot
+product (the same vectors, no NumPy), and the cost of patching one skill
+write.
+
+    python benchmarks/similarity_benchmark.py --users 20000 --skills-per-user 8
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.models import Skill, User, UserCert, UserSkill  # noqa: E402
+from app.models.manager_emp import ManagerEmp  # noqa: E402,F401  (mapper referenced by User)
+from app.services.similarity_index import SimilarityIndex  # noqa: E402
+from index_benchmark import build_engine  # noqa: E402
+
+LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+CERT_CATEGORIES = [f"Category {i}" for i in range(25)]
+
+
+def seed(engine, users: int, skills_per_user: int, catalog_size: int) -> list:
+    rng = random.Random(42)
+    catalog = [
+        {"SKILL_ID": i + 1, "PLATFORM": f"Platform {i % 12}", "SEGMENT": f"Segment {i % 30}",
+         "PRODUCT_PORTFOLIO": f"Portfolio {i}", "SPECIALITY_AREA": f"Area {i}"}
+        for i in range(catalog_size)
+    ]
+    user_ids = [f"U{i:07d}" for i in range(users)]
+    with engine.begin() as conn:
+        conn.execute(insert(Skill.__table__), catalog)
+        conn.execute(insert(User.__table__), [
+            {"USER_ID": uid, "NAME": uid, "EMAIL": f"{uid.lower()}@example.com"} for uid in user_ids
+        ])
+        skills, certs = [], []
+        for uid in user_ids:
+            # Each user's skills cluster around one area of the catalog
+            center = rng.randrange(catalog_size)
+            for offset in rng.sample(range(-40, 40), skills_per_user):
+                skill = catalog[(center + offset) % catalog_size]
+                skills.append({
+                    "USER_ID": uid, "SKILL_ID": skill["SKILL_ID"], "PLATFORM": skill["PLATFORM"],
+                    "SEGMENT": skill["SEGMENT"], "PRODUCT_PORTFOLIO": skill["PRODUCT_PORTFOLIO"],
+                    "SPECIALITY_AREA": skill["SPECIALITY_AREA"], "PROFICIENCY_LEVEL": rng.choice(LEVELS),
+                    "YOE": str(rng.randrange(0, 20)), "STATUS": "approved",
+                })
+            certs.extend(
+                {"USER_ID": uid, "CERT_NAME": "Cert", "CERT_CAT": category, "STATUS": "approved"}
+                for category in rng.sample(CERT_CATEGORIES, 2)
+            )
+        for start in range(0, len(skills), 10000):
+            conn.execute(insert(UserSkill.__table__), skills[start:start + 10000])
+        for start in range(0, len(certs), 10000):
+            conn.execute(insert(UserCert.__table__), certs[start:start + 10000])
+    return user_ids
+
+
+def python_top_k(vectors, user_id: str, k: int) -> list:
+    query = vectors[user_id]
+    scores = []
+    for other, vector in vectors.items():
+        if other != user_id:
+            score = sum(w * vector[f] for f, w in query.items() if f in vector)
+            if score > 0:
+                scores.append((score, other))
+    scores.sort(reverse=True)
+    return scores[:k]
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = build_engine(args.db)
+    print(f"Seeding {args.users} users x {args.skills_per_user} skills...")
+    user_ids = seed(engine, args.users, args.skills_per_user, args.catalog)
+
+    database.SessionLocal = sessionmaker(bind=engine)
+    index = SimilarityIndex(rebuild_interval=0)
+    build_ms = median_ms(index.build, 1)
+    stats = index.stats()
+    print(f"Index build: {build_ms:.0f}ms, {stats['features']} features, {stats['nonzeros']} nonzeros\n")
+
+    rng = random.Random(7)
+    probes = rng.sample(user_ids, 20)
+    matrix = index._matrix
+    vectors = {user_id: matrix.vector(user_id) for user_id in matrix.users}
+
+    index_ms = median_ms(lambda: [index.similar(u, args.k) for u in probes], args.repeat) / len(probes)
+    python_ms = median_ms(lambda: [python_top_k(vectors, u, args.k) for u in probes[:3]], 3) / 3
+    print(f"top-{args.k} similar: index {index_ms:.3f}ms, python loop {python_ms:.1f}ms "
+          f"({python_ms / max(index_ms, 1e-6):.0f}x)")
+
+    row = {"id": 10 ** 9, "user_id": probes[0], "skill_id": 1, "proficiency_level": "Expert", "yoe": "10",
+           "platform": None, "segment": None, "product_portfolio": None, "speciality_area": None}
+    put_ms = median_ms(lambda: index.put([row]), args.repeat)
+    patched_ms = median_ms(lambda: index.similar(probes[1], args.k), args.repeat)
+    print(f"patch one skill write: {put_ms:.3f}ms; query with patched overlay: {patched_ms:.3f}ms")
+
+    engine.dispose()
+    for path in (args.db, f"{args.db}.fsq"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--skills-per-user", type=int, default=8)
+    parser.add_argument("--catalog", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", default="/tmp/similarity_benchmark.sqlite")
+    main(parser.parse_args())
@@ -0,0 +1,123 @@
+"""
+Benchmark: team skill matrix vs the nested reportees payload it replaces.
+
+Seeds a catalog and USER_SKILLS for one team in a scratch SQLite copy of
+the schema (see index_benchmark.py), then compares what the heatmap costs
+today (ReporteeDataLoader with skills only, pivoted client-side) with
+build_skill_matrix: server time and JSON response size.
+
+    python benchmarks/skill_matrix_benchmark.py --reportees 200 --skills-per-user 12
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.models import Skill, User, UserSkill  # noqa: E402
+from app.models.manager_emp import ManagerEmp  # noqa: E402,F401  (mapper referenced by User)
+from app.services.reportee_loader import ReporteeDataLoader  # noqa: E402
+from app.services.skill_matrix import build_skill_matrix  # noqa: E402
+from app.services.skills_catalog import skills_catalog  # noqa: E402
+from index_benchmark import build_engine  # noqa: E402
+
+LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+
+def seed(engine, reportees: int, skills_per_user: int, catalog_size: int) -> list:
+    rng = random.Random(42)
+    catalog = [
+        {"SKILL_ID": i + 1, "PLATFORM": f"Platform {i % 12}", "SEGMENT": f"Segment {i % 30}",
+         "PRODUCT_PORTFOLIO": f"Portfolio {i}", "SPECIALITY_AREA": f"Area {i}"}
+        for i in range(catalog_size)
+    ]
+    user_ids = [f"U{i:07d}" for i in range(reportees)]
+    with engine.begin() as conn:
+        conn.execute(insert(Skill.__table__), catalog)
+        conn.execute(insert(User.__table__), [
+            {"USER_ID": uid, "NAME": f"Person {uid}", "EMAIL": f"{uid.lower()}@example.com"} for uid in user_ids
+        ])
+        # Team skills cluster on a subset of the catalog, as real teams do
+        team_skills = rng.sample(catalog, min(len(catalog), skills_per_user * 6))
+        conn.execute(insert(UserSkill.__table__), [
+            {
+                "USER_ID": uid,
+                "SKILL_ID": skill["SKILL_ID"],
+                "PLATFORM": skill["PLATFORM"],
+                "SEGMENT": skill["SEGMENT"],
+                "PRODUCT_PORTFOLIO": skill["PRODUCT_PORTFOLIO"],
+                "SPECIALITY_AREA": skill["SPECIALITY_AREA"],
+                "PRODUCT_LINE": "Line",
+                "PROFICIENCY_LEVEL": rng.choice(LEVELS),
+                "SKILL_TYPE": "primary",
+                "YOE": str(rng.randrange(0, 20)),
+                "STATUS": "approved",
+            }
+            for uid in user_ids for skill in rng.sample(team_skills, skills_per_user)
+        ])
+    return user_ids
+
+
+def nested(session_factory, user_ids) -> bytes:
+    db = session_factory()
+    try:
+        reportees = ReporteeDataLoader(db).load(
+            user_ids, include_projects=False, include_assets=False, include_certifications=False
+        )
+        return json.dumps({"reportees": reportees}, default=str).encode()
+    finally:
+        db.close()
+
+
+def matrix(session_factory, user_ids) -> bytes:
+    db = session_factory()
+    try:
+        return json.dumps(build_skill_matrix(db, user_ids), default=str).encode()
+    finally:
+        db.close()
+
+
+def measure(fn, repeat: int):
+    timings, body = [], b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = build_engine(args.db)
+    user_ids = seed(engine, args.reportees, args.skills_per_user, args.catalog)
+    session_factory = sessionmaker(bind=engine)
+    database.SessionLocal = session_factory
+    skills_catalog.load()
+
+    print(f"{args.reportees} reportees x {args.skills_per_user} skills, catalog of {args.catalog}\n")
+    print(f"{'payload':<10} {'p50':>10} {'bytes':>10}")
+    for label, fn in (("nested", nested), ("matrix", matrix)):
+        p50, size = measure(lambda: fn(session_factory, user_ids), args.repeat)
+        print(f"{label:<10} {p50:8.2f}ms {size:>10}")
+
+    engine.dispose()
+    for path in (args.db, f"{args.db}.fsq"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reportees", type=int, default=200)
+    parser.add_argument("--skills-per-user", type=int, default=12)
+    parser.add_argument("--catalog", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", default="/tmp/skill_matrix_benchmark.sqlite")
+    main(parser.parse_args())
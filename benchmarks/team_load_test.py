@@ -0,0 +1,111 @@
+"""
+Load test: latency of unrelated routes while team queries are running.
+
+Measures /health latency on its own, then again while `--team-concurrency`
+clients repeatedly hit a team endpoint. With DB work offloaded from the event
+loop the two /health distributions should be close; a blocked loop shows up
+as /health latency tracking the team query time.
+
+Usage (against a running server, authenticated via the session cookie):
+
+    python benchmarks/team_load_test.py --base-url http://localhost:8000 \\
+        --cookie "session=<value>" --manager-id <W3 user id> \\
+        --path "/api/team/manager/{manager_id}/certifications-summary"
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(label: str, samples: List[float]) -> None:
+    if not samples:
+        print(f"{label:<28} no samples")
+        return
+    print(
+        f"{label:<28} n={len(samples):<5} "
+        f"p50={percentile(samples, 50):8.2f}ms "
+        f"p95={percentile(samples, 95):8.2f}ms "
+        f"p99={percentile(samples, 99):8.2f}ms "
+        f"max={max(samples):8.2f}ms "
+        f"mean={statistics.mean(samples):8.2f}ms"
+    )
+
+
+async def timed_get(client: httpx.AsyncClient, url: str, samples: List[float], errors: List[int]) -> None:
+    started = time.perf_counter()
+    response = await client.get(url)
+    samples.append((time.perf_counter() - started) * 1000)
+    if response.status_code >= 400:
+        errors.append(response.status_code)
+
+
+async def probe(client: httpx.AsyncClient, url: str, requests: int, interval: float) -> List[float]:
+    samples: List[float] = []
+    errors: List[int] = []
+    for _ in range(requests):
+        await timed_get(client, url, samples, errors)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def team_load(client: httpx.AsyncClient, url: str, stop: asyncio.Event,
+                    samples: List[float], errors: List[int]) -> None:
+    while not stop.is_set():
+        await timed_get(client, url, samples, errors)
+
+
+async def main(args: argparse.Namespace) -> None:
+    headers = {"Cookie": args.cookie} if args.cookie else {}
+    health_url = f"{args.base_url}/health"
+    team_url = args.base_url + args.path.format(manager_id=args.manager_id)
+    limits = httpx.Limits(max_connections=args.team_concurrency + 5)
+
+    async with httpx.AsyncClient(headers=headers, timeout=args.timeout, limits=limits) as client:
+        await client.get(health_url)
+
+        baseline = await probe(client, health_url, args.requests, args.interval)
+
+        stop = asyncio.Event()
+        team_samples: List[float] = []
+        team_errors: List[int] = []
+        workers = [
+            asyncio.create_task(team_load(client, team_url, stop, team_samples, team_errors))
+            for _ in range(args.team_concurrency)
+        ]
+        await asyncio.sleep(args.warmup)
+        loaded = await probe(client, health_url, args.requests, args.interval)
+        stop.set()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    print(f"team endpoint: {team_url} ({args.team_concurrency} concurrent clients)")
+    report("/health idle", baseline)
+    report("/health under team load", loaded)
+    report("team endpoint", team_samples)
+    if team_errors:
+        print(f"team endpoint errors: {len(team_errors)} (status codes {sorted(set(team_errors))})")
+    ratio = percentile(loaded, 95) / max(percentile(baseline, 95), 0.001)
+    print(f"/health p95 under load / idle: {ratio:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--cookie", default="", help="Cookie header carrying an authenticated session")
+    parser.add_argument("--manager-id", required=True)
+    parser.add_argument("--path", default="/api/team/manager/{manager_id}/reportees")
+    parser.add_argument("--team-concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="/health probes per phase")
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between /health probes")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of team load before probing")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))